@@ -3,4 +3,8 @@
 """
 __version__ = '1.1.0'
 
+from .symbology import Symbology
 from .code128 import Code128
+from .code39 import Code39
+from .ean import EAN13, UPCA
+from .gs1 import GS1_128
@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+"""Encoding and rendering barcodes from asyncio, without blocking the event loop.
+
+The work is done in an executor and the number of barcodes rendered at a time is limited. Identical requests that are
+in flight at the same time are rendered only once, so many requests for the same barcode share a single result. This
+module needs Python 3.5 or newer.
+
+Code128.render_async and Code128.data_url_async use a shared renderer, which can be replaced with configure:
+
+>>> import asyncio
+>>> from pubcode import Code128
+>>> async def main():
+...     return await asyncio.gather(Code128.render_async('Hello!'), Code128('Hello!').data_url_async())
+>>> loop = asyncio.new_event_loop()
+>>> urls = loop.run_until_complete(main())
+>>> loop.close()
+>>> urls[0] == urls[1] == Code128('Hello!').data_url()
+True
+"""
+import asyncio
+import os
+import threading
+
+from .code128 import Code128, _encode_chunk
+from .symbology import _outputs
+
+_default_renderer = None
+_default_renderer_lock = threading.Lock()
+
+
+def _render_barcode(barcode, output, options):
+    """Render an existing barcode. This is a module level function, so it can be pickled for a process pool."""
+    return _outputs[output](barcode, options)
+
+
+class AsyncRenderer(object):
+    """Render barcodes in an executor, with a limit on concurrency and coalescing of identical requests.
+
+    A renderer can be used from several event loops, such as from successive calls of asyncio.run. The limit and the
+    coalescing apply to each event loop separately.
+    """
+
+    def __init__(self, executor=None, max_concurrency=None):
+        """Initialize a renderer.
+
+        :param executor: A concurrent.futures.Executor for the work. If None, the default executor of the event loop is
+                         used. A ProcessPoolExecutor keeps the rendering from competing with the event loop for the GIL.
+        :param max_concurrency: Maximum number of barcodes rendered at a time. If None, the number of CPUs is used.
+        """
+        self.executor = executor
+        self.max_concurrency = max_concurrency or os.cpu_count() or 1
+
+        # Maps event loops to a semaphore limiting the concurrency and a dict mapping request keys to the tasks
+        # rendering them.
+        self._loops = {}
+        self._loops_lock = threading.Lock()
+        self._coalesced = 0
+
+    async def render(self, cls, data, charset=None, output='data_url', options=None):
+        """Encode the data and get an output of the barcode, as in Code128.encode_many.
+
+        :raises: Code128.Error if the barcode can't be encoded, or Code128.UnknownFormatError for an unknown output.
+        """
+        if output not in _outputs:
+            raise Code128.UnknownFormatError('Unknown output {0!r}.'.format(output))
+        options = options or {}
+        key = (cls, 'data', data, cls._charset_key(charset), output, tuple(sorted(options.items())))
+
+        result = await self._run(key, _encode_chunk, cls, [data], charset, output, options)
+        result = result[0]
+        if isinstance(result, Code128.Error):
+            raise result
+        return result
+
+    async def render_barcode(self, barcode, output='data_url', options=None):
+        """Get an output of an existing barcode, as in Code128.encode_many.
+
+        :raises: Code128.UnknownFormatError for an unknown output or an error raised by the output method.
+        """
+        if output not in _outputs:
+            raise Code128.UnknownFormatError('Unknown output {0!r}.'.format(output))
+        options = options or {}
+        key = (type(barcode), 'barcode', barcode.symbol_values, output, tuple(sorted(options.items())))
+        return await self._run(key, _render_barcode, barcode, output, options)
+
+    async def _run(self, key, function, *args):
+        """Call a function in the executor, or wait for the call that is already running with the same key."""
+        loop = asyncio.get_event_loop()
+        with self._loops_lock:
+            state = self._loops.get(loop)
+            if state is None:
+                # Forget the event loops that have been closed, such as by earlier calls of asyncio.run.
+                for closed_loop in [other_loop for other_loop in self._loops if other_loop.is_closed()]:
+                    del self._loops[closed_loop]
+                state = self._loops[loop] = (asyncio.Semaphore(self.max_concurrency), {})
+        semaphore, in_flight = state
+
+        task = in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._call(loop, semaphore, function, *args))
+            in_flight[key] = task
+            task.add_done_callback(lambda _: in_flight.pop(key, None))
+        else:
+            self._coalesced += 1
+        # A cancelled request doesn't cancel the work that other requests are waiting for.
+        return await asyncio.shield(task)
+
+    async def _call(self, loop, semaphore, function, *args):
+        async with semaphore:
+            return await loop.run_in_executor(self.executor, function, *args)
+
+    def stats(self):
+        """Get the counters of the renderer.
+
+        :rtype: dict
+        :returns: The number of requests in flight and the number of requests that were coalesced with another one.
+        """
+        with self._loops_lock:
+            in_flight = sum(len(in_flight) for _, in_flight in self._loops.values())
+        return {'in_flight': in_flight, 'coalesced': self._coalesced}
+
+
+def configure(executor=None, max_concurrency=None):
+    """Replace the renderer used by Code128.render_async and Code128.data_url_async.
+
+    The executor of the previous renderer is not shut down.
+
+    :rtype: AsyncRenderer
+    :returns: The new renderer.
+    """
+    global _default_renderer
+    with _default_renderer_lock:
+        _default_renderer = AsyncRenderer(executor, max_concurrency)
+        return _default_renderer
+
+
+def default_renderer():
+    """Get the renderer used by Code128.render_async and Code128.data_url_async, creating it on first use.
+
+    :rtype: AsyncRenderer
+    """
+    global _default_renderer
+    with _default_renderer_lock:
+        if _default_renderer is None:
+            _default_renderer = AsyncRenderer()
+        return _default_renderer
@@ -0,0 +1,286 @@
+# -*- coding: utf-8 -*-
+"""Writers that put many barcodes into a single file, as they are produced.
+
+SpriteSheetWriter writes a PNG with the barcodes in a grid of equally sized tiles, and a JSON index with the position of
+each barcode. PdfWriter writes a PDF with the bars as vector rectangles. Both are written one row of barcodes or one
+page at a time from the modules of the barcodes, so the memory use doesn't depend on the number of barcodes and PIL
+isn't needed.
+
+>>> import io
+>>> from pubcode import Code128
+>>> image_file, index_file = io.BytesIO(), io.StringIO()
+>>> with SpriteSheetWriter(image_file, 130, index_file, columns=2, height=10) as writer:
+...     for data in ('Hello!', '1234', 'LOT42'):
+...         writer.add(Code128(data))
+>>> image_file.getvalue()[:8]
+b'\\x89PNG\\r\\n\\x1a\\n'
+>>> print(index_file.getvalue())
+[
+{"data": "Hello!", "height": 10, "width": 121, "x": 0, "y": 0},
+{"data": "1234", "height": 10, "width": 77, "x": 130, "y": 0},
+{"data": "LOT42", "height": 10, "width": 110, "x": 0, "y": 10}
+]
+<BLANKLINE>
+"""
+from __future__ import absolute_import, division, print_function, unicode_literals
+import json
+import struct
+import sys
+import zlib
+if sys.version_info[0] < 3:
+    from builtins import *  # Use Python3-like builtins for Python2.
+
+from .symbology import _format_number, _int_to_bytes
+from . import raster
+
+
+class SpriteSheetWriter(object):
+    """Write barcodes into a 1-bit PNG, in a grid of tiles that is filled one row at a time from left to right.
+
+    The height of the image is written on close. If the number of barcodes isn't given in advance, the image file must
+    be seekable, so that the header can be updated.
+    """
+
+    def __init__(self, image_file, tile_width, index_file=None, columns=1, height=1, module_width=1,
+                 add_quiet_zone=True, count=None, compress_level=6):
+        """Start writing a sprite sheet.
+
+        :param image_file: A file object opened in binary mode.
+        :param tile_width: Width of each tile in pixels. Barcodes are placed at the left edge of their tile.
+        :param index_file: A file object opened in text mode, where a JSON list with the data, position and size of
+                           each barcode in pixels is written, one barcode per line. None to not write an index.
+        :param columns: Number of tiles in each row.
+        :param height: Height of each tile and barcode in pixels.
+        :param module_width: Width of a module in pixels.
+        :param add_quiet_zone: Whether to add 10 empty modules to each side of each barcode.
+        :param count: Number of barcodes that will be added, if known. Then the image file doesn't need to be seekable.
+        :param compress_level: The zlib compression level for the image data.
+        """
+        self.image_file = image_file
+        self.index_file = index_file
+        self.tile_width = tile_width
+        self.columns = columns
+        self.height = height
+        self.module_width = module_width
+        self.add_quiet_zone = add_quiet_zone
+        self.count = count
+
+        self._width = tile_width * columns
+        self._row_bytes = (self._width + 7) // 8
+        self._compressor = zlib.compressobj(compress_level)
+        self._compressed = []
+        self._compressed_size = 0
+        # The modules of the current row of tiles, as an integer with the first pixel in the most significant bit.
+        self._row = None
+        self._added = 0
+        self._rows_written = 0
+
+        image_file.write(raster._PNG_SIGNATURE)
+        image_file.write(self._header(0 if count is None else (count + columns - 1) // columns))
+        if index_file is not None:
+            index_file.write('[\n')
+
+    def _header(self, rows):
+        """Get the IHDR chunk of an image with the given number of rows of tiles."""
+        # Width, height, bit depth, color type (grayscale), compression, filter and interlace method.
+        header = struct.pack(b'>IIBBBBB', self._width, rows * self.height, 1, 0, 0, 0, 0)
+        return raster._png_chunk(b'IHDR', header)
+
+    def add(self, barcode):
+        """Add a barcode into the next tile.
+
+        :param barcode: A barcode of any symbology, such as Code128.
+        :raises: ValueError if the barcode is wider than a tile.
+        """
+        bits, width = barcode._module_bits(self.add_quiet_zone, self.module_width)
+        if width > self.tile_width:
+            raise ValueError('The barcode is {0} pixels wide, but the tiles are {1} pixels wide.'.format(
+                width, self.tile_width
+            ))
+
+        column = self._added % self.columns
+        if column == 0:
+            self._row = (1 << self._width) - 1
+
+        # Replace the white pixels of the tile with the modules, which are 1 bits for spaces like the background.
+        shift = self._width - column * self.tile_width - width
+        self._row &= ~(((1 << width) - 1) << shift)
+        self._row |= bits << shift
+
+        if self.index_file is not None:
+            self.index_file.write('{0}{1}'.format(',\n' if self._added else '', json.dumps({
+                'data': barcode.data,
+                'x': column * self.tile_width,
+                'y': self._added // self.columns * self.height,
+                'width': width,
+                'height': self.height,
+            }, sort_keys=True)))
+
+        self._added += 1
+        if column == self.columns - 1:
+            self._write_row()
+
+    def _write_row(self):
+        """Compress the current row of tiles, where every line has the same pixels."""
+        padding = -self._width % 8
+        line = _int_to_bytes((self._row << padding) | ((1 << padding) - 1), self._row_bytes)
+        # Every scanline starts with the filter type, which is 0 for no filtering.
+        self._write_compressed(self._compressor.compress((b'\x00' + line) * self.height))
+        self._row = None
+        self._rows_written += 1
+
+    def _write_compressed(self, data, flush=False):
+        """Write compressed data into IDAT chunks of at least 64 KiB, except for the last one."""
+        if data:
+            self._compressed.append(data)
+            self._compressed_size += len(data)
+        if self._compressed_size >= 65536 or (flush and self._compressed):
+            self.image_file.write(raster._png_chunk(b'IDAT', b''.join(self._compressed)))
+            self._compressed = []
+            self._compressed_size = 0
+
+    def close(self):
+        """Write the last row of tiles and the end of the image and the index. The files are not closed."""
+        if self._row is not None:
+            self._write_row()
+        self._write_compressed(self._compressor.flush(), flush=True)
+        self.image_file.write(raster._png_chunk(b'IEND', b''))
+
+        if self.count is None or self._rows_written != (self.count + self.columns - 1) // self.columns:
+            end = self.image_file.tell()
+            self.image_file.seek(len(raster._PNG_SIGNATURE))
+            self.image_file.write(self._header(self._rows_written))
+            self.image_file.seek(end)
+
+        if self.index_file is not None:
+            self.index_file.write('\n]\n')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class PdfWriter(object):
+    """Write barcodes into a PDF, with the bars as filled rectangles, in a grid that is filled one page at a time.
+
+    Only the positions of the objects in the file and the numbers of the pages are kept until the file is closed, as
+    they are needed for the cross-reference table and the page tree at the end of the file.
+    """
+
+    def __init__(self, pdf_file, page_size=(595.28, 841.89), margin=36, columns=1, height=36, module_width=1, gap=18,
+                 add_quiet_zone=True):
+        """Start writing a PDF.
+
+        :param pdf_file: A file object opened in binary mode.
+        :param page_size: Width and height of each page in points. The default is A4.
+        :param margin: Empty space on each side of the page in points.
+        :param columns: Number of barcodes on each row. The barcodes are placed at the left edge of their column.
+        :param height: Height of the bars in points.
+        :param module_width: Width of a module in points.
+        :param gap: Vertical space between the rows of barcodes in points.
+        :param add_quiet_zone: Whether to leave 10 empty modules on the left side of each barcode.
+        """
+        self.pdf_file = pdf_file
+        self.page_size = page_size
+        self.margin = margin
+        self.columns = columns
+        self.height = height
+        self.module_width = module_width
+        self.gap = gap
+        self.add_quiet_zone = add_quiet_zone
+
+        self._rows_per_page = max(1, int((page_size[1] - 2 * margin + gap) // (height + gap)))
+        self._column_width = (page_size[0] - 2 * margin) / columns
+        self._position = 0
+        # The positions of the objects by object number. Objects 1 and 2 are the catalog and the page tree, which are
+        # written last.
+        self._offsets = [None, None, None]
+        self._pages = []
+        self._content = []
+        self._added = 0
+
+        self._write(b'%PDF-1.4\n%\xe2\xe3\xcf\xd3\n')
+
+    def _write(self, data):
+        self.pdf_file.write(data)
+        self._position += len(data)
+
+    def _write_object(self, number, content):
+        """Write an object with the given number and content, which is a bytes object without the obj keywords."""
+        self._offsets[number] = self._position
+        self._write('{0} 0 obj\n'.format(number).encode('ascii') + content + b'\nendobj\n')
+
+    def _new_object(self):
+        """Reserve the number of a new object."""
+        self._offsets.append(None)
+        return len(self._offsets) - 1
+
+    def add(self, barcode):
+        """Add a barcode into the next position on the page, starting a new page when the current one is full.
+
+        :param barcode: A barcode of any symbology, such as Code128.
+        :raises: ValueError if the barcode is wider than a column.
+        """
+        width = barcode.width(self.add_quiet_zone) * self.module_width
+        if width > self._column_width:
+            raise ValueError('The barcode is {0} points wide, but the columns are {1} points wide.'.format(
+                _format_number(width), _format_number(self._column_width)
+            ))
+
+        index = self._added % (self._rows_per_page * self.columns)
+        x = self.margin + index % self.columns * self._column_width
+        # The origin is at the bottom left corner of the page.
+        y = self.page_size[1] - self.margin - index // self.columns * (self.height + self.gap) - self.height
+
+        for position, weight in barcode._iter_bars(self.add_quiet_zone):
+            self._content.append('{0} {1} {2} {3} re\n'.format(
+                _format_number(x + position * self.module_width), _format_number(y),
+                _format_number(weight * self.module_width), _format_number(self.height)
+            ))
+
+        self._added += 1
+        if index == self._rows_per_page * self.columns - 1:
+            self._write_page()
+
+    def _write_page(self):
+        """Write the current page and its content stream."""
+        content = zlib.compress(''.join(self._content + ['f\n']).encode('ascii'))
+        content_number = self._new_object()
+        self._write_object(content_number, '<< /Length {0} /Filter /FlateDecode >>\nstream\n'.format(
+            len(content)
+        ).encode('ascii') + content + b'\nendstream')
+
+        page_number = self._new_object()
+        self._write_object(page_number, (
+            '<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {0} {1}] /Contents {2} 0 R >>'.format(
+                _format_number(self.page_size[0]), _format_number(self.page_size[1]), content_number
+            )
+        ).encode('ascii'))
+        self._pages.append(page_number)
+        self._content = []
+
+    def close(self):
+        """Write the last page, the page tree and the end of the PDF. The file is not closed."""
+        if self._content or not self._pages:
+            self._write_page()
+
+        self._write_object(2, '<< /Type /Pages /Kids [{0}] /Count {1} >>'.format(
+            ' '.join('{0} 0 R'.format(number) for number in self._pages), len(self._pages)
+        ).encode('ascii'))
+        self._write_object(1, b'<< /Type /Catalog /Pages 2 0 R >>')
+
+        xref_position = self._position
+        # Every entry of the cross-reference table is exactly 20 bytes long.
+        self._write('xref\n0 {0}\n0000000000 65535 f \n'.format(len(self._offsets)).encode('ascii'))
+        self._write(''.join('{0:010d} 00000 n \n'.format(offset) for offset in self._offsets[1:]).encode('ascii'))
+        self._write('trailer\n<< /Size {0} /Root 1 0 R >>\nstartxref\n{1}\n%%EOF\n'.format(
+            len(self._offsets), xref_position
+        ).encode('ascii'))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
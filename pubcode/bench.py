@@ -0,0 +1,222 @@
+# -*- coding: utf-8 -*-
+"""Benchmarks for pubcode.
+
+Run with ``python -m pubcode.bench``. The results are printed as JSON, so they can be compared between releases. Each
+result has the time in seconds per item, as the best of several repeats, and the peak memory allocated while processing
+the items once, as measured by tracemalloc. Memory allocated by PIL is not seen by tracemalloc. Python2 has no
+tracemalloc, so the peak memory is null there.
+"""
+from __future__ import absolute_import, division, print_function, unicode_literals
+import argparse
+import json
+import platform
+import random
+import sys
+import timeit
+if sys.version_info[0] < 3:
+    from builtins import *  # Use Python3-like builtins for Python2.
+    tracemalloc = None
+else:
+    import tracemalloc
+
+from . import __version__
+from .code128 import Code128
+
+
+def _time(function, repeat, number):
+    """Get the best time of a function in seconds per call."""
+    return min(timeit.repeat(function, repeat=repeat, number=number)) / number
+
+
+def _peak_memory(function):
+    """Get the peak memory in bytes allocated during a call of a function, or None if it can't be measured."""
+    if tracemalloc is None:
+        return None
+    tracemalloc.start()
+    try:
+        function()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def corpora(size=100, seed=0):
+    """Get the data used by the benchmarks, which is generated randomly but the same for every run.
+
+    :param size: Number of items in each corpus.
+    :param seed: Seed of the random number generator.
+
+    :rtype: dict
+    :returns: Lists of data by corpus name.
+    """
+    rng = random.Random(seed)
+    letters = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+    digits = '0123456789'
+    return {
+        # Stock keeping units, like 'KX-20431'.
+        'short_sku': [
+            ''.join(rng.choice(letters) for _ in range(2)) + '-' + ''.join(rng.choice(digits) for _ in range(5))
+            for _ in range(size)
+        ],
+        # GS1 style element strings, like an SSCC or a GTIN with a batch number, without the parentheses.
+        'long_numeric': [
+            ''.join(rng.choice(digits) for _ in range(rng.choice((20, 32, 44)))) for _ in range(size)
+        ],
+        # Lower case letters mixed with control characters, which need both charsets A and B.
+        'mixed_ab': [
+            ''.join(rng.choice('abcxyz\x00\x01\t\r\n') for _ in range(16)) for _ in range(size)
+        ],
+    }
+
+
+def bench_stages(repeat=5, number=10, size=100, only=''):
+    """Time every stage of encoding and rendering over each corpus.
+
+    Barcodes keep their bars and modules once they are computed, so the stages after encoding create new barcodes from
+    the symbol values in every call. That is timed as well, but it is much cheaper than any of the stages.
+
+    :param size: Number of items in each corpus.
+    :param only: Run only the stages whose name starts with this.
+
+    :rtype: list[dict]
+    """
+    try:
+        from PIL import Image
+    except ImportError:
+        Image = None
+
+    results = []
+    for corpus, items in sorted(corpora(size).items()):
+        charsets = [Code128._plan_charsets(data) for data in items]
+        encoded = [(data, Code128(data).symbol_values) for data in items]
+        pairs = list(zip(items, charsets))
+
+        def barcodes():
+            return [Code128._from_symbol_values(data, symbol_values) for data, symbol_values in encoded]
+
+        stages = [
+            ('plan_charsets', lambda: [Code128._plan_charsets(data) for data in items]),
+            ('validate_charset', lambda: [Code128._validate_charset(data, charset) for data, charset in pairs]),
+            ('encode', lambda: [Code128._encode(data, charset) for data, charset in pairs]),
+            ('init', lambda: [Code128(data) for data in items]),
+            ('estimate_width', lambda: [Code128.estimate_width(data) for data in items]),
+            ('symbols', lambda: [barcode.symbols for barcode in barcodes()]),
+            ('bars', lambda: [barcode.bars for barcode in barcodes()]),
+            ('modules', lambda: [barcode.modules for barcode in barcodes()]),
+            ('packed_modules', lambda: [barcode.packed_modules() for barcode in barcodes()]),
+            ('data_url.png', lambda: [barcode.data_url('png') for barcode in barcodes()]),
+            ('data_url.bmp', lambda: [barcode.data_url('bmp') for barcode in barcodes()]),
+            ('data_url.auto', lambda: [barcode.data_url('auto', optimize=True) for barcode in barcodes()]),
+        ]
+        if Image is not None:
+            for height, module_width in ((1, 1), (50, 2), (150, 4)):
+                stages.append((
+                    'image.{0}x{1}'.format(height, module_width),
+                    lambda height=height, module_width=module_width: [
+                        barcode.image(height=height, module_width=module_width) for barcode in barcodes()
+                    ]
+                ))
+
+        for name, function in stages:
+            if not name.startswith(only):
+                continue
+            results.append({
+                'name': name,
+                'corpus': corpus,
+                'items': len(items),
+                'seconds': _time(function, repeat, number) / len(items),
+                'peak_bytes': _peak_memory(function),
+            })
+
+    return results
+
+
+def bench_sheet(repeat=5, number=10, count=40, height=150, module_width=3):
+    """Compare rendering a sheet of labels with pubcode.sheet.render_sheet and with PIL images pasted onto a sheet.
+
+    :param count: Number of barcodes on the sheet, in two columns.
+    :param height: Height of each barcode in pixels.
+    :param module_width: Width of a module in pixels.
+
+    :rtype: list[dict]
+    :returns: A result for each available rendering method, with the time in seconds per sheet.
+    """
+    barcodes = [Code128('LOT42-{0:06d}'.format(index)) for index in range(count)]
+    column_width = max(barcode.width(add_quiet_zone=True) for barcode in barcodes) * module_width
+    offsets = [(index % 2 * column_width, index // 2 * height) for index in range(count)]
+    size = (2 * column_width, (count + 1) // 2 * height)
+
+    results = []
+    parameters = {'count': count, 'height': height, 'module_width': module_width}
+
+    try:
+        from PIL import Image
+    except ImportError:
+        pass
+    else:
+        def render_pil():
+            sheet = Image.new('1', size, 1)
+            for barcode, offset in zip(barcodes, offsets):
+                sheet.paste(barcode.image(height=height, module_width=module_width), offset)
+            return sheet
+
+        results.append(dict(name='sheet.pil', seconds=_time(render_pil, repeat, number),
+                            peak_bytes=_peak_memory(render_pil), **parameters))
+
+    try:
+        import numpy
+    except ImportError:
+        pass
+    else:
+        from .sheet import render_sheet
+
+        def render_numpy():
+            return render_sheet(barcodes, offsets, (size[1], size[0]), height, module_width)
+
+        results.append(dict(name='sheet.numpy', seconds=_time(render_numpy, repeat, number),
+                            peak_bytes=_peak_memory(render_numpy), **parameters))
+
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m pubcode.bench', description=__doc__.split('\n\n')[0])
+    parser.add_argument('--repeat', type=int, default=5, help='Number of times each benchmark is repeated.')
+    parser.add_argument('--number', type=int, default=10, help='Number of calls in each repeat.')
+    parser.add_argument('--size', type=int, default=100, help='Number of items in each corpus.')
+    parser.add_argument('--only', metavar='PREFIX', default='',
+                        help='Run only the benchmarks whose name starts with PREFIX.')
+    parser.add_argument('--output', type=argparse.FileType('w'), default=sys.stdout,
+                        help='File for the JSON results. Standard output by default.')
+    args = parser.parse_args(argv)
+
+    def bench_event_loop():
+        # The event loop benchmark is in a separate module, as it uses syntax that needs Python 3.5.
+        from .bench_aio import bench_event_loop
+        return bench_event_loop(args.size)
+
+    # The names of the results of each group start with the prefix of the group. A group is only run if some of its
+    # results can start with --only, and then its results are filtered by name like the stages.
+    groups = [('sheet.', lambda: bench_sheet(args.repeat, args.number))]
+    if sys.version_info >= (3, 5):
+        groups.append(('event_loop.', bench_event_loop))
+
+    results = bench_stages(args.repeat, args.number, args.size, args.only)
+    for prefix, run in groups:
+        if prefix.startswith(args.only) or args.only.startswith(prefix):
+            results += [result for result in run() if result['name'].startswith(args.only)]
+
+    report = {
+        'pubcode': __version__,
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'results': results,
+    }
+    json.dump(report, args.output, indent=2, sort_keys=True)
+    args.output.write('\n')
+    if args.output is not sys.stdout:
+        args.output.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+"""The event loop benchmark of pubcode.bench, which needs Python 3.5 or newer.
+
+It is run by ``python -m pubcode.bench`` with the other benchmarks.
+"""
+import asyncio
+import timeit
+from concurrent import futures
+
+from .aio import AsyncRenderer
+from .bench import corpora
+from .code128 import Code128
+
+
+def bench_event_loop(requests=200, concurrency=20, workers=2):
+    """Compare the latency of an asyncio event loop while it serves data URLs inline and with pubcode.aio.
+
+    A ticker task sleeps for a millisecond at a time and records how late it wakes up, which is how long other tasks
+    had to wait for the event loop. The requests render optimized data URLs of the long_numeric corpus.
+
+    :param requests: Number of data URLs rendered.
+    :param concurrency: Number of requests handled at a time.
+    :param workers: Number of threads or processes in the executor of the asynchronous renderer.
+
+    :rtype: list[dict]
+    :returns: A result for rendering inline, in a thread pool and in a process pool, with the time in seconds per
+              request and the maximum and 99th percentile of the ticker's lateness in seconds.
+    """
+    items = corpora(requests)['long_numeric']
+
+    async def ticker(lags, stop):
+        loop = asyncio.get_event_loop()
+        while not stop.is_set():
+            start = loop.time()
+            await asyncio.sleep(0.001)
+            lags.append(max(0.0, loop.time() - start - 0.001))
+
+    async def serve(render):
+        lags = []
+        stop = asyncio.Event()
+        ticker_task = asyncio.ensure_future(ticker(lags, stop))
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def request(data):
+            async with semaphore:
+                return await render(data)
+
+        start = timeit.default_timer()
+        await asyncio.gather(*(request(data) for data in items))
+        seconds = timeit.default_timer() - start
+        stop.set()
+        await ticker_task
+        return seconds, sorted(lags)
+
+    async def render_inline(data):
+        return Code128(data).data_url(optimize=True)
+
+    results = []
+    for name, executor_class in (('inline', None), ('threads', futures.ThreadPoolExecutor),
+                                 ('processes', futures.ProcessPoolExecutor)):
+        executor = executor_class(workers) if executor_class is not None else None
+        if executor is None:
+            render = render_inline
+        else:
+            renderer = AsyncRenderer(executor, max_concurrency=workers)
+
+            def render(data, renderer=renderer):
+                return renderer.render(Code128, data, options={'optimize': True})
+
+        loop = asyncio.new_event_loop()
+        try:
+            if executor is not None:
+                # Start the workers before measuring.
+                loop.run_until_complete(render(items[0]))
+            seconds, lags = loop.run_until_complete(serve(render))
+        finally:
+            loop.close()
+            if executor is not None:
+                executor.shutdown()
+
+        results.append({
+            'name': 'event_loop.' + name,
+            'requests': requests,
+            'concurrency': concurrency,
+            'workers': workers if executor is not None else None,
+            'seconds': seconds / requests,
+            'max_lag_seconds': lags[-1] if lags else seconds,
+            'p99_lag_seconds': lags[int(len(lags) * 0.99)] if lags else seconds,
+        })
+
+    return results
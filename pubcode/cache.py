@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+"""A bounded cache for encoded and rendered barcodes.
+
+The cache is disabled by default. It is enabled by giving Code128 a cache:
+
+>>> from pubcode import Code128
+>>> from pubcode.cache import RenderCache
+>>> Code128.cache = RenderCache(max_entries=1000)
+>>> Code128('Hello!').data_url() == Code128('Hello!').data_url()
+True
+>>> Code128.cache.stats()['hits']
+2
+>>> Code128.cache = None
+"""
+from __future__ import absolute_import, division, print_function, unicode_literals
+from collections import OrderedDict
+import sys
+import threading
+if sys.version_info[0] < 3:
+    from builtins import *  # Use Python3-like builtins for Python2.
+
+
+class RenderCache(object):
+    """A thread safe least recently used cache, bounded by the number of entries and their size in bytes."""
+
+    def __init__(self, max_entries=1024, max_bytes=None):
+        """Initialize an empty cache.
+
+        :param max_entries: Maximum number of entries or None for no limit.
+        :param max_bytes: Maximum total size of the cached values in bytes or None for no limit. The size of a value is
+                          measured with sys.getsizeof.
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+        self._lock = threading.Lock()
+        # Maps keys to (value, size) tuples, from the least recently used to the most recently used.
+        self._entries = OrderedDict()
+        self._size = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, key):
+        """Get the value for a key and mark it as the most recently used, or None if the key isn't in the cache."""
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                self._misses += 1
+                return None
+            self._entries[key] = entry
+            self._hits += 1
+            return entry[0]
+
+    def set(self, key, value):
+        """Add a value to the cache, evicting the least recently used values if the cache is full.
+
+        A value that is larger than max_bytes by itself isn't cached.
+        """
+        size = sys.getsizeof(value)
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+
+        with self._lock:
+            old_entry = self._entries.pop(key, None)
+            if old_entry is not None:
+                self._size -= old_entry[1]
+
+            self._entries[key] = (value, size)
+            self._size += size
+
+            while ((self.max_entries is not None and len(self._entries) > self.max_entries) or
+                   (self.max_bytes is not None and self._size > self.max_bytes)):
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._size -= evicted_size
+                self._evictions += 1
+
+    def clear(self):
+        """Remove all values from the cache. The counters are not reset."""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def stats(self):
+        """Get the counters of the cache.
+
+        :rtype: dict
+        :returns: The number of hits, misses and evictions, and the current number of entries and their size in bytes.
+        """
+        with self._lock:
+            return {
+                'hits': self._hits,
+                'misses': self._misses,
+                'evictions': self._evictions,
+                'entries': len(self._entries),
+                'bytes': self._size,
+            }
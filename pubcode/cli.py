@@ -0,0 +1,309 @@
+# -*- coding: utf-8 -*-
+"""Create barcodes from the lines of a text file or the rows of a CSV file.
+
+Installed as the ``pubcode`` command and also run with ``python -m pubcode.cli``. The input is read one row at a time
+and at most a few chunks of barcodes are encoded at a time, so the memory use doesn't depend on the size of the input.
+The only exception is a zip archive, which keeps a small index entry for every file until it is closed, so tar archives
+are better suited for very large inputs.
+
+The output is chosen by --output:
+
+- A directory, where a file is written for each barcode.
+- A file ending with .tar, .tar.gz, .tgz or .zip, which is written as an archive with a file for each barcode.
+- A file ending with .jsonl or '-' for standard output, where a JSON object with the name and data URL of each barcode
+  is written on its own line.
+"""
+from __future__ import absolute_import, division, print_function, unicode_literals
+import argparse
+import csv
+import io
+import itertools
+import json
+import os
+import sys
+import tarfile
+import time
+import zipfile
+if sys.version_info[0] < 3:
+    from builtins import *  # Use Python3-like builtins for Python2.
+
+from .code128 import Code128
+
+
+def read_rows(input_file, column=None, name_column=None):
+    """Read the name and data of each barcode.
+
+    :param input_file: A file object opened in text mode.
+    :param column: None to use each line as the data, or the CSV column with the data, as a name from the header row or
+                   a number starting from 0.
+    :param name_column: The CSV column with the name of each barcode, like column. If None, the rows are named by their
+                        number, starting from 1.
+
+    :returns: Iterator with a tuple of the row number, name and data for each row. The row number counts the header row.
+    """
+    if column is None:
+        for number, line in enumerate(input_file, 1):
+            yield number, str(number), line.rstrip('\r\n')
+        return
+
+    if sys.version_info[0] < 3:
+        # The csv module of Python2 only reads byte strings, so the lines are encoded for it and the cells decoded.
+        rows = csv.reader(line.encode('utf-8') for line in input_file)
+        rows = ([cell.decode('utf-8') for cell in row] for row in rows)
+    else:
+        rows = csv.reader(input_file)
+    number = 0
+    if not column.isdigit() or (name_column is not None and not name_column.isdigit()):
+        header = next(rows, [])
+        number += 1
+        column = _column_index(header, column)
+        name_column = _column_index(header, name_column)
+    else:
+        column = int(column)
+        name_column = int(name_column) if name_column is not None else None
+
+    for number, row in enumerate(rows, number + 1):
+        try:
+            data = row[column]
+            name = row[name_column] if name_column is not None else str(number)
+        except IndexError:
+            data = name = ''
+        yield number, name, data
+
+
+def _column_index(header, column):
+    """Get the index of a CSV column, which is given as a name from the header row or a number starting from 0."""
+    if column is None or column.isdigit():
+        return int(column) if column is not None else None
+    try:
+        return header.index(column)
+    except ValueError:
+        raise ValueError('Column {0!r} is not in the header row.'.format(column))
+
+
+def _safe_name(name):
+    """Make a name usable as a file name, by replacing path separators and leading dots."""
+    name = name.replace('/', '_').replace('\\', '_').replace('\x00', '_')
+    return '_' + name[1:] if name.startswith('.') or not name else name
+
+
+class _DirectoryWriter(object):
+    """Write each barcode into its own file in a directory."""
+
+    def __init__(self, path, extension):
+        if not os.path.isdir(path):
+            os.makedirs(path)
+        self.path = path
+        self.extension = extension
+
+    def write(self, name, content):
+        with open(os.path.join(self.path, '{0}.{1}'.format(_safe_name(name), self.extension)), 'wb') as output_file:
+            output_file.write(content)
+
+    def close(self):
+        pass
+
+
+class _TarWriter(object):
+    """Write each barcode into a tar archive, which is streamed into the file."""
+
+    def __init__(self, path, extension):
+        # The GNU format has less overhead per file than the default PAX format and still allows long names.
+        self.archive = tarfile.open(path, 'w|gz' if path.endswith(('.gz', '.tgz')) else 'w|', format=tarfile.GNU_FORMAT)
+        self.extension = extension
+        # A whole number, as a fraction would need an extended header for every file.
+        self.mtime = int(time.time())
+
+    def write(self, name, content):
+        info = tarfile.TarInfo('{0}.{1}'.format(_safe_name(name), self.extension))
+        info.size = len(content)
+        info.mtime = self.mtime
+        self.archive.addfile(info, io.BytesIO(content))
+        # The archive keeps a list of the files, which isn't needed when writing.
+        del self.archive.members[:]
+
+    def close(self):
+        self.archive.close()
+
+
+class _ZipWriter(object):
+    """Write each barcode into a zip archive."""
+
+    def __init__(self, path, extension):
+        # PNG files are already compressed.
+        compression = zipfile.ZIP_STORED if extension == 'png' else zipfile.ZIP_DEFLATED
+        self.archive = zipfile.ZipFile(path, 'w', compression)
+        self.extension = extension
+
+    def write(self, name, content):
+        self.archive.writestr('{0}.{1}'.format(_safe_name(name), self.extension), content)
+
+    def close(self):
+        self.archive.close()
+
+
+class _JsonLinesWriter(object):
+    """Write the name and data URL of each barcode as a line of JSON."""
+
+    def __init__(self, path, extension):
+        if path == '-':
+            self.output_file = sys.stdout
+        else:
+            self.output_file = io.open(path, 'w', encoding='utf-8')
+
+    def write(self, name, content):
+        self.output_file.write(json.dumps({'name': name, 'data_url': content}, sort_keys=True) + '\n')
+
+    def close(self):
+        if self.output_file is sys.stdout:
+            self.output_file.flush()
+        else:
+            self.output_file.close()
+
+
+def _open_writer(path, image_format):
+    """Open the writer that is chosen by the output path, as described in the documentation of this module."""
+    if path == '-' or path.endswith('.jsonl'):
+        return _JsonLinesWriter(path, image_format)
+    if path.endswith(('.tar', '.tar.gz', '.tgz')):
+        return _TarWriter(path, image_format)
+    if path.endswith('.zip'):
+        return _ZipWriter(path, image_format)
+    return _DirectoryWriter(path, image_format)
+
+
+class _Progress(object):
+    """Report the number of rows and the throughput on standard error."""
+
+    def __init__(self, interval, stream):
+        self.interval = interval
+        self.stream = stream
+        self.start = self.last_report = time.time()
+        self.rows = 0
+        self.errors = 0
+
+    def error(self, number, message):
+        self.errors += 1
+        if self.stream is not None:
+            print('pubcode: row {0}: {1}'.format(number, message), file=self.stream)
+
+    def update(self):
+        self.rows += 1
+        if self.stream is not None and self.interval is not None:
+            now = time.time()
+            if now - self.last_report >= self.interval:
+                self.last_report = now
+                self.report(now)
+
+    def report(self, now=None):
+        if self.stream is None:
+            return
+        elapsed = (now or time.time()) - self.start
+        print('pubcode: {0} rows, {1} errors, {2:.0f} rows/s'.format(
+            self.rows, self.errors, self.rows / elapsed if elapsed > 0 else 0
+        ), file=self.stream)
+
+
+def run(rows, writer, output, charset=None, workers=None, chunk_size=256, progress=None, **options):
+    """Encode rows into barcodes and give them to a writer.
+
+    :param rows: Iterable with a tuple of the row number, name and data for each barcode, as from read_rows.
+    :param writer: An object with a write method accepting a name and the content of a barcode.
+    :param output: Either 'png', 'bmp' or 'svg' for image files, or 'data_url' for data URLs.
+    :param progress: A _Progress or None.
+    :param options: Keyword arguments for Code128.encode_many and the method producing the output.
+
+    :returns: Number of rows that couldn't be encoded.
+    """
+    progress = progress or _Progress(None, None)
+
+    # The data is given to encode_many, while the row numbers and names wait in the other copy of the iterator. It only
+    # holds the rows that encode_many has read ahead, which are at most a few chunks.
+    named_rows, data_rows = itertools.tee(rows)
+    results = Code128.encode_many((data for _, _, data in data_rows), charset=charset, output=output,
+                                  workers=workers, chunk_size=chunk_size, **options)
+
+    for (number, name, _), result in zip(named_rows, results):
+        progress.update()
+        if isinstance(result, Code128.Error):
+            progress.error(number, type(result).__name__)
+            continue
+        if not isinstance(result, bytes):
+            result = result if output == 'data_url' else result.encode('utf-8')
+        writer.write(name, result)
+
+    return progress.errors
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='pubcode', description=__doc__.split('\n\n')[0],
+                                     epilog=__doc__.split('\n\n', 2)[2].replace('``', ''),
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('input', nargs='?', default='-',
+                        help='Text or CSV file with the data. Standard input by default.')
+    parser.add_argument('-o', '--output', default='-',
+                        help='Directory, archive or JSON lines file for the barcodes. Standard output by default.')
+    parser.add_argument('-f', '--format', choices=('png', 'bmp', 'svg', 'auto'), default='png',
+                        help="Format of the images. 'auto' is only for data URLs and chooses the smaller of PNG and "
+                             "BMP for each barcode.")
+    parser.add_argument('--column', help='Read the input as CSV and use this column, as a name from the header row or '
+                                         'a number starting from 0. By default, each line is the data of a barcode.')
+    parser.add_argument('--name-column', help='CSV column with the names of the barcodes. By default, the barcodes are '
+                                              'named by their row number.')
+    parser.add_argument('--encoding', default='utf-8', help='Encoding of the input file.')
+    parser.add_argument('--charset', help='Charset of every barcode, either A, B or C. Chosen automatically by '
+                                          'default.')
+    parser.add_argument('--height', type=int, default=1, help='Height of the images in pixels.')
+    parser.add_argument('--module-width', type=int, default=1, help='Width of a module in pixels.')
+    parser.add_argument('--no-quiet-zone', dest='add_quiet_zone', action='store_false',
+                        help='Leave out the quiet zone on both sides of the barcodes.')
+    parser.add_argument('--optimize', action='store_true', help='Make the PNG images as small as possible.')
+    parser.add_argument('-j', '--workers', type=int, help='Number of worker processes. By default, the barcodes are '
+                                                          'encoded in the main process.')
+    parser.add_argument('--chunk-size', type=int, default=256, help='Number of barcodes given to a worker at a time.')
+    parser.add_argument('--progress', type=float, default=5, metavar='SECONDS',
+                        help='Interval between progress reports on standard error.')
+    parser.add_argument('-q', '--quiet', action='store_true', help="Don't write progress or errors on standard error.")
+    args = parser.parse_args(argv)
+
+    writer_path = args.output
+    jsonl = writer_path == '-' or writer_path.endswith('.jsonl')
+    if args.format == 'auto' and not jsonl:
+        parser.error("--format auto is only supported for JSON lines output.")
+    if args.format == 'svg' and not jsonl:
+        options = {'module_width': args.module_width, 'height': args.height, 'add_quiet_zone': args.add_quiet_zone}
+    else:
+        options = {'add_quiet_zone': args.add_quiet_zone, 'optimize': args.optimize}
+        if not jsonl:
+            options.update(height=args.height, module_width=args.module_width)
+    if jsonl:
+        options['image_format'] = args.format
+    output = 'data_url' if jsonl else args.format
+
+    if args.input == '-' and sys.version_info[0] < 3:
+        # The standard input of Python2 reads byte strings, so it's decoded like a file, replacing undecodable bytes.
+        input_file = io.open(sys.stdin.fileno(), encoding=args.encoding, errors='replace', closefd=False,
+                             newline='' if args.column is not None else None)
+    elif args.input == '-':
+        input_file = sys.stdin
+    else:
+        input_file = io.open(args.input, encoding=args.encoding, newline='' if args.column is not None else None)
+
+    progress = _Progress(args.progress, None if args.quiet else sys.stderr)
+    writer = _open_writer(writer_path, args.format)
+    try:
+        rows = read_rows(input_file, args.column, args.name_column)
+        errors = run(rows, writer, output, args.charset, args.workers, args.chunk_size, progress, **options)
+    except ValueError as error:
+        parser.error(str(error))
+    finally:
+        writer.close()
+        if input_file is not sys.stdin:
+            input_file.close()
+
+    progress.report()
+    return 1 if errors else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,32 +1,30 @@
 # -*- coding: utf-8 -*-
 from __future__ import absolute_import, division, print_function, unicode_literals
-from builtins import *  # Use Python3-like builtins for Python2.
-import base64
-import io
-try:
-    from PIL import Image
-except ImportError:
-    # PIL is needed only for creating images of the barcode. Set Image to None to signify that PIL is missing.
-    Image = None
-
-
-class Code128(object):
-    class Error(Exception):
-        pass
+from collections import deque
+import itertools
+import sys
+if sys.version_info[0] < 3:
+    from builtins import *  # Use Python3-like builtins for Python2.
 
-    class CharsetError(Error):
-        pass
+from . import printer
+from .profiling import clock_ns as _clock_ns
+from .symbology import Symbology, _bars_to_bits, _bars_to_width, _outputs
+
+
+class Code128(Symbology):
+    """A Code 128 barcode."""
+    __slots__ = ('_symbols',)
 
-    class CharsetLengthError(Error):
+    class CharsetError(Symbology.Error):
         pass
 
-    class IncompatibleCharsetError(Error):
+    class CharsetLengthError(Symbology.Error):
         pass
 
-    class MissingDependencyError(Error):
+    class IncompatibleCharsetError(Symbology.InvalidDataError):
         pass
 
-    class UnknownFormatError(Error):
+    class DecodeError(Symbology.Error):
         pass
 
     # List of bar and space weights, indexed by symbol character values (0-105), and the STOP character (106).
@@ -45,6 +43,13 @@ class Code128(object):
         '114131', '311141', '411131', '211412', '211214', '211232', '2331112'
     ]
 
+    # The modules of each symbol as bits and the number of modules in each symbol, indexed like Code128._val2bars.
+    # A list comprehension would leave its variable in the class on Python 2, where it could hide Symbology.bars.
+    _val2bits = list(map(_bars_to_bits, _val2bars))
+    _val2width = list(map(_bars_to_width, _val2bars))
+    # Dict mapping bar and space weights back to symbol values.
+    _bars2val = {bars: val for val, bars in enumerate(_val2bars)}
+
     class Special(object):
         """These are special characters used by the Code128 encoding."""
         START_A = '[Start Code A]'
@@ -95,6 +100,13 @@ class Code128(object):
             ],
     }
 
+    # The special characters in all character sets.
+    _special_symbols = frozenset(_val2sym['A'][96:] + _val2sym['B'][96:] + _val2sym['C'][100:])
+
+    # A character of the data that is encoded as FNC1 in every charset, or None if FNC1 can't be encoded. Subclasses
+    # such as GS1_128 set this to give FNC1 a place in the data.
+    _fnc1 = None
+
     # Dicts mapping characters to symbol values in each character set.
     _sym2val = {
         'A': {char: val for val, char in enumerate(_val2sym['A'])},
@@ -102,9 +114,6 @@ class Code128(object):
         'C': {char: val for val, char in enumerate(_val2sym['C'])},
     }
 
-    # How large the quiet zone is on either side of the barcode, when quiet zone is used.
-    quiet_zone = 10
-
     def __init__(self, data, charset=None):
         """Initialize a barcode with data as described by the character sets in charset.
 
@@ -117,9 +126,63 @@ class Code128(object):
                           will result in Code128.CharsetLengthError.
                         - If None is given, the character set will be chosen as to minimize the length of the barcode.
         """
-        self._validate_charset(data, charset)
+        key = ('symbol_values', data, self._charset_key(charset))
+        self._initialize(data, self._cached(key, self._encode_data, data, charset))
+
+    @staticmethod
+    def _charset_key(charset):
+        """Get a charset as given to Code128.__init__ in a form that can be used in cache keys.
 
-        if charset in ('A', 'B'):
+        Lists can't be used in keys, so charset sequences other than strings are converted to tuples.
+        """
+        return charset if charset is None or isinstance(charset, str) else tuple(charset)
+
+    def _initialize(self, data, symbol_values):
+        Symbology._initialize(self, data, symbol_values)
+        self._symbols = None
+
+    @classmethod
+    def _encode_values(cls, data, charset=None):
+        """Validate the charset and encode the data with it, as described in Code128.__init__.
+
+        :raises: Symbology.InvalidDataError or Code128.CharsetError
+        :rtype: list[int]
+        :return: The symbol values representing the barcode.
+        """
+        cls._validate_charset(data, charset)
+        return cls._encode(data, cls._expand_charset(data, charset))
+
+    @classmethod
+    def _encode_data(cls, data, charset=None):
+        """Encode data with Code128._encode_values, timing each step of it with the profiler.
+
+        :rtype: bytes
+        """
+        profiler = cls._get_profiler()
+        if profiler is None:
+            return bytes(cls._encode_values(data, charset))
+
+        start = _clock_ns()
+        cls._validate_charset(data, charset)
+        end = _clock_ns()
+        profiler('validate_charset', end - start, len(data))
+
+        start = end
+        charsets = cls._expand_charset(data, charset)
+        end = _clock_ns()
+        profiler('plan_charsets' if charset is None else 'expand_charset', end - start, len(data))
+
+        start = end
+        symbol_values = bytes(cls._encode(data, charsets))
+        profiler('encode', _clock_ns() - start, len(symbol_values))
+        return symbol_values
+
+    @classmethod
+    def _expand_charset(cls, data, charset):
+        """Expand a validated charset into a charset for each symbol, as described in Code128.__init__."""
+        if charset is None:
+            charset = cls._plan_charsets(data)
+        elif charset in ('A', 'B'):
             charset *= len(data)
         elif charset in ('C',):
             charset *= (len(data) // 2)
@@ -127,8 +190,7 @@ class Code128(object):
                 # If there are an odd number of characters for charset C, encode the last character with charset B.
                 charset += 'B'
 
-        self.data = data
-        self.symbol_values = self._encode(data, charset)
+        return charset
 
     def width(self, add_quiet_zone=False):
         """Return the barcodes width in modules for a given data and character set combination.
@@ -137,36 +199,251 @@ class Code128(object):
 
         :return: Width of barcode in modules, which for images translates to pixels.
         """
-        quiet_zone = self.quiet_zone if add_quiet_zone else 0
-        return len(self.modules) + 2 * quiet_zone
+        return self._symbols_width(len(self._symbol_values), add_quiet_zone)
+
+    @classmethod
+    def _symbols_width(cls, symbol_count, add_quiet_zone):
+        """Get the width in modules of a barcode with the given number of symbols, including the stop symbol."""
+        quiet_zone = cls.quiet_zone if add_quiet_zone else 0
+        # Every symbol is 11 modules wide, except for the stop symbol, which is 13 modules wide.
+        return 11 * symbol_count + 2 + 2 * quiet_zone
+
+    @classmethod
+    def estimate_width(cls, data, charset=None, add_quiet_zone=False):
+        """Get the width in modules that a barcode would have, without creating it.
+
+        Only the number of symbols is counted, so this is much cheaper than Code128(data, charset).width().
+
+        >>> Code128.estimate_width('Hello!') == Code128('Hello!').width()
+        True
+        >>> Code128.estimate_width('12345678', add_quiet_zone=True)
+        99
+
+        :param data: Data to be encoded, as for Code128.__init__.
+        :param charset: Charset, as for Code128.__init__.
+        :param add_quiet_zone: Whether quiet zone should be included in the width.
+        :raises: The same errors as Code128.__init__ for invalid data or charsets.
+        :return: Width of barcode in modules.
+        """
+        cls._validate_charset(data, charset)
+        if charset is None:
+            # The check and stop symbols aren't included in the planned count.
+            symbol_count = cls._plan_symbol_count(data) + 2
+        else:
+            symbol_count = cls._count_symbols(data, cls._expand_charset(data, charset))
+        return cls._symbols_width(symbol_count, add_quiet_zone)
+
+    @classmethod
+    def fit(cls, data, max_width_px, min_module_width=1, charset=None, add_quiet_zone=True):
+        """Get the largest module width with which a barcode fits in the given width.
+
+        >>> Code128.fit('Hello!', 300)
+        2
+        >>> Code128.fit('Hello!', 300, min_module_width=3) is None
+        True
+
+        :param data: Data to be encoded, as for Code128.__init__.
+        :param max_width_px: Available width in pixels.
+        :param min_module_width: Smallest module width that is acceptable, in pixels.
+        :param charset: Charset, as for Code128.__init__.
+        :param add_quiet_zone: Whether quiet zone should be included in the width.
+        :raises: The same errors as Code128.__init__ for invalid data or charsets.
+        :return: The module width in pixels, or None if the barcode doesn't fit with min_module_width.
+        """
+        module_width = max_width_px // cls.estimate_width(data, charset, add_quiet_zone)
+        return module_width if module_width >= min_module_width else None
 
     @staticmethod
     def _validate_charset(data, charset):
-        """"Validate that the charset is correct and throw an error if it isn't."""
+        """"Validate that the data isn't empty and the charset is correct and throw an error if it isn't."""
+        if not data:
+            raise Code128.InvalidDataError('The data must not be empty.')
+        if charset is None:
+            # The charsets are chosen by Code128._plan_charsets, which checks the data itself.
+            return
         if len(charset) > 1:
             charset_data_length = 0
             for symbol_charset in charset:
                 if symbol_charset not in ('A', 'B', 'C'):
                     raise Code128.CharsetError
-                charset_data_length += 2 if symbol_charset is 'C' else 1
+                charset_data_length += 2 if symbol_charset == 'C' else 1
             if charset_data_length != len(data):
                 raise Code128.CharsetLengthError
         elif len(charset) == 1:
             if charset not in ('A', 'B', 'C'):
                 raise Code128.CharsetError
-        elif charset is not None:
+        else:
             raise Code128.CharsetError
 
     @classmethod
-    def _encode(cls, data, charsets):
+    def _plan_charsets(cls, data):
+        """Choose the character sets that encode the data with the smallest number of symbols.
+
+        This is a dynamic programming pass over the data, where the state is the charset that is active after
+        encoding a prefix of the data. A character can be encoded with the active charset, a single A or B character
+        can be encoded with a SHIFT symbol, and a CODE symbol switches the active charset. Charset C consumes digits in
+        pairs, so odd length digit runs are handled by the same search. An FNC1 character is a single symbol in every
+        charset. There are three states per position, so the running time is linear in the length of the data.
+
+        :param data: Data to be encoded.
+        :raises: Code128.IncompatibleCharsetError if a character can't be encoded with any charset.
+        :return: A string with a charset for each symbol, as accepted by Code128._encode.
+        """
+        length = len(data)
+        infinity = 2 * length + 2
+        fnc1 = cls._fnc1
+
+        # costs[i][s] is the smallest number of symbols encoding data[:i] and leaving charset 'BAC'[s] active. B is
+        # first so that it is preferred over A when either could be used.
+        # steps[i][s] is (previous position, previous state, charset of the symbol or None for a CODE symbol).
+        costs = [[infinity] * 3 for _ in range(length + 1)]
+        steps = [[None] * 3 for _ in range(length + 1)]
+        # Any charset can be chosen by the start symbol.
+        costs[0] = [1, 1, 1]
+
+        for i in range(length + 1):
+            cost = costs[i]
+            step = steps[i]
+
+            # Switch the active charset. Two switches in a row are never shorter than one, so a single pass is enough.
+            # Comparisons are strict, so that the active charset is kept when there is a tie.
+            best = min(cost)
+            best_state = cost.index(best)
+            for state in range(3):
+                if best + 1 < cost[state]:
+                    cost[state] = best + 1
+                    step[state] = (i, best_state, None)
+
+            if i == length:
+                break
+
+            char = data[i]
+            next_cost = costs[i + 1]
+            next_step = steps[i + 1]
+            if char == fnc1:
+                # FNC1 keeps the active charset, including charset C.
+                for state, charset in ((0, 'B'), (1, 'A'), (2, 'C')):
+                    if cost[state] + 1 < next_cost[state]:
+                        next_cost[state] = cost[state] + 1
+                        next_step[state] = (i, state, charset)
+                continue
+
+            in_a = char < '\x60'
+            in_b = ' ' <= char < '\x80'
+            if not (in_a or in_b):
+                raise Code128.IncompatibleCharsetError
+
+            for state, charset, in_set, other_charset in ((0, 'B', in_b, 'A'), (1, 'A', in_a, 'B')):
+                if in_set:
+                    new_cost = cost[state] + 1
+                else:
+                    # Use a SHIFT symbol, which doesn't change the active charset.
+                    new_cost = cost[state] + 2
+                    charset = other_charset
+                if new_cost < next_cost[state]:
+                    next_cost[state] = new_cost
+                    next_step[state] = (i, state, charset)
+
+            if '0' <= char <= '9' and i + 1 < length and '0' <= data[i + 1] <= '9':
+                new_cost = cost[2] + 1
+                if new_cost < costs[i + 2][2]:
+                    costs[i + 2][2] = new_cost
+                    steps[i + 2][2] = (i, 2, 'C')
+
+        # Walk the steps back from the cheapest final state, collecting the charset of each encoded symbol.
+        result = []
+        position = length
+        state = costs[length].index(min(costs[length]))
+        while steps[position][state] is not None:
+            position, state, charset = steps[position][state]
+            if charset is not None:
+                result.append(charset)
+        result.reverse()
+
+        return ''.join(result)
+
+    @classmethod
+    def _plan_symbol_count(cls, data):
+        """Get the number of symbols that Code128._plan_charsets would use, not counting the check and stop symbols.
+
+        This is the same search as in Code128._plan_charsets, but only the costs of the last two positions are kept and
+        the steps aren't recorded.
+
+        :raises: Code128.IncompatibleCharsetError if a character can't be encoded with any charset.
+        """
+        length = len(data)
+        infinity = 2 * length + 2
+        fnc1 = cls._fnc1
+
+        # The costs of encoding data[:i] with charset B, A or C active, the costs for data[:i + 1] and the cost for
+        # data[:i + 2] with charset C active. Only charset C consumes two characters.
+        b = a = c = 1
+        next_b = next_a = next_c = after_next_c = infinity
+        for i in range(length):
+            best = min(b, a, c) + 1
+            b, a, c = min(b, best), min(a, best), min(c, best)
+
+            char = data[i]
+            if char == fnc1:
+                next_b, next_a, next_c = min(next_b, b + 1), min(next_a, a + 1), min(next_c, c + 1)
+            else:
+                in_a = char < '\x60'
+                in_b = ' ' <= char < '\x80'
+                if not (in_a or in_b):
+                    raise Code128.IncompatibleCharsetError
+
+                next_b = min(next_b, b + (1 if in_b else 2))
+                next_a = min(next_a, a + (1 if in_a else 2))
+                if '0' <= char <= '9' and i + 1 < length and '0' <= data[i + 1] <= '9':
+                    after_next_c = min(after_next_c, c + 1)
+
+            b, a, c = next_b, next_a, next_c
+            next_b, next_a, next_c, after_next_c = infinity, infinity, after_next_c, infinity
+
+        return min(b, a, c)
+
+    @classmethod
+    def _count_symbols(cls, data, charsets):
+        """Count the symbols that Code128._encode would return for the data and charsets, without encoding them.
+
+        :raises: Code128.IncompatibleCharsetError if a character isn't in its charset.
+        :return: Number of symbols, including the start, check and stop symbols.
+        """
+        # The start symbol, and at the end the check and stop symbols.
+        count = 3
+
+        cur = 0
+        prev_charset = charsets[0]
+        for symbol_num in range(len(charsets)):
+            charset = charsets[symbol_num]
+
+            if charset != prev_charset:
+                # Either a SHIFT symbol or a CODE symbol, as chosen by Code128._encode.
+                count += 1
+                next_charset = charsets[symbol_num + 1] if symbol_num + 1 < len(charsets) else None
+                if not (charset in 'AB' and prev_charset == next_charset and prev_charset in 'AB'):
+                    prev_charset = charset
+
+            nxt = cur + (2 if charset == 'C' else 1)
+            if data[cur:nxt] not in cls._sym2val[charset]:
+                raise Code128.IncompatibleCharsetError
+            cur = nxt
+            count += 1
+
+        return count
+
+    @classmethod
+    def _encode(cls, data, charsets, offsets=None):
         """Encode the data using the character sets in charsets.
 
         :param data: Data to be encoded.
         :param charsets: Sequence of charsets that are used to encode the barcode.
                          Must be the exact amount of symbols needed to encode the data.
+        :param offsets: If a list is given, the index in the result of the symbol for each charset is appended to it.
         :return: List of the symbol values representing the barcode.
         """
         result = []
+        fnc1 = cls._fnc1
 
         charset = charsets[0]
         start_symbol = cls._start_codes[charset]
@@ -191,10 +468,19 @@ class Code128(object):
                     result.append(cls._sym2val[prev_charset][charset_symbol])
                     prev_charset = charset
 
-            nxt = cur + (2 if charset == 'C' else 1)
-            symbol = data[cur:nxt]
+            if fnc1 is not None and data[cur] == fnc1:
+                nxt = cur + 1
+                symbol = cls.Special.FNC_1
+            else:
+                nxt = cur + (2 if charset == 'C' else 1)
+                symbol = data[cur:nxt]
             cur = nxt
-            result.append(cls._sym2val[charset][symbol])
+            if offsets is not None:
+                offsets.append(len(result))
+            try:
+                result.append(cls._sym2val[charset][symbol])
+            except KeyError:
+                raise Code128.IncompatibleCharsetError
 
         result.append(cls._calc_checksum(result))
         result.append(cls._sym2val[charset][cls.Special.STOP])
@@ -204,64 +490,40 @@ class Code128(object):
     @property
     def symbols(self):
         """List of the coded symbols as strings, with special characters included."""
-        def _iter_symbols(symbol_values):
-            # The initial charset doesn't matter, as the start codes have the same symbol values in all charsets.
-            charset = 'A'
-
-            shift_charset = None
-            for symbol_value in symbol_values:
-                if shift_charset:
-                    symbol = self._val2sym[shift_charset][symbol_value]
-                    shift_charset = None
-                else:
-                    symbol = self._val2sym[charset][symbol_value]
-
-                if symbol in (self.Special.START_A, self.Special.CODE_A):
-                    charset = 'A'
-                elif symbol in (self.Special.START_B, self.Special.CODE_B):
-                    charset = 'B'
-                elif symbol in (self.Special.START_C, self.Special.CODE_C):
-                    charset = 'C'
-                elif symbol in (self.Special.SHIFT_A,):
-                    shift_charset = 'A'
-                elif symbol in (self.Special.SHIFT_B,):
-                    shift_charset = 'B'
-
-                yield symbol
-
-        return list(_iter_symbols(self.symbol_values))
-
-    @property
-    def bars(self):
-        """A string of the bar and space weights of the barcode. Starting with a bar and alternating.
-
-        >>> barcode = Code128("Hello!", charset='B')
-        >>> barcode.bars
-        '2112142311131122142211142211141341112221221212412331112'
-
-        :rtype: string
-        """
-        return ''.join(map((lambda val: self._val2bars[val]), self.symbol_values))
+        if self._symbols is None:
+            self._symbols = tuple(symbol for _, symbol in self._iter_symbols(self._symbol_values))
+        return list(self._symbols)
 
-    @property
-    def modules(self):
-        """A list of the modules, with 0 representing a bar and 1 representing a space.
-
-        >>> barcode = Code128("Hello!", charset='B')
-        >>> barcode.modules  # doctest: +ELLIPSIS
-        [0, 0, 1, 0, 1, 1, 0, 1, ..., 0, 0, 0, 1, 0, 1, 0, 0]
+    @classmethod
+    def _iter_symbols(cls, symbol_values):
+        """Iterate over the symbols of symbol values, keeping track of the charset like a barcode reader does.
 
-        :rtype: list[int]
+        :return: Iterator of (charset, symbol) tuples, where charset is the one the symbol was decoded with.
         """
-        def _iterate_modules(bars):
-            is_bar = True
-            for char in map(int, bars):
-                while char > 0:
-                    char -= 1
-                    yield 0 if is_bar else 1
-                is_bar = not is_bar
-
-        return list(_iterate_modules(self.bars))
+        # The initial charset doesn't matter, as the start codes have the same symbol values in all charsets.
+        charset = 'A'
+
+        shift_charset = None
+        for symbol_value in symbol_values:
+            if shift_charset:
+                symbol_charset = shift_charset
+                shift_charset = None
+            else:
+                symbol_charset = charset
+            symbol = cls._val2sym[symbol_charset][symbol_value]
+
+            if symbol in (cls.Special.START_A, cls.Special.CODE_A):
+                charset = 'A'
+            elif symbol in (cls.Special.START_B, cls.Special.CODE_B):
+                charset = 'B'
+            elif symbol in (cls.Special.START_C, cls.Special.CODE_C):
+                charset = 'C'
+            elif symbol in (cls.Special.SHIFT_A,):
+                shift_charset = 'A'
+            elif symbol in (cls.Special.SHIFT_B,):
+                shift_charset = 'B'
+
+            yield symbol_charset, symbol
 
     @staticmethod
     def _calc_checksum(values):
@@ -271,76 +533,299 @@ class Code128(object):
             checksum += index * value
         return checksum % 103
 
-    def image(self, height=1, module_width=1, add_quiet_zone=True):
-        """Get the barcode as PIL.Image.
+    def zpl(self, x=0, y=0, height=50, module_width=2, text=False, label=True):
+        """Get a ZPL command printing the barcode with the printer's own Code 128 support.
+
+        The start, switch and shift symbols are given to the printer explicitly, so the printed barcode has the same
+        symbols as this one. The printer adds the check and stop symbols and the quiet zone is left to the label.
 
-        By default the image is one pixel high and the number of modules pixels wide, with 10 empty modules added to
-        each side to act as the quiet zone. The size can be modified by setting height and module_width, but if used in
-        a web page it might be a good idea to do the scaling on client side.
+        >>> Code128('a\\x001234').zpl()
+        '^XA^FO0,0^BY2^BCN,50,N,N,N,N^FH_^FD>:a>7_00>51234^FS^XZ'
 
-        :param height: Height of the image in number of pixels.
-        :param module_width: A multiplier for the width.
-        :param add_quiet_zone: Whether to add 10 empty modules to each side of the barcode.
+        :param x: Horizontal position of the barcode on the label in dots.
+        :param y: Vertical position of the barcode on the label in dots.
+        :param height: Height of the bars in dots.
+        :param module_width: Width of a module in dots, from 1 to 10.
+        :param text: Whether the printer should print the data under the bars.
+        :param label: Whether to wrap the command in ^XA and ^XZ, so that it prints a label by itself.
 
-        :rtype: PIL.Image
-        :return: A monochromatic image containing the barcode as black bars on white background.
+        :rtype: str
         """
-        if Image is None:
-            raise Code128.MissingDependencyError("PIL module is required to use image method.")
+        field_data = []
+        for charset, symbol in self._iter_symbols(self._symbol_values[:-2]):
+            if symbol in self._special_symbols:
+                # The ZPL invocation codes are '>' followed by a character for the symbol value. The start symbols and
+                # the special symbols have values from 96 to 105 in all charsets.
+                value = self._sym2val[charset][symbol]
+                field_data.append('>' + chr(ord('0') + value - 94))
+            elif symbol == '>':
+                field_data.append('><')
+            else:
+                field_data.append(printer.zpl_field_data(symbol))
+
+        command = '^FO{x},{y}^BY{module_width}^BCN,{height},{text},N,N,N^FH_^FD{data}^FS'.format(
+            x=x, y=y, module_width=module_width, height=height, text='Y' if text else 'N', data=''.join(field_data)
+        )
+        return '^XA' + command + '^XZ' if label else command
 
-        modules = list(self.modules)
-        if add_quiet_zone:
-            # Add ten space modules to each side of the barcode.
-            modules = [1] * self.quiet_zone + modules + [1] * self.quiet_zone
-        width = len(modules)
+    @classmethod
+    def decode(cls, barcode, threshold=None, row=None):
+        """Decode a barcode from its modules, its bars or an image of it.
+
+        The barcode can be read in either direction and the quiet zones are ignored. Each symbol is normalized by its
+        own width, as every symbol except the stop symbol is 11 modules wide. This allows modules that are several
+        pixels wide, such as rows of scanned images.
+
+        >>> Code128.decode(Code128('Hello!', charset='B').modules)
+        ('Hello!', 'BBBBBB')
+        >>> Code128.decode(Code128('a\\x001234').bars)
+        ('a\\x001234', 'BACC')
+
+        :param barcode: One of these:
+                        - A sequence of modules, such as Code128.modules, with bars as 0 and spaces as 1.
+                        - A string of bar and space weights, such as Code128.bars.
+                        - A PIL.Image with the barcode as dark bars on a light background.
+        :param threshold: For a sequence of modules, values lower than the threshold are bars. If None, bars are 0.
+                          For an image, the gray level below which pixels are bars, 128 by default.
+        :param row: The row of the image to decode. By default the middle row is decoded.
+
+        :raises: Code128.DecodeError
+
+        :rtype: tuple
+        :returns: A tuple of the data and the charsets it was encoded with, which can be given to Code128.__init__.
+        """
+        if isinstance(barcode, str):
+            if not all('0' <= weight <= '9' for weight in barcode):
+                raise Code128.DecodeError('The weights of the bars must be digits.')
+            runs = [int(weight) for weight in barcode]
+        else:
+            if hasattr(barcode, 'convert') and hasattr(barcode, 'size'):
+                width, height = barcode.size
+                if row is None:
+                    row = height // 2
+                barcode = bytearray(barcode.convert('L').crop((0, row, width, row + 1)).tobytes())
+                if threshold is None:
+                    threshold = 128
+
+            if threshold is None:
+                is_bar = [not module for module in barcode]
+            else:
+                is_bar = [module < threshold for module in barcode]
+
+            # Get the widths of the bars and spaces, without the spaces on either side of the barcode.
+            runs = [(bar, len(list(group))) for bar, group in itertools.groupby(is_bar)]
+            if runs and not runs[0][0]:
+                runs = runs[1:]
+            if runs and not runs[-1][0]:
+                runs = runs[:-1]
+            runs = [length for _, length in runs]
+
+        # There are 6 bars and spaces in each symbol and 7 in the stop symbol.
+        if len(runs) < 3 * 6 + 7 or len(runs) % 6 != 1:
+            raise Code128.DecodeError('The barcode has the wrong number of bars.')
+
+        try:
+            symbol_values = cls._decode_runs(runs)
+        except Code128.DecodeError:
+            # The barcode might have been read backwards.
+            symbol_values = cls._decode_runs(runs[::-1])
+
+        if cls._calc_checksum(symbol_values[:-2]) != symbol_values[-2]:
+            raise Code128.DecodeError('The checksum of the barcode is incorrect.')
+
+        data = []
+        charsets = []
+        for charset, symbol in cls._iter_symbols(symbol_values[:-2]):
+            if symbol == cls.Special.FNC_1 and cls._fnc1 is not None:
+                symbol = cls._fnc1
+            elif symbol in (cls.Special.FNC_1, cls.Special.FNC_2, cls.Special.FNC_3, cls.Special.FNC_4):
+                raise Code128.DecodeError('Function characters are not supported.')
+            if symbol not in cls._special_symbols:
+                data.append(symbol)
+                charsets.append(charset)
+
+        return ''.join(data), ''.join(charsets)
 
-        img = Image.new(mode='1', size=(width, 1))
-        img.putdata(modules)
+    @classmethod
+    def _decode_runs(cls, runs):
+        """Decode the widths of the bars and spaces into symbol values, which end with a stop symbol.
 
-        if height == 1 and module_width == 1:
-            return img
-        else:
-            new_size = (width * module_width, height)
-            return img.resize(new_size, resample=Image.NEAREST)
+        :raises: Code128.DecodeError
+        """
+        bars2val = cls._bars2val
+        symbol_values = []
+        for start in range(0, len(runs), 6):
+            symbol_runs = runs[start:start + 7] if start + 7 == len(runs) else runs[start:start + 6]
+            modules = 13 if len(symbol_runs) == 7 else 11
+            total = sum(symbol_runs)
+            if total == 0:
+                raise Code128.DecodeError('The symbol at bar {0} has no width.'.format(start))
+            bars = ''.join(str(int(run * modules / total + 0.5)) for run in symbol_runs)
+            value = bars2val.get(bars)
+            if value is None:
+                raise Code128.DecodeError('Unknown symbol with bars {0}.'.format(bars))
+            symbol_values.append(value)
+            if len(symbol_runs) == 7:
+                break
+
+        if symbol_values[0] not in (103, 104, 105):
+            raise Code128.DecodeError('The barcode has no start symbol.')
+        if symbol_values[-1] != 106:
+            raise Code128.DecodeError('The barcode has no stop symbol.')
+        return symbol_values
 
-    def data_url(self, image_format='png', add_quiet_zone=True):
-        """Get a data URL representing the barcode.
+    @classmethod
+    def serial_range(cls, prefix, start, stop, width, charset=None, packed=False):
+        """Iterate over barcodes of consecutive serial numbers.
+
+        The serial numbers are the prefix followed by the numbers from start to stop - 1, padded with zeros to width
+        digits. All of them have the same kinds of characters in the same places, so they are encoded with the same
+        charsets. The first serial number is encoded normally and for each of the next ones only the symbols of the
+        changed digits are replaced, with the check symbol updated from the change in the weighted sum of the symbols.
 
-        >>> barcode = Code128('Hello!', charset='B')
-        >>> barcode.data_url()  # doctest: +ELLIPSIS
-        'data:image/png;base64,...'
+        >>> [barcode.data for barcode in Code128.serial_range('LOT42-', 8, 11, 6)]
+        ['LOT42-000008', 'LOT42-000009', 'LOT42-000010']
 
-        :param image_format: Either 'png' or 'bmp'.
-        :param add_quiet_zone: Add a 10 white pixels on either side of the barcode.
+        :param prefix: Data before the number.
+        :param start: The first number.
+        :param stop: The number after the last one.
+        :param width: Number of digits in each number.
+        :param charset: Charset as in Code128.__init__, for the whole serial number.
+        :param packed: Whether to yield the packed modules of the barcodes instead of the barcodes.
+
+        :raises: ValueError if a number is negative or doesn't fit in width digits.
+        """
+        if start >= stop:
+            return
+        if start < 0 or len(str(stop - 1)) > width:
+            raise ValueError('Numbers from {0} to {1} do not fit in {2} digits.'.format(start, stop - 1, width))
+
+        data = prefix + '{0:0{1}d}'.format(start, width)
+        cls._validate_charset(data, charset)
+        charsets = cls._expand_charset(data, charset)
+        offsets = []
+        symbol_values = cls._encode(data, charsets, offsets)
+
+        # For each character of the data, the index of its symbol. For each symbol encoding data, its charset and the
+        # index of its first character.
+        char_symbols = []
+        symbol_charsets = {}
+        symbol_starts = {}
+        for symbol_charset, offset in zip(charsets, offsets):
+            symbol_charsets[offset] = symbol_charset
+            symbol_starts[offset] = len(char_symbols)
+            char_symbols.extend([offset] * (2 if symbol_charset == 'C' else 1))
+
+        # The weighted sum of the symbols before the check symbol, as calculated by Code128._calc_checksum.
+        weighted_sum = symbol_values[0] + sum(index * value for index, value in enumerate(symbol_values[:-2]))
+        sym2val = cls._sym2val
+        chars = list(data)
+        last = len(chars) - 1
+
+        for number in range(start, stop):
+            if number != start:
+                # Add one to the digits, starting from the last one and carrying over nines.
+                changed_symbols = []
+                position = last
+                while True:
+                    char = chars[position]
+                    chars[position] = '0' if char == '9' else chr(ord(char) + 1)
+                    symbol_index = char_symbols[position]
+                    if not changed_symbols or changed_symbols[-1] != symbol_index:
+                        changed_symbols.append(symbol_index)
+                    if char != '9':
+                        break
+                    position -= 1
+
+                for symbol_index in changed_symbols:
+                    symbol_charset = symbol_charsets[symbol_index]
+                    symbol_start = symbol_starts[symbol_index]
+                    symbol = ''.join(chars[symbol_start:symbol_start + (2 if symbol_charset == 'C' else 1)])
+                    value = sym2val[symbol_charset][symbol]
+                    weighted_sum += symbol_index * (value - symbol_values[symbol_index])
+                    symbol_values[symbol_index] = value
+                symbol_values[-2] = weighted_sum % 103
+
+            barcode = cls._from_symbol_values(''.join(chars), symbol_values)
+            yield barcode.packed_modules() if packed else barcode
+
+    @classmethod
+    def encode_many(cls, data, charset=None, output='data_url', workers=None, use_processes=True, chunk_size=256,
+                    **options):
+        """Encode many barcodes, yielding the results in the same order as the data.
+
+        The data is split into chunks of chunk_size items, which are encoded by a pool of workers. At most two chunks
+        per worker are queued at a time, so the data can be a long iterator. A process pool builds the symbol tables
+        once in each process, when it imports pubcode.
+
+        >>> list(Code128.encode_many(['1234', '\\x80'], output='symbol_values'))
+        [b'i\\x0c"Rj', IncompatibleCharsetError()]
+
+        :param data: Iterable with the data for each barcode.
+        :param charset: Character set used for every barcode, as in Code128.__init__.
+        :param output: One of 'data_url', 'png', 'bmp', 'svg', 'modules', 'packed_modules', 'symbol_values' or
+                       'barcode'.
+        :param workers: Number of workers. If None, the barcodes are encoded in the current thread.
+        :param use_processes: Whether to use a pool of processes or a pool of threads for the workers.
+        :param chunk_size: Number of barcodes given to a worker at a time.
+        :param options: Keyword arguments for the method producing the output, such as add_quiet_zone.
 
         :raises: Code128.UnknownFormatError
-        :raises: Code128.MissingDependencyError
 
-        :rtype: str
-        :returns: A data URL with the barcode as an image.
+        :returns: Iterator with an output for each barcode. If a barcode can't be encoded, the output is the
+                  Code128.Error that was raised, so that a single bad item doesn't stop the rest of the batch.
         """
-        memory_file = io.BytesIO()
-        pil_image = self.image(add_quiet_zone=add_quiet_zone)
-
-        # Using BMP can often result in smaller data URLs than PNG, but it isn't as widely supported by browsers as PNG.
-        # GIFs result in data URLs 10 times bigger than PNG or BMP, possibly due to lack of support for monochrome GIFs
-        # in Pillow, so they shouldn't be used.
-        if image_format == 'png':
-            # Unfortunately there is no way to avoid adding the zlib headers.
-            # Using compress_level=0 sometimes results in a slightly bigger data size (by a few bytes), but there
-            # doesn't appear to be a difference between levels 9 and 1, so let's just use 1.
-            pil_image.save(memory_file, format='png', compress_level=1)
-        elif image_format == 'bmp':
-            pil_image.save(memory_file, format='bmp')
-        else:
-            raise Code128.UnknownFormatError('Only png and bmp are supported.')
+        if output not in _outputs:
+            raise Code128.UnknownFormatError('Unknown output {0!r}.'.format(output))
+
+        data = iter(data)
+        chunks = iter(lambda: list(itertools.islice(data, chunk_size)), [])
+
+        if workers is None:
+            for chunk in chunks:
+                for result in _encode_chunk(cls, chunk, charset, output, options):
+                    yield result
+            return
+
+        from concurrent import futures
+        executor_class = futures.ProcessPoolExecutor if use_processes else futures.ThreadPoolExecutor
+
+        with executor_class(workers) as executor:
+            pending = deque()
+            for chunk in chunks:
+                pending.append(executor.submit(_encode_chunk, cls, chunk, charset, output, options))
+                if len(pending) >= 2 * workers:
+                    for result in pending.popleft().result():
+                        yield result
+            while pending:
+                for result in pending.popleft().result():
+                    yield result
 
-        # Encode the data in the BytesIO object and convert the result into unicode.
-        base64_image = base64.b64encode(memory_file.getvalue()).decode('ascii')
+    @classmethod
+    def render_async(cls, data, charset=None, output='data_url', **options):
+        """Encode and render a barcode without blocking the asyncio event loop.
 
-        data_url = 'data:image/{format};base64,{base64_data}'.format(
-            format=image_format,
-            base64_data=base64_image
-        )
+        The work is done by the shared renderer of pubcode.aio, which runs it in an executor, limits how many barcodes
+        are rendered at a time and renders identical requests that are in flight at the same time only once.
 
-        return data_url
+        :param data: The data to be encoded.
+        :param charset: Character set, as in Code128.__init__.
+        :param output: The output, as in Code128.encode_many.
+        :param options: Keyword arguments for the method producing the output, such as add_quiet_zone.
+
+        :returns: An awaitable for the output. Awaiting it raises Code128.Error if the barcode can't be encoded.
+        """
+        from . import aio
+        return aio.default_renderer().render(cls, data, charset, output, options)
+
+
+def _encode_chunk(cls, chunk, charset, output, options):
+    """Encode a chunk of data for Code128.encode_many. This is a module level function, so it can be pickled."""
+    output_function = _outputs[output]
+    results = []
+    for data in chunk:
+        try:
+            results.append(output_function(cls(data, charset), options))
+        except Code128.Error as error:
+            results.append(error)
+    return results
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+"""Code 39 barcodes, as used for industrial and logistics labels.
+
+>>> from pubcode import Code39
+>>> Code39('PUB-42').width()
+127
+>>> Code39('PUB-42', check_digit=True).symbol_values[-2]
+22
+"""
+from __future__ import absolute_import, division, print_function, unicode_literals
+import sys
+if sys.version_info[0] < 3:
+    from builtins import *  # Use Python3-like builtins for Python2.
+
+from .symbology import Symbology, _bars_to_bits, _bars_to_width
+
+# The characters that can be encoded, indexed by their values in the check digit calculation.
+_characters = '0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ-. $/+%'
+
+# The narrow (n) and wide (w) elements of each character and of the start and stop character *, starting with a bar and
+# alternating.
+_elements = [
+    'nnnwwnwnn', 'wnnwnnnnw', 'nnwwnnnnw', 'wnwwnnnnn', 'nnnwwnnnw', 'wnnwwnnnn', 'nnwwwnnnn', 'nnnwnnwnw', 'wnnwnnwnn',
+    'nnwwnnwnn', 'wnnnnwnnw', 'nnwnnwnnw', 'wnwnnwnnn', 'nnnnwwnnw', 'wnnnwwnnn', 'nnwnwwnnn', 'nnnnnwwnw', 'wnnnnwwnn',
+    'nnwnnwwnn', 'nnnnwwwnn', 'wnnnnnnww', 'nnwnnnnww', 'wnwnnnnwn', 'nnnnwnnww', 'wnnnwnnwn', 'nnwnwnnwn', 'nnnnnnwww',
+    'wnnnnnwwn', 'nnwnnnwwn', 'nnnnwnwwn', 'wwnnnnnnw', 'nwwnnnnnw', 'wwwnnnnnn', 'nwnnwnnnw', 'wwnnwnnnn', 'nwwnwnnnn',
+    'nwnnnnwnw', 'wwnnnnwnn', 'nwwnnnwnn', 'nwnwnwnnn', 'nwnwnnnwn', 'nwnnnwnwn', 'nnnwnwnwn', 'nwnnwnwnn',
+]
+
+
+def _elements_to_bars(elements):
+    """Convert narrow and wide elements into bar and space weights, with wide elements three modules wide."""
+    return elements.replace('n', '1').replace('w', '3')
+
+
+class Code39(Symbology):
+    """A Code 39 barcode, encoding digits, upper case letters, space and -.$/+%."""
+    __slots__ = ()
+
+    # Symbol values 0-42 are the characters, 43 is the start character and 44 is the stop character. Every symbol
+    # except the stop character is followed by a narrow space, which separates it from the next character.
+    _START = 43
+    _STOP = 44
+
+    _val2bars = [_elements_to_bars(elements) + '1' for elements in _elements] + [_elements_to_bars(_elements[-1])]
+    # A list comprehension would leave its variable in the class on Python 2, where it could hide Symbology.bars.
+    _val2bits = list(map(_bars_to_bits, _val2bars))
+    _val2width = list(map(_bars_to_width, _val2bars))
+
+    _char2val = {char: val for val, char in enumerate(_characters)}
+
+    def __init__(self, data, check_digit=False):
+        """Initialize a barcode with data.
+
+        :param data: The data to be encoded. Lower case letters and the * character can't be encoded.
+        :param check_digit: Whether to add a modulo 43 check digit after the data.
+        :raises: Symbology.InvalidDataError if the data has characters that can't be encoded.
+        """
+        self._initialize(data, self._cached(('symbol_values', data, check_digit), self._encode_data, data,
+                                            check_digit))
+
+    @staticmethod
+    def _calc_checksum(values):
+        """Calculate the value of the modulo 43 check digit."""
+        return sum(values) % 43
+
+    @classmethod
+    def _encode_values(cls, data, check_digit=False):
+        """Encode the data between the start and stop characters, with the check digit if requested."""
+        char2val = cls._char2val
+        try:
+            values = [char2val[char] for char in data]
+        except KeyError as error:
+            raise Symbology.InvalidDataError('Code39 can not encode {0!r}.'.format(error.args[0]))
+
+        if check_digit:
+            values.append(cls._calc_checksum(values))
+        return [cls._START] + values + [cls._STOP]
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+"""EAN-13 and UPC-A barcodes, as used for retail products.
+
+>>> from pubcode import EAN13, UPCA
+>>> EAN13('400638133393').data
+'4006381333931'
+>>> UPCA('03600029145').data
+'036000291452'
+"""
+from __future__ import absolute_import, division, print_function, unicode_literals
+import sys
+if sys.version_info[0] < 3:
+    from builtins import *  # Use Python3-like builtins for Python2.
+
+from .symbology import Symbology
+
+# The modules of each digit in the L code, with 1 for a bar and 0 for a space. The G code is the R code reversed and
+# the R code is the L code with bars and spaces swapped.
+_l_code = ['0001101', '0011001', '0010011', '0111101', '0100011', '0110001', '0101111', '0111011', '0110111', '0001011']
+_r_code = [modules.translate({ord('0'): '1', ord('1'): '0'}) for modules in _l_code]
+_g_code = [modules[::-1] for modules in _r_code]
+
+# The codes of the six digits of the left half, for each first digit. The first digit isn't a symbol itself, but is
+# given by which digits of the left half use the G code.
+_parities = ['LLLLLL', 'LLGLGG', 'LLGGLG', 'LLGGGL', 'LGLLGG', 'LGGLLG', 'LGGGLL', 'LGLGLG', 'LGLGGL', 'LGGLGL']
+
+
+class EAN13(Symbology):
+    """An EAN-13 barcode, encoding 12 digits and a check digit."""
+    __slots__ = ()
+
+    # Symbol values 0-9 are the digits in the L code, 10-19 in the G code and 20-29 in the R code. 30 is the guard at
+    # each end of the barcode and 31 is the guard in the middle.
+    _GUARD = 30
+    _CENTER_GUARD = 31
+    _offsets = {'L': 0, 'G': 10, 'R': 20}
+
+    _val2bars, _val2bits, _val2width = Symbology._pattern_tables(_l_code + _g_code + _r_code + ['101', '01010'])
+
+    # The number of digits, including the check digit.
+    _length = 13
+
+    # The specification requires 11 modules on the left and 7 on the right, so the larger one is used on both sides.
+    quiet_zone = 11
+
+    def __init__(self, data):
+        """Initialize a barcode with the digits of the data.
+
+        :param data: A string of the digits without the check digit, or with the check digit, in which case it is
+                     verified. The data of the barcode always includes the check digit.
+        :raises: Symbology.InvalidDataError if the data isn't digits of the right length, or the check digit is wrong.
+        """
+        Symbology.__init__(self, self._complete(data))
+
+    @classmethod
+    def _complete(cls, data):
+        """Validate the data and add the check digit, if it isn't included."""
+        length = cls._length
+        if len(data) not in (length - 1, length) or not all('0' <= char <= '9' for char in data):
+            raise Symbology.InvalidDataError('{0} requires {1} or {2} digits.'.format(cls.__name__, length - 1, length))
+
+        check_digit = str(cls._calc_checksum(data[:length - 1]))
+        if len(data) == length and data[-1] != check_digit:
+            raise Symbology.InvalidDataError('The check digit should be {0}.'.format(check_digit))
+        return data[:length - 1] + check_digit
+
+    @staticmethod
+    def _calc_checksum(digits):
+        """Calculate the check digit, with weights alternating between 3 and 1 from the right.
+
+        >>> EAN13._calc_checksum('400638133393')
+        1
+        """
+        total = sum(int(digit) * (3 if index % 2 == 0 else 1) for index, digit in enumerate(reversed(digits)))
+        return -total % 10
+
+    @classmethod
+    def _encode_values(cls, data):
+        """Encode the 13 digits of an EAN-13 barcode, including the check digit."""
+        digits = [int(digit) for digit in data]
+        offsets = cls._offsets
+
+        values = [cls._GUARD]
+        values += [offsets[code] + digit for code, digit in zip(_parities[digits[0]], digits[1:7])]
+        values.append(cls._CENTER_GUARD)
+        values += [offsets['R'] + digit for digit in digits[7:]]
+        values.append(cls._GUARD)
+        return values
+
+
+class UPCA(EAN13):
+    """A UPC-A barcode, encoding 11 digits and a check digit.
+
+    A UPC-A barcode is the same as an EAN-13 barcode with a first digit of 0.
+    """
+    __slots__ = ()
+
+    _length = 12
+
+    quiet_zone = 9
+
+    @classmethod
+    def _encode_values(cls, data):
+        return super(UPCA, cls)._encode_values('0' + data)
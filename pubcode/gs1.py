@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+"""GS1-128 barcodes, which encode GS1 Application Identifiers (AIs) and their values, such as on logistics labels.
+
+>>> from pubcode import GS1_128
+>>> barcode = GS1_128('(00)106141411234567897')
+>>> barcode.symbols[:3]
+['[Start Code C]', '[FNC 1]', '00']
+>>> barcode.human_readable
+'(00)106141411234567897'
+"""
+from __future__ import absolute_import, division, print_function, unicode_literals
+import re
+import sys
+if sys.version_info[0] < 3:
+    from builtins import *  # Use Python3-like builtins for Python2.
+
+from .code128 import Code128
+from .ean import EAN13
+from .symbology import Symbology
+
+# The character that stands for FNC1 in the data of a GS1_128 barcode. It is the group separator, which scanners also
+# transmit for the FNC1 separators.
+FNC1 = '\x1d'
+
+# The characters allowed in alphanumeric values, which is GS1 character set 82.
+_alphanumeric = frozenset('!"%&\'()*+,-./0123456789:;<=>?ABCDEFGHIJKLMNOPQRSTUVWXYZ_abcdefghijklmnopqrstuvwxyz')
+
+
+def _application_identifiers():
+    """Build the table of Application Identifiers.
+
+    :return: Dict mapping AIs to tuples of the minimum and maximum length of the value, whether the value is numeric,
+             whether the AI has a predefined length, so that no FNC1 separator follows it, and the number of leading
+             digits that end with a GS1 check digit, which is 0 if there is no check digit.
+    """
+    table = {}
+
+    def add(ais, min_length, max_length, numeric, predefined=False, check_digit=0):
+        for ai in ais:
+            table[ai] = (min_length, max_length, numeric, predefined, check_digit)
+
+    add(['00'], 18, 18, True, predefined=True, check_digit=18)
+    add(['01', '02'], 14, 14, True, predefined=True, check_digit=14)
+    add(['11', '12', '13', '15', '16', '17'], 6, 6, True, predefined=True)
+    add(['20'], 2, 2, True, predefined=True)
+    add(['10', '21', '22', '254', '420'], 1, 20, False)
+    add(['8020'], 1, 25, False)
+    add(['240', '241', '250', '251', '400', '401', '403', '8004', '90'], 1, 30, False)
+    add(['91', '92', '93', '94', '95', '96', '97', '98', '99'], 1, 90, False)
+    add(['30', '37'], 1, 8, True)
+    # The measures have the number of decimals as the last digit of the AI.
+    measures = ['31{0}'.format(digit) for digit in range(7)] + ['32{0}'.format(digit) for digit in range(10)]
+    measures += ['33{0}'.format(digit) for digit in range(8)] + ['34{0}'.format(digit) for digit in range(10)]
+    measures += ['35{0}'.format(digit) for digit in range(8)] + ['36{0}'.format(digit) for digit in range(10)]
+    add([measure + str(decimals) for measure in measures for decimals in range(10)], 6, 6, True, predefined=True)
+    add(['390{0}'.format(decimals) for decimals in range(10)], 1, 15, True)
+    add(['391{0}'.format(decimals) for decimals in range(10)], 4, 18, True)
+    add(['392{0}'.format(decimals) for decimals in range(10)], 1, 15, True)
+    add(['393{0}'.format(decimals) for decimals in range(10)], 4, 18, True)
+    add(['402'], 17, 17, True, check_digit=17)
+    add(['410', '411', '412', '413', '414', '415'], 13, 13, True, predefined=True, check_digit=13)
+    add(['421'], 4, 12, False)
+    add(['422', '424', '426'], 3, 3, True)
+    add(['423', '425'], 3, 15, True)
+    add(['7003'], 10, 10, True)
+    add(['8003'], 14, 30, False)
+    add(['8005'], 6, 6, True)
+    # The ITIP has the check digit after the GTIN, which is followed by the piece number and the total count.
+    add(['8006'], 18, 18, True, check_digit=14)
+    add(['8018'], 18, 18, True, check_digit=18)
+    return table
+
+
+# Dict mapping Application Identifiers to tuples of the minimum and maximum length of the value, whether the value is
+# numeric, whether the AI has a predefined length and the number of leading digits that end with a check digit. AIs are
+# 2 to 4 digits and no AI is a prefix of another one, so an element string can be split without separators after
+# predefined lengths.
+_ais = _application_identifiers()
+
+_human_readable = re.compile(r'\((\d{2,4})\)')
+
+
+class GS1_128(Code128):
+    """A GS1-128 barcode, which is a Code 128 barcode that starts with FNC1 and encodes GS1 element strings.
+
+    The data of the barcode is the element string, with FNC1 written as the FNC1 character of this module. It starts
+    with FNC1 and has an FNC1 separator after each value that doesn't have a predefined length, except the last one.
+    The elements with a predefined length are moved before the others, which saves separators. The charsets are chosen
+    to encode the data with the fewest symbols, so numeric values are encoded in charset C, even across separators.
+    """
+    __slots__ = ()
+
+    _fnc1 = FNC1
+
+    class ApplicationIdentifierError(Symbology.InvalidDataError):
+        pass
+
+    def __init__(self, elements, charset=None):
+        """Initialize a barcode with GS1 elements.
+
+        :param elements: One of these:
+                         - An iterable of (AI, value) tuples, such as [('01', '09506000134352'), ('10', 'ABC123')].
+                         - A human readable string, such as '(01)09506000134352(10)ABC123'.
+                         - An element string, such as the data of a barcode, with FNC1 as separator. The leading FNC1
+                           is optional.
+        :param charset: Must be None, as the charsets are always chosen to make the barcode as short as possible. It
+                        is accepted so that GS1_128 can be used with Code128.encode_many.
+        :raises: GS1_128.ApplicationIdentifierError if an AI is unknown or a value doesn't fit its AI, or
+                 Code128.CharsetError if a charset is given.
+        """
+        if charset is not None:
+            raise Code128.CharsetError('GS1_128 chooses the charsets itself.')
+        Code128.__init__(self, self._element_string(self._parse(elements)))
+
+    @classmethod
+    def _parse(cls, elements):
+        """Get the (AI, value) tuples from the forms of elements accepted by GS1_128.__init__."""
+        if not isinstance(elements, str):
+            return list(elements)
+        if elements.startswith('('):
+            parts = _human_readable.split(elements)
+            if parts[0]:
+                raise GS1_128.ApplicationIdentifierError('The data must start with an AI in parentheses.')
+            return list(zip(parts[1::2], parts[2::2]))
+        return cls._split_element_string(elements)
+
+    @staticmethod
+    def _split_element_string(data):
+        """Split an element string into (AI, value) tuples, using the lengths in the AI table and the separators."""
+        if data.startswith(FNC1):
+            data = data[1:]
+
+        result = []
+        position = 0
+        while position < len(data):
+            for ai_length in (2, 3, 4):
+                ai = data[position:position + ai_length]
+                if ai in _ais:
+                    break
+            else:
+                raise GS1_128.ApplicationIdentifierError('Unknown AI at {0!r}.'.format(data[position:position + 4]))
+
+            _, max_length, _, predefined, _ = _ais[ai]
+            position += len(ai)
+            if predefined:
+                end = position + max_length
+            else:
+                end = data.find(FNC1, position)
+                if end == -1:
+                    end = len(data)
+            result.append((ai, data[position:end]))
+            position = end + 1 if data[end:end + 1] == FNC1 else end
+        return result
+
+    @staticmethod
+    def _element_string(elements):
+        """Validate the elements and join them into an element string, with FNC1 first and between elements.
+
+        :raises: GS1_128.ApplicationIdentifierError
+        """
+        if not elements:
+            raise GS1_128.ApplicationIdentifierError('At least one element is required.')
+
+        checked = []
+        for ai, value in elements:
+            if ai not in _ais:
+                raise GS1_128.ApplicationIdentifierError('Unknown AI {0!r}.'.format(ai))
+            min_length, max_length, numeric, predefined, check_digit = _ais[ai]
+            if not min_length <= len(value) <= max_length:
+                raise GS1_128.ApplicationIdentifierError(
+                    'The value of AI {0} must have {1} to {2} characters.'.format(ai, min_length, max_length)
+                )
+            if numeric and not all('0' <= char <= '9' for char in value):
+                raise GS1_128.ApplicationIdentifierError('The value of AI {0} must be numeric.'.format(ai))
+            if not numeric and not all(char in _alphanumeric for char in value):
+                raise GS1_128.ApplicationIdentifierError('The value of AI {0} has invalid characters.'.format(ai))
+            if check_digit and EAN13._calc_checksum(value[:check_digit - 1]) != int(value[check_digit - 1]):
+                raise GS1_128.ApplicationIdentifierError('The check digit of AI {0} is incorrect.'.format(ai))
+            checked.append((not predefined, ai, value))
+
+        # The elements with predefined lengths need no separators, so they are put first. The sort is stable, so the
+        # order is otherwise kept.
+        checked.sort(key=lambda element: element[0])
+        parts = [FNC1]
+        for index, (separated, ai, value) in enumerate(checked):
+            parts.append(ai + value)
+            if separated and index + 1 < len(checked):
+                parts.append(FNC1)
+        return ''.join(parts)
+
+    @property
+    def elements(self):
+        """The (AI, value) tuples of the barcode.
+
+        :rtype: list[tuple]
+        """
+        return self._split_element_string(self._data)
+
+    @property
+    def human_readable(self):
+        """The elements with the AIs in parentheses, as printed under the barcode.
+
+        :rtype: str
+        """
+        return ''.join('({0}){1}'.format(ai, value) for ai, value in self.elements)
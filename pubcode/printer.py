@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+"""Raster commands for label and receipt printers.
+
+The images are given as a single row of packed pixels, like in pubcode.raster, with a 0 bit as black and a 1 bit as
+white. Printers use the opposite, so the rows are inverted here. The row is repeated for every line of the image.
+"""
+from __future__ import absolute_import, division, print_function, unicode_literals
+import binascii
+import struct
+import sys
+if sys.version_info[0] < 3:
+    from builtins import *  # Use Python3-like builtins for Python2.
+
+# Characters of the ZPL compression scheme, which stand for repeating the next character 1 to 19 times and 20 to 400
+# times in steps of 20.
+_ZPL_ONES = 'GHIJKLMNOPQRSTUVWXY'
+_ZPL_TWENTIES = 'ghijklmnopqrstuvwxyz'
+
+
+def _printer_row(row):
+    """Invert a row of packed pixels, so that 1 bits are black."""
+    return bytes(bytearray(byte ^ 0xff for byte in bytearray(row)))
+
+
+def _zpl_compress_row(hex_row):
+    """Compress a row of hexadecimal pixels with the ZPL compression scheme.
+
+    A run of zeros at the end of the row is replaced with ',' and a run of ones with '!'. Other runs of the same
+    character are replaced with a repeat count and the character.
+    """
+    compressed = []
+    stripped = hex_row.rstrip('0')
+    if len(stripped) < len(hex_row):
+        end = ','
+    else:
+        stripped = hex_row.rstrip('F')
+        end = '!' if len(stripped) < len(hex_row) else ''
+
+    index = 0
+    while index < len(stripped):
+        char = stripped[index]
+        count = 1
+        while index + count < len(stripped) and stripped[index + count] == char:
+            count += 1
+        index += count
+
+        while count > 1:
+            repeat = min(count, 419)
+            count -= repeat
+            if repeat >= 20:
+                compressed.append(_ZPL_TWENTIES[repeat // 20 - 1])
+            if repeat % 20:
+                compressed.append(_ZPL_ONES[repeat % 20 - 1])
+            compressed.append(char)
+        if count == 1:
+            compressed.append(char)
+
+    compressed.append(end)
+    return ''.join(compressed)
+
+
+def zpl_graphic_field(row, height, compress=True):
+    """Get a ZPL ^GF command printing an image, where every line has the same pixels.
+
+    :param row: The packed pixels of a single line.
+    :param height: Height of the image in dots.
+    :param compress: Whether to use the ZPL compression scheme, in which every line after the first is a single ':'.
+
+    :rtype: str
+    """
+    row = _printer_row(row)
+    hex_row = binascii.hexlify(row).decode('ascii').upper()
+    if compress:
+        data = _zpl_compress_row(hex_row) + ':' * (height - 1)
+    else:
+        data = hex_row * height
+    total = len(row) * height
+    return '^GFA,{0},{0},{1},{2}'.format(total, len(row), data)
+
+
+def escpos_raster_image(row, height):
+    """Get an ESC/POS GS v 0 command printing a raster image, where every line has the same pixels.
+
+    :param row: The packed pixels of a single line.
+    :param height: Height of the image in dots.
+
+    :rtype: bytes
+    """
+    row = _printer_row(row)
+    # GS v 0, normal density, the width in bytes and the height in dots.
+    return b'\x1dv0\x00' + struct.pack(b'<HH', len(row), height) + row * height
+
+
+def zpl_field_data(text):
+    """Escape text for a ZPL ^FD command that follows a ^FH command with '_' as the escape character.
+
+    Characters that ZPL would interpret, as well as control characters, are written as hexadecimal escapes.
+
+    :rtype: str
+    """
+    return ''.join(
+        '_{0:02X}'.format(ord(char)) if char < ' ' or char in '^~_\x7f' else char
+        for char in text
+    )
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+"""Timing of the stages of encoding and rendering barcodes.
+
+Profiling is disabled by default. It is enabled by giving Code128 a profiler, which is any callable that accepts the
+name of a stage, its duration in nanoseconds and the size of its result:
+
+>>> from pubcode import Code128
+>>> from pubcode.profiling import StageCollector
+>>> Code128.profiler = StageCollector()
+>>> url = Code128('Hello!').data_url()
+>>> sorted(Code128.profiler.stats())
+['base64', 'encode', 'packed_modules', 'plan_charsets', 'png', 'validate_charset']
+>>> Code128.profiler.stats()['png']['count']
+1
+>>> Code128.profiler = None
+
+The stages are:
+
+- validate_charset: Checking the charset given to Code128. The size is the length of the data.
+- plan_charsets: Choosing the charsets, when no charset is given. The size is the length of the data.
+- expand_charset: Expanding a given charset into a charset for each symbol. The size is the length of the data.
+- encode: Encoding the data into symbol values. The size is the number of symbols.
+- packed_modules: Expanding the symbols into packed modules. The size is the number of modules, including the quiet
+  zone and the module width.
+- image: Creating and scaling a PIL image. The size is the number of pixels.
+- png, bmp and svg: Writing the image data. The size is the number of bytes.
+- base64: Encoding the image data for a data URL. The size is the number of characters.
+"""
+from __future__ import absolute_import, division, print_function, unicode_literals
+import bisect
+import sys
+import threading
+if sys.version_info[0] < 3:
+    from builtins import *  # Use Python3-like builtins for Python2.
+
+try:
+    from time import perf_counter_ns as clock_ns
+except ImportError:
+    # Python 2 and Python 3 before 3.7.
+    from timeit import default_timer
+
+    def clock_ns():
+        """Get the value of a performance counter in nanoseconds."""
+        return int(default_timer() * 1e9)
+
+# Upper bounds of the histogram buckets in nanoseconds, from 1 µs to about 4 seconds.
+DEFAULT_BUCKETS = tuple(1000 * 2 ** exponent for exponent in range(23))
+
+
+class StageCollector(object):
+    """A thread safe profiler, which aggregates the durations of each stage into counters and a histogram."""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        """Initialize a collector without any measurements.
+
+        :param buckets: Sorted upper bounds of the histogram buckets in nanoseconds. Durations above the last bound are
+                        counted in an extra bucket.
+        """
+        self.buckets = tuple(buckets)
+
+        self._lock = threading.Lock()
+        # Maps stage names to lists of the count, total duration, minimum duration, maximum duration, total size and the
+        # histogram.
+        self._stages = {}
+
+    def __call__(self, stage, duration_ns, size):
+        """Add the duration of a stage."""
+        with self._lock:
+            counters = self._stages.get(stage)
+            if counters is None:
+                counters = self._stages[stage] = [0, 0, duration_ns, duration_ns, 0, [0] * (len(self.buckets) + 1)]
+            counters[0] += 1
+            counters[1] += duration_ns
+            counters[2] = min(counters[2], duration_ns)
+            counters[3] = max(counters[3], duration_ns)
+            counters[4] += size
+            counters[5][bisect.bisect_left(self.buckets, duration_ns)] += 1
+
+    def clear(self):
+        """Remove all measurements."""
+        with self._lock:
+            self._stages.clear()
+
+    def stats(self):
+        """Get the counters of every stage that has been measured.
+
+        :rtype: dict
+        :returns: For each stage, the number of measurements as count, the total, minimum and maximum durations in
+                  nanoseconds as total_ns, min_ns and max_ns, the total size as size and the histogram as buckets. The
+                  histogram is a list of [upper bound, count] pairs, where the last upper bound is None for the
+                  durations above every bound. A duration equal to a bound is counted in that bound's bucket.
+        """
+        with self._lock:
+            return {
+                stage: {
+                    'count': count,
+                    'total_ns': total,
+                    'min_ns': minimum,
+                    'max_ns': maximum,
+                    'size': size,
+                    'buckets': [list(pair) for pair in zip(self.buckets + (None,), histogram)],
+                }
+                for stage, (count, total, minimum, maximum, size, histogram) in self._stages.items()
+            }
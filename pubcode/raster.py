@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+"""Minimal writers for 1-bit images, which don't depend on PIL.
+
+The images are given as rows of packed pixels, with 8 pixels per byte and the leftmost pixel in the most significant
+bit. A 0 bit is black and a 1 bit is white, which is the same as in Code128.packed_modules.
+"""
+from __future__ import absolute_import, division, print_function, unicode_literals
+import struct
+import sys
+import zlib
+if sys.version_info[0] < 3:
+    from builtins import *  # Use Python3-like builtins for Python2.
+
+_PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+# Palette of a 1-bit BMP, with index 0 as black and 1 as white. Each entry is in blue, green, red, reserved order.
+_BMP_PALETTE = b'\x00\x00\x00\x00\xff\xff\xff\x00'
+
+# The zlib strategies that are tried when optimizing a PNG. Python 2 has no constants for Z_RLE and Z_FIXED, but zlib
+# accepts their values.
+_STRATEGIES = (zlib.Z_DEFAULT_STRATEGY, zlib.Z_FILTERED, zlib.Z_HUFFMAN_ONLY, getattr(zlib, 'Z_RLE', 3),
+               getattr(zlib, 'Z_FIXED', 4))
+
+
+def _png_chunk(chunk_type, data):
+    """Get a PNG chunk with the length, type, data and CRC."""
+    crc = zlib.crc32(data, zlib.crc32(chunk_type)) & 0xffffffff
+    return struct.pack(b'>I', len(data)) + chunk_type + data + struct.pack(b'>I', crc)
+
+
+def _compress(data, level, strategy):
+    """Compress data into a zlib stream with the given compression level and strategy."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, zlib.MAX_WBITS, 9, strategy)
+    return compressor.compress(data) + compressor.flush()
+
+
+def _sub_filter(row):
+    """Apply the PNG Sub filter to a line, which replaces each byte with the difference to the byte before it."""
+    return bytearray((row[index] - (row[index - 1] if index else 0)) & 0xff for index in range(len(row)))
+
+
+def png(row, width, height=1, compress_level=None, optimize=False):
+    """Get a grayscale PNG with a bit depth of 1, where every line has the same pixels.
+
+    Only the IHDR, IDAT and IEND chunks are included, as nothing else is needed to display the image.
+
+    :param row: The packed pixels of a single line.
+    :param width: Width of the image in pixels.
+    :param height: Height of the image in pixels.
+    :param compress_level: The zlib compression level for the image data. If None, the smallest result of levels 1
+                           and 9 with and without the Sub filter on the first line is used, which is never larger than
+                           what PIL saves with compress_level=1.
+    :param optimize: Whether to compress the image data with every zlib strategy, as well as without compression, and
+                     use the smallest result instead of compress_level. A single line of a barcode usually can't be
+                     compressed, so storing it uncompressed is smaller.
+
+    :rtype: bytes
+    """
+    # Width, height, bit depth, color type (grayscale), compression, filter and interlace method.
+    header = struct.pack(b'>IIBBBBB', width, height, 1, 0, 0, 0, 0)
+    row = bytearray(row)
+    if width % 8:
+        # The padding bits of the last byte are cleared, as PIL does, so that the image data compresses the same.
+        row[-1] &= 0xff << (8 - width % 8) & 0xff
+    # Every scanline starts with the filter type. Like in PIL, the first line is tried without a filter (0) and with
+    # the Sub filter (1), and the other lines use the Up filter (2), which makes them all 0.
+    up = b'\x02' + bytes(len(row))
+    first_lines = (b'\x00' + bytes(row), b'\x01' + bytes(_sub_filter(row)))
+    candidates = [first_line + up * (height - 1) for first_line in first_lines]
+    if compress_level is not None and not optimize:
+        image_data = zlib.compress(candidates[0], compress_level)
+    else:
+        # Neither level 1 nor level 9 is always smaller, so both are tried.
+        results = [zlib.compress(scanlines, level) for scanlines in candidates for level in (1, 9)]
+        if optimize:
+            results += [zlib.compress(scanlines, 0) for scanlines in candidates]
+            results += [_compress(scanlines, 9, strategy) for scanlines in candidates for strategy in _STRATEGIES]
+        image_data = min(results, key=len)
+    return b''.join([
+        _PNG_SIGNATURE,
+        _png_chunk(b'IHDR', header),
+        _png_chunk(b'IDAT', image_data),
+        _png_chunk(b'IEND', b''),
+    ])
+
+
+def bmp(row, width, height=1):
+    """Get a BMP with a bit depth of 1, where every line has the same pixels.
+
+    :param row: The packed pixels of a single line.
+    :param width: Width of the image in pixels.
+    :param height: Height of the image in pixels.
+
+    :rtype: bytes
+    """
+    # Lines are padded to a multiple of 4 bytes.
+    row = bytes(row)
+    line = row + b'\x00' * (-len(row) % 4)
+    pixels = line * height
+
+    offset = 14 + 40 + len(_BMP_PALETTE)
+    # Header size, width, height, planes, bits per pixel, compression, image size, horizontal and vertical resolution
+    # in pixels per meter (96 DPI), number of colors in the palette and the number of important colors.
+    info_header = struct.pack(b'<IiiHHIIiiII', 40, width, height, 1, 1, 0, len(pixels), 3780, 3780, 2, 2)
+    file_header = struct.pack(b'<2sIHHI', b'BM', offset + len(pixels), 0, 0, offset)
+    return b''.join([file_header, info_header, _BMP_PALETTE, pixels])
@@ -0,0 +1,260 @@
+# -*- coding: utf-8 -*-
+"""An HTTP server rendering barcodes, using only the standard library.
+
+Run with ``python -m pubcode.serve``. Barcodes are requested as ``/code128/{data}.{png,bmp,svg}``, where the data is
+percent-encoded, with the optional query parameters charset, height, module_width and quiet_zone (1 or 0).
+
+Every response has an ETag, which is computed from the symbol values of the barcode and the render parameters, so it
+changes only when the image does. A request whose If-None-Match header matches the ETag is answered with 304 Not
+Modified without rendering the image, so browsers and caching proxies only need the image once. The number of requests
+and the render latency are available in the Prometheus text format at ``/metrics``.
+"""
+from __future__ import absolute_import, division, print_function, unicode_literals
+import argparse
+import hashlib
+import re
+import sys
+import threading
+if sys.version_info[0] < 3:
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+    from SocketServer import ThreadingMixIn
+    from urllib import unquote as _unquote_bytes
+    from urlparse import parse_qs, urlsplit
+
+    def unquote(string):
+        """Decode percent-encoded UTF-8, which Python 2 decodes into bytes."""
+        return _unquote_bytes(string.encode('ascii')).decode('utf-8', 'replace')
+
+    from builtins import *  # Use Python3-like builtins for Python2.
+else:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from socketserver import ThreadingMixIn
+    from urllib.parse import parse_qs, unquote, urlsplit
+
+from . import __version__
+from .cache import RenderCache
+from .code128 import Code128
+from .profiling import StageCollector, clock_ns
+
+# Media types by format.
+_content_types = {'png': 'image/png', 'bmp': 'image/bmp', 'svg': 'image/svg+xml'}
+
+_barcode_path = re.compile(r'^/code128/(?P<data>.+)\.(?P<format>png|bmp|svg)$')
+
+# Upper bounds of the render parameters, so that a single request can't take a lot of memory or time.
+MAX_HEIGHT = 1000
+MAX_MODULE_WIDTH = 20
+
+
+class BadRequest(Exception):
+    """An error in a request, which is answered with 400 Bad Request."""
+
+
+def _parse_request(path):
+    """Get the data, format and render parameters of a barcode request.
+
+    :raises: BadRequest if the parameters are invalid.
+    :returns: A tuple of the data, charset, format, height, module width and whether to add the quiet zone, or None if
+              the path isn't a barcode.
+    """
+    url = urlsplit(path)
+    match = _barcode_path.match(url.path)
+    if match is None:
+        return None
+
+    query = parse_qs(url.query)
+
+    def parameter(name, default, minimum, maximum):
+        values = query.get(name)
+        if not values:
+            return default
+        try:
+            value = int(values[-1])
+        except ValueError:
+            raise BadRequest('{0} must be a number.'.format(name))
+        if not minimum <= value <= maximum:
+            raise BadRequest('{0} must be between {1} and {2}.'.format(name, minimum, maximum))
+        return value
+
+    charset = query.get('charset', [None])[-1] or None
+    height = parameter('height', 50 if match.group('format') == 'svg' else 1, 1, MAX_HEIGHT)
+    module_width = parameter('module_width', 1, 1, MAX_MODULE_WIDTH)
+    add_quiet_zone = bool(parameter('quiet_zone', 1, 0, 1))
+    return unquote(match.group('data')), charset, match.group('format'), height, module_width, add_quiet_zone
+
+
+def etag(barcode, image_format, height, module_width, add_quiet_zone):
+    """Get the ETag of a rendered barcode.
+
+    The tag depends on the version of pubcode, as well as the barcode and the parameters, because a new version may
+    render the same barcode differently.
+
+    :rtype: str
+    """
+    digest = hashlib.sha1()
+    digest.update('{0}:{1}:{2}:{3}:{4}:{5}:'.format(
+        __version__, type(barcode).__name__, image_format, height, module_width, int(add_quiet_zone)
+    ).encode('ascii'))
+    digest.update(barcode.symbol_values)
+    return '"{0}"'.format(digest.hexdigest())
+
+
+def _etag_matches(if_none_match, tag):
+    """Check if the value of an If-None-Match header matches an ETag, using the weak comparison."""
+    if if_none_match.strip() == '*':
+        return True
+    for candidate in if_none_match.split(','):
+        candidate = candidate.strip()
+        if candidate.startswith('W/'):
+            candidate = candidate[2:]
+        if candidate == tag:
+            return True
+    return False
+
+
+class BarcodeRequestHandler(BaseHTTPRequestHandler):
+    """Answer requests for barcodes and metrics."""
+
+    server_version = 'pubcode/' + __version__
+
+    def do_GET(self):
+        self._handle(send_body=True)
+
+    def do_HEAD(self):
+        self._handle(send_body=False)
+
+    def _handle(self, send_body):
+        if urlsplit(self.path).path == '/metrics':
+            self._respond(200, 'text/plain; version=0.0.4', self.server.metrics_text().encode('utf-8'), send_body)
+            return
+
+        try:
+            request = _parse_request(self.path)
+            if request is None:
+                self._respond(404, 'text/plain', b'Not found.\n', send_body)
+                return
+            data, charset, image_format, height, module_width, add_quiet_zone = request
+            barcode = Code128(data, charset)
+        except (BadRequest, Code128.Error) as error:
+            message = str(error) or type(error).__name__
+            self._respond(400, 'text/plain', (message + '\n').encode('utf-8'), send_body)
+            return
+
+        tag = etag(barcode, image_format, height, module_width, add_quiet_zone)
+        headers = {'ETag': tag, 'Cache-Control': 'public, max-age={0}'.format(self.server.max_age)}
+        if _etag_matches(self.headers.get('If-None-Match', ''), tag):
+            self._respond(304, None, b'', send_body, headers)
+            return
+
+        start = clock_ns()
+        if image_format == 'svg':
+            body = barcode.svg(module_width, height, add_quiet_zone).encode('utf-8')
+        else:
+            body = barcode.image_data(image_format, height, module_width, add_quiet_zone)
+        self.server.renders(image_format, clock_ns() - start, len(body))
+
+        self._respond(200, _content_types[image_format], body, send_body, headers)
+
+    def _respond(self, status, content_type, body, send_body, headers=None):
+        self.server.count_response(status)
+        self.send_response(status)
+        if content_type is not None:
+            self.send_header('Content-Type', content_type)
+        if status != 304:
+            self.send_header('Content-Length', str(len(body)))
+        for name, value in sorted((headers or {}).items()):
+            self.send_header(name, value)
+        self.end_headers()
+        if send_body and status != 304:
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if self.server.log_requests:
+            BaseHTTPRequestHandler.log_message(self, format, *args)
+
+
+class BarcodeServer(ThreadingMixIn, HTTPServer):
+    """A server handling each request in its own thread."""
+
+    daemon_threads = True
+
+    def __init__(self, address, max_age=86400, log_requests=True):
+        """Start listening on an address.
+
+        :param address: Tuple of the host and port.
+        :param max_age: Time in seconds for which clients may cache the images, as given in the Cache-Control header.
+        :param log_requests: Whether to log every request on standard error.
+        """
+        HTTPServer.__init__(self, address, BarcodeRequestHandler)
+        self.max_age = max_age
+        self.log_requests = log_requests
+        self.renders = StageCollector()
+
+        self._lock = threading.Lock()
+        self._responses = {}
+
+    def count_response(self, status):
+        with self._lock:
+            self._responses[status] = self._responses.get(status, 0) + 1
+
+    def metrics_text(self):
+        """Get the metrics in the Prometheus text format."""
+        with self._lock:
+            responses = sorted(self._responses.items())
+
+        lines = [
+            '# HELP pubcode_responses_total Responses by HTTP status.',
+            '# TYPE pubcode_responses_total counter',
+        ]
+        lines += ['pubcode_responses_total{{status="{0}"}} {1}'.format(status, count) for status, count in responses]
+
+        lines += [
+            '# HELP pubcode_render_seconds Time spent rendering images, by format.',
+            '# TYPE pubcode_render_seconds histogram',
+        ]
+        bytes_lines = [
+            '# HELP pubcode_render_bytes_total Size of the rendered images, by format.',
+            '# TYPE pubcode_render_bytes_total counter',
+        ]
+        for image_format, stats in sorted(self.renders.stats().items()):
+            cumulative = 0
+            for bound, count in stats['buckets']:
+                cumulative += count
+                lines.append('pubcode_render_seconds_bucket{{format="{0}",le="{1}"}} {2}'.format(
+                    image_format, '+Inf' if bound is None else repr(bound / 1e9), cumulative
+                ))
+            lines.append('pubcode_render_seconds_sum{{format="{0}"}} {1!r}'.format(
+                image_format, stats['total_ns'] / 1e9
+            ))
+            lines.append('pubcode_render_seconds_count{{format="{0}"}} {1}'.format(image_format, stats['count']))
+            bytes_lines.append('pubcode_render_bytes_total{{format="{0}"}} {1}'.format(image_format, stats['size']))
+
+        return '\n'.join(lines + bytes_lines) + '\n'
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m pubcode.serve', description=__doc__.split('\n\n')[0])
+    parser.add_argument('--host', default='127.0.0.1', help='Address to listen on.')
+    parser.add_argument('--port', type=int, default=8000, help='Port to listen on.')
+    parser.add_argument('--max-age', type=int, default=86400,
+                        help='Time in seconds for which clients may cache the images.')
+    parser.add_argument('--cache-entries', type=int, default=10000,
+                        help='Number of encoded barcodes and images kept in memory. 0 to disable the cache.')
+    parser.add_argument('--quiet', action='store_true', help="Don't log every request.")
+    args = parser.parse_args(argv)
+
+    if args.cache_entries:
+        Code128.cache = RenderCache(max_entries=args.cache_entries)
+
+    server = BarcodeServer((args.host, args.port), args.max_age, not args.quiet)
+    print('Serving barcodes on http://{0}:{1}/code128/'.format(*server.server_address[:2]))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""Rendering many barcodes into a single NumPy array, such as a sheet of labels.
+
+NumPy is optional and only needed when render_sheet is called.
+"""
+from __future__ import absolute_import, division, print_function, unicode_literals
+import sys
+if sys.version_info[0] < 3:
+    from builtins import *  # Use Python3-like builtins for Python2.
+
+from .code128 import Code128
+from .symbology import Symbology
+
+# NumPy arrays of the modules of each symbol value and of the stop symbol, created on first use.
+_tables = {}
+
+
+def _import_numpy():
+    try:
+        import numpy
+    except ImportError:
+        raise Code128.MissingDependencyError('NumPy is required to use render_sheet.')
+    return numpy
+
+
+def _module_tables(numpy):
+    """Get the modules of the symbols as a (106, 11) array and the modules of the stop symbol as a (13,) array."""
+    if not _tables:
+        symbols = [[int(bit) for bit in '{0:011b}'.format(bits)] for bits in Code128._val2bits[:106]]
+        stop = [int(bit) for bit in '{0:013b}'.format(Code128._val2bits[106])]
+        _tables['symbols'] = numpy.array(symbols, dtype=numpy.bool_)
+        _tables['stop'] = numpy.array(stop, dtype=numpy.bool_)
+    return _tables['symbols'], _tables['stop']
+
+
+def render_sheet(barcodes, offsets, shape=None, height=1, module_width=1, add_quiet_zone=True, dtype='uint8',
+                 out=None):
+    """Render barcodes into a two dimensional NumPy array.
+
+    The modules of each Code128 barcode are looked up from a table of symbol patterns, repeated for the module width
+    and broadcast to the height of the barcode, without creating an image for each barcode. The modules of other
+    symbologies are unpacked from Symbology.packed_modules.
+
+    >>> sheet = render_sheet([Code128('Hello!'), Code128('1234')], [(0, 0), (0, 10)], (20, 130), height=10)
+    >>> sheet.shape, sheet.dtype.name
+    ((20, 130), 'uint8')
+
+    :param barcodes: Iterable of barcodes or sequences of the symbol values of Code128 barcodes.
+    :param offsets: Iterable of (x, y) positions of the top left corner of each barcode, including the quiet zone.
+    :param shape: The (height, width) of the created array. Not used if out is given.
+    :param height: Height of each barcode in pixels.
+    :param module_width: Width of a module in pixels.
+    :param add_quiet_zone: Whether to add the quiet zone to each side of each barcode.
+    :param dtype: Data type of the created array. For bool arrays, bars are False and spaces are True. For other types,
+                  bars are 0 and spaces are 255. Not used if out is given.
+    :param out: An existing array to render the barcodes into, instead of creating a new white array.
+
+    :raises: Code128.MissingDependencyError
+
+    :rtype: numpy.ndarray
+    """
+    numpy = _import_numpy()
+    symbol_table, stop_modules = _module_tables(numpy)
+
+    if out is None:
+        dtype = numpy.dtype(dtype)
+        out = numpy.full(shape, True if dtype == numpy.bool_ else 255, dtype=dtype)
+    space = True if out.dtype == numpy.bool_ else 255
+
+    # Arrays of the quiet zones by their width, as barcodes of a subclass may have a different quiet zone.
+    quiet_zones = {}
+
+    for barcode, (x, y) in zip(barcodes, offsets):
+        if isinstance(barcode, Symbology) and not isinstance(barcode, Code128):
+            packed = numpy.frombuffer(barcode.packed_modules(add_quiet_zone), dtype=numpy.uint8)
+            modules = numpy.unpackbits(packed)[:barcode.width(add_quiet_zone)].astype(numpy.bool_)
+        else:
+            symbol_values = getattr(barcode, 'symbol_values', barcode)
+            # Sequences of symbol values have the quiet zone of Code128.
+            quiet_zone_width = getattr(barcode, 'quiet_zone', Code128.quiet_zone) if add_quiet_zone else 0
+            quiet_zone = quiet_zones.get(quiet_zone_width)
+            if quiet_zone is None:
+                quiet_zone = quiet_zones[quiet_zone_width] = numpy.ones(quiet_zone_width, dtype=numpy.bool_)
+            values = numpy.frombuffer(bytearray(symbol_values), dtype=numpy.uint8)
+            # The last symbol is the stop symbol, which is wider than the others.
+            modules = numpy.concatenate((quiet_zone, symbol_table[values[:-1]].ravel(), stop_modules, quiet_zone))
+        if module_width != 1:
+            modules = numpy.repeat(modules, module_width)
+
+        out[y:y + height, x:x + len(modules)] = modules * space
+
+    return out
@@ -0,0 +1,745 @@
+# -*- coding: utf-8 -*-
+"""The base class of the barcode symbologies.
+
+A symbology declares a table with the bar and space weights of each symbol value and how data is encoded into symbol
+values, including its check characters. Everything that only depends on the symbol values, such as the modules, images,
+data URLs and printer commands, is implemented once in Symbology and shared by all symbologies.
+"""
+from __future__ import absolute_import, division, print_function, unicode_literals
+import binascii
+import functools
+import operator
+import sys
+if sys.version_info[0] < 3:
+    from builtins import *  # Use Python3-like builtins for Python2.
+
+from . import printer
+from . import raster
+from .profiling import clock_ns as _clock_ns
+
+# Modules that are only needed for rendering, such as PIL, are imported when they are first used, so that importing
+# pubcode stays fast.
+
+
+def _import_image():
+    """Import PIL.Image, which is needed only for creating images of the barcode."""
+    try:
+        from PIL import Image
+    except ImportError:
+        raise Symbology.MissingDependencyError("PIL module is required to use image method.")
+    return Image
+
+
+def _bars_to_bits(bars):
+    """Convert a string of bar and space weights into an integer with a bit for each module.
+
+    The first module is the most significant bit. Bars are 0 bits and spaces are 1 bits, like in Symbology.modules.
+    """
+    bits = 0
+    is_bar = True
+    for weight in map(int, bars):
+        bits <<= weight
+        if not is_bar:
+            bits |= (1 << weight) - 1
+        is_bar = not is_bar
+    return bits
+
+
+def _bars_to_width(bars):
+    """Get the number of modules in a string of bar and space weights."""
+    return sum(map(int, bars))
+
+
+if sys.version_info[0] < 3:
+    def _int_to_bytes(number, length):
+        """Convert a non-negative integer into length bytes, with the most significant byte first.
+
+        Python 2 has no int.to_bytes, so the integer is converted through its hexadecimal digits.
+        """
+        return binascii.unhexlify('{0:0{1}x}'.format(number, length * 2))
+else:
+    def _int_to_bytes(number, length):
+        """Convert a non-negative integer into length bytes, with the most significant byte first."""
+        return number.to_bytes(length, 'big')
+
+
+def _nested_error(owner, name, args):
+    """Create an instance of the error class nested in owner. This is used for unpickling errors in Python2."""
+    return getattr(owner, name)(*args)
+
+
+def _modules_to_bars(modules):
+    """Convert a string of modules, with 1 for a bar and 0 for a space, into a string of bar and space weights.
+
+    >>> _modules_to_bars('0001101')
+    '3211'
+    """
+    weights = []
+    weight = 1
+    for previous, module in zip(modules, modules[1:]):
+        if module == previous:
+            weight += 1
+        else:
+            weights.append(weight)
+            weight = 1
+    weights.append(weight)
+    return ''.join(map(str, weights))
+
+
+class Symbology(object):
+    """The base class of barcodes, which are encoded as a sequence of symbol values.
+
+    Subclasses set Symbology._val2bars, Symbology._val2bits and Symbology._val2width, and implement
+    Symbology._encode_values. Barcodes are immutable, so they can be hashed, compared and shared between threads.
+    Representations derived from the symbol values, such as bars and modules, are computed when they are first needed
+    and then kept.
+    """
+    # The symbol values are stored as bytes and the rest of the slots hold the derived representations.
+    __slots__ = ('_data', '_symbol_values', '_bars', '_bits')
+
+    class Error(Exception):
+        if sys.version_info[0] < 3:
+            def __reduce__(self):
+                """Pickle the error by the class it's nested in, since Python2 can only pickle top level classes.
+
+                This lets the errors of Code128.encode_many be returned from a process pool.
+                """
+                error_class = type(self)
+                module = sys.modules[error_class.__module__]
+                for owner in vars(module).values():
+                    if isinstance(owner, type) and vars(owner).get(error_class.__name__) is error_class:
+                        return _nested_error, (owner, error_class.__name__, self.args)
+                return Exception.__reduce__(self)
+
+    class InvalidDataError(Error):
+        pass
+
+    class MissingDependencyError(Error):
+        pass
+
+    class UnknownFormatError(Error):
+        pass
+
+    # List of bar and space weights, indexed by symbol values. The weights of the whole barcode start with a bar and
+    # alternate, so a symbol starts with a space if the previous symbol ends with a bar.
+    _val2bars = []
+    # The modules of each symbol as bits and the number of modules in each symbol, indexed like Symbology._val2bars.
+    _val2bits = []
+    _val2width = []
+
+    # How large the quiet zone is on either side of the barcode, when quiet zone is used.
+    quiet_zone = 10
+
+    # A pubcode.cache.RenderCache for symbol values, images and data URLs, or None if they shouldn't be cached. Setting
+    # it on Symbology applies to every symbology that doesn't have its own.
+    cache = None
+
+    # A callable that is given the name, duration in nanoseconds and result size of each stage of encoding and
+    # rendering, such as a pubcode.profiling.StageCollector, or None if the stages shouldn't be timed. It is always
+    # looked up with Symbology._get_profiler, so that a plain function isn't turned into a method.
+    profiler = None
+
+    def __init__(self, data):
+        """Initialize a barcode with data.
+
+        :param data: The data to be encoded.
+        :raises: Symbology.InvalidDataError if the data can't be encoded.
+        """
+        self._initialize(data, self._cached(('symbol_values', data), self._encode_data, data))
+
+    @staticmethod
+    def _pattern_tables(val2modules):
+        """Get Symbology._val2bars, Symbology._val2bits and Symbology._val2width from the modules of each symbol.
+
+        :param val2modules: List of strings of the modules of each symbol value, with 1 for a bar and 0 for a space.
+        :rtype: tuple
+        """
+        val2bars = [_modules_to_bars(modules) for modules in val2modules]
+        # The modules are written with 1 for a bar, but bars are 0 bits.
+        val2bits = [int(modules, 2) ^ ((1 << len(modules)) - 1) for modules in val2modules]
+        val2width = [len(modules) for modules in val2modules]
+        return val2bars, val2bits, val2width
+
+    @classmethod
+    def _encode_values(cls, data):
+        """Encode data into symbol values, including the check and guard symbols.
+
+        :raises: Symbology.InvalidDataError
+        :rtype: list[int]
+        """
+        raise NotImplementedError
+
+    @classmethod
+    def _get_profiler(cls):
+        """Get the profiler of the class without binding it, since Python2 turns a function into an unbound method."""
+        for klass in cls.__mro__:
+            if 'profiler' in vars(klass):
+                return vars(klass)['profiler']
+
+    @classmethod
+    def _encode_data(cls, data, *args):
+        """Encode data with Symbology._encode_values, timing it with the profiler.
+
+        :rtype: bytes
+        """
+        profiler = cls._get_profiler()
+        if profiler is None:
+            return bytes(cls._encode_values(data, *args))
+
+        start = _clock_ns()
+        symbol_values = bytes(cls._encode_values(data, *args))
+        profiler('encode', _clock_ns() - start, len(symbol_values))
+        return symbol_values
+
+    def _cached(self, key, function, *args):
+        """Get the result of a function from the cache of the class, calling the function if it isn't cached.
+
+        :param key: Tuple identifying the result, which is prefixed with the class in the cache.
+        """
+        cache = self.cache
+        if cache is None:
+            return function(*args)
+
+        key = (type(self),) + key
+        result = cache.get(key)
+        if result is None:
+            result = function(*args)
+            cache.set(key, result)
+        return result
+
+    def _initialize(self, data, symbol_values):
+        """Set the data and symbol values of a new barcode."""
+        self._data = data
+        self._symbol_values = symbol_values
+        self._bars = None
+        self._bits = None
+
+    @classmethod
+    def _from_symbol_values(cls, data, symbol_values):
+        """Create a barcode from symbol values that are known to be valid, without encoding the data again."""
+        barcode = cls.__new__(cls)
+        barcode._initialize(data, bytes(symbol_values))
+        return barcode
+
+    def __reduce__(self):
+        # Only the data and symbol values are pickled and the barcode isn't encoded again when it is unpickled. The
+        # symbol values are pickled as a bytearray, as the bytes of the future package can't be pickled on Python 2.
+        return _restore, (type(self), self._data, bytearray(self._symbol_values))
+
+    def _is_comparable(self, other):
+        # Barcodes of different symbologies aren't equal, even if they have the same data and symbol values.
+        return isinstance(other, Symbology) and (isinstance(other, type(self)) or isinstance(self, type(other)))
+
+    def _compare(self, other, compare):
+        """Compare the data and symbol values of two barcodes of the same symbology.
+
+        :raises: TypeError if the barcodes are ordered, but they can't be compared.
+        """
+        if self._is_comparable(other):
+            return compare((self._data, self._symbol_values), (other._data, other._symbol_values))
+        if compare in (operator.eq, operator.ne):
+            return NotImplemented
+        # Python 2 would fall back to an arbitrary order, instead of raising TypeError like Python 3.
+        raise TypeError('Barcodes of different symbologies can not be ordered.')
+
+    # Every comparison is defined, as Python 2 doesn't derive __ne__ from __eq__, and functools.total_ordering recurses
+    # endlessly there when a comparison returns NotImplemented.
+    def __eq__(self, other):
+        return self._compare(other, operator.eq)
+
+    def __ne__(self, other):
+        return self._compare(other, operator.ne)
+
+    def __lt__(self, other):
+        return self._compare(other, operator.lt)
+
+    def __le__(self, other):
+        return self._compare(other, operator.le)
+
+    def __gt__(self, other):
+        return self._compare(other, operator.gt)
+
+    def __ge__(self, other):
+        return self._compare(other, operator.ge)
+
+    def __hash__(self):
+        return hash((self._data, self._symbol_values))
+
+    @property
+    def data(self):
+        """The encoded data."""
+        return self._data
+
+    @property
+    def symbol_values(self):
+        """The symbol values of the barcode, including the check and guard symbols.
+
+        :rtype: bytes
+        """
+        return self._symbol_values
+
+    def width(self, add_quiet_zone=False):
+        """Return the barcodes width in modules.
+
+        :param add_quiet_zone: Whether quiet zone should be included in the width.
+
+        :return: Width of barcode in modules, which for images translates to pixels.
+        """
+        val2width = self._val2width
+        width = sum([val2width[value] for value in self._symbol_values])
+        return width + 2 * self.quiet_zone if add_quiet_zone else width
+
+    @property
+    def bars(self):
+        """A string of the bar and space weights of the barcode. Starting with a bar and alternating.
+
+        >>> from pubcode import Code128
+        >>> barcode = Code128("Hello!", charset='B')
+        >>> barcode.bars
+        '2112142311131122142211142211141341112221221212412331112'
+
+        :rtype: string
+        """
+        if self._bars is None:
+            val2bars = self._val2bars
+            self._bars = ''.join([val2bars[value] for value in self._symbol_values])
+        return self._bars
+
+    def _iter_bars(self, add_quiet_zone):
+        """Iterate over the bars, as tuples of the position of the bar and its width in modules."""
+        position = self.quiet_zone if add_quiet_zone else 0
+        is_bar = True
+        for weight in map(int, self.bars):
+            if is_bar:
+                yield position, weight
+            position += weight
+            is_bar = not is_bar
+
+    @property
+    def modules(self):
+        """A list of the modules, with 0 representing a bar and 1 representing a space.
+
+        >>> from pubcode import Code128
+        >>> barcode = Code128("Hello!", charset='B')
+        >>> barcode.modules  # doctest: +ELLIPSIS
+        [0, 0, 1, 0, 1, 1, 0, 1, ..., 0, 0, 0, 1, 0, 1, 0, 0]
+
+        :rtype: list[int]
+        """
+        bits, width = self._module_bits()
+        return list(map(int, '{0:0{1}b}'.format(bits, width)))
+
+    def _module_bits(self, add_quiet_zone=False, module_width=1):
+        """Get the modules as an integer with a bit for each module, like in Symbology.modules.
+
+        :param add_quiet_zone: Whether to add quiet zone modules to each side of the barcode.
+        :param module_width: Number of bits for each module.
+
+        :return: Tuple of the bits and the number of modules, with the first module as the most significant bit.
+        """
+        if self._bits is None:
+            val2bits = self._val2bits
+            val2width = self._val2width
+
+            bits = 0
+            for value in self._symbol_values:
+                bits = (bits << val2width[value]) | val2bits[value]
+            self._bits = bits
+
+        bits = self._bits
+        width = self.width()
+
+        if add_quiet_zone:
+            quiet_zone = self.quiet_zone
+            quiet_bits = (1 << quiet_zone) - 1
+            bits = (((quiet_bits << width) | bits) << quiet_zone) | quiet_bits
+            width += 2 * quiet_zone
+
+        if module_width != 1:
+            bits = int(''.join(bit * module_width for bit in '{0:0{1}b}'.format(bits, width)), 2)
+            width *= module_width
+
+        return bits, width
+
+    def packed_modules(self, add_quiet_zone=False, module_width=1):
+        """The modules packed into bytes, with 8 modules per byte and the first module in the most significant bit.
+
+        Bars are 0 bits and spaces are 1 bits, like in Symbology.modules, so the result can be used directly as the data
+        of a one pixel high PIL.Image with mode '1'. The last byte is padded with space bits.
+
+        >>> from pubcode import Code128
+        >>> barcode = Code128("Hello!", charset='B')
+        >>> barcode.packed_modules()[:4]
+        b'-\\xe7]7'
+
+        :param add_quiet_zone: Whether to add quiet zone modules to each side of the barcode.
+        :param module_width: Number of bits for each module.
+
+        :rtype: bytes
+        """
+        profiler = self._get_profiler()
+        if profiler is not None:
+            start = _clock_ns()
+
+        bits, width = self._module_bits(add_quiet_zone, module_width)
+        padding = -width % 8
+        bits = (bits << padding) | ((1 << padding) - 1)
+        packed = _int_to_bytes(bits, (width + padding) // 8)
+
+        if profiler is not None:
+            profiler('packed_modules', _clock_ns() - start, width)
+        return packed
+
+    def image(self, height=1, module_width=1, add_quiet_zone=True):
+        """Get the barcode as PIL.Image.
+
+        By default the image is one pixel high and the number of modules pixels wide, with the quiet zone added to each
+        side. The size can be modified by setting height and module_width, but if used in a web page it might be a good
+        idea to do the scaling on client side.
+
+        :param height: Height of the image in number of pixels.
+        :param module_width: A multiplier for the width.
+        :param add_quiet_zone: Whether to add the quiet zone to each side of the barcode.
+
+        :rtype: PIL.Image
+        :return: A monochromatic image containing the barcode as black bars on white background.
+        """
+        Image = _import_image()
+
+        width = self.width(add_quiet_zone)
+        data = self.packed_modules(add_quiet_zone)
+
+        profiler = self._get_profiler()
+        if profiler is not None:
+            start = _clock_ns()
+
+        img = Image.frombytes(mode='1', size=(width, 1), data=data)
+        if height != 1 or module_width != 1:
+            img = img.resize((width * module_width, height), resample=Image.NEAREST)
+
+        if profiler is not None:
+            profiler('image', _clock_ns() - start, width * module_width * height)
+        return img
+
+    def render_into(self, target, x=0, y=0, height=1, module_width=1, add_quiet_zone=True, stride=None):
+        """Render the barcode into an existing image or buffer, such as a label, without creating other images.
+
+        >>> from pubcode import Code128
+        >>> canvas = bytearray(b'\\x80' * 300)
+        >>> Code128('Hello!', charset='B').render_into(canvas, x=1, y=1, height=1, add_quiet_zone=False, stride=150)
+        >>> canvas[150:158]
+        bytearray(b'\\x80\\x00\\x00\\xff\\x00\\xff\\xff\\x00')
+
+        :param target: One of these:
+                       - A PIL.Image, where the bars are pasted in black and the spaces in white.
+                       - A two dimensional NumPy array, which is rendered into as by pubcode.sheet.render_sheet.
+                       - A writable buffer, such as a bytearray or a memoryview, with a byte for each pixel and stride
+                         bytes for each line. Bars are written as 0 and spaces as 255.
+        :param x: Horizontal position of the left side of the barcode, including the quiet zone.
+        :param y: Vertical position of the top of the barcode.
+        :param height: Height of the barcode in pixels.
+        :param module_width: Width of a module in pixels.
+        :param add_quiet_zone: Whether to add the quiet zone to each side of the barcode.
+        :param stride: Number of bytes for each line of a buffer.
+
+        :raises: ValueError if the target is a buffer and stride isn't given, or the barcode doesn't fit in the buffer.
+        """
+        quiet_zone = self.quiet_zone * module_width if add_quiet_zone else 0
+        width = self.width(add_quiet_zone) * module_width
+
+        if hasattr(target, 'paste') and hasattr(target, 'mode'):
+            from PIL import ImageColor
+
+            black = ImageColor.getcolor('black', target.mode)
+            target.paste(ImageColor.getcolor('white', target.mode), (x, y, x + width, y + height))
+            for position, weight in self._iter_bars(add_quiet_zone):
+                left = x + position * module_width
+                target.paste(black, (left, y, left + weight * module_width, y + height))
+
+        elif hasattr(target, '__array_interface__'):
+            from .sheet import render_sheet
+
+            render_sheet([self], [(x, y)], height=height, module_width=module_width, add_quiet_zone=add_quiet_zone,
+                         out=target)
+
+        else:
+            if stride is None:
+                raise ValueError('The stride of the buffer is required.')
+            # The barcode must fit within each line, or it would wrap around into the next line.
+            if x < 0 or y < 0 or x + width > stride or (y + height - 1) * stride + x + width > len(target):
+                raise ValueError('The barcode does not fit in the buffer.')
+
+            # Create a single line of the barcode and copy it to each line of the buffer.
+            line = bytearray(b'\xff' * quiet_zone)
+            is_bar = True
+            for weight in map(int, self.bars):
+                line += (b'\x00' if is_bar else b'\xff') * (weight * module_width)
+                is_bar = not is_bar
+            line += b'\xff' * quiet_zone
+
+            for offset in range(y * stride + x, (y + height) * stride + x, stride):
+                target[offset:offset + width] = line
+
+    def image_data(self, image_format='png', height=1, module_width=1, add_quiet_zone=True, optimize=False):
+        """Get the barcode as the contents of an image file.
+
+        The image is written directly from the modules, so PIL isn't needed. An SVG image is a single path with a
+        viewBox one module high, which is stretched to the size of the image like the other formats.
+
+        :param image_format: Either 'png', 'bmp' or 'svg'.
+        :param height: Height of the image in number of pixels.
+        :param module_width: A multiplier for the width.
+        :param add_quiet_zone: Whether to add the quiet zone to each side of the barcode.
+        :param optimize: Whether to try several ways to compress a PNG and use the smallest, which is slower.
+
+        :raises: Symbology.UnknownFormatError
+
+        :rtype: bytes
+        :return: A monochromatic image containing the barcode as black bars on white background.
+        """
+        key = ('image_data', self._symbol_values, image_format, height, module_width, add_quiet_zone, optimize)
+        return self._cached(key, self._write_image_data, image_format, height, module_width, add_quiet_zone, optimize)
+
+    def _write_image_data(self, image_format, height, module_width, add_quiet_zone, optimize):
+        """Write the image for Symbology.image_data."""
+        # GIFs result in data URLs 10 times bigger than PNG or BMP, so they aren't supported.
+        if image_format == 'png':
+            writer = functools.partial(raster.png, self.packed_modules(add_quiet_zone, module_width), optimize=optimize)
+        elif image_format == 'bmp':
+            writer = functools.partial(raster.bmp, self.packed_modules(add_quiet_zone, module_width))
+        elif image_format == 'svg':
+            writer = functools.partial(self._write_svg_data, add_quiet_zone)
+        else:
+            raise Symbology.UnknownFormatError('Only png, bmp and svg are supported.')
+
+        profiler = self._get_profiler()
+        if profiler is None:
+            return writer(self.width(add_quiet_zone) * module_width, height)
+
+        start = _clock_ns()
+        image_data = writer(self.width(add_quiet_zone) * module_width, height)
+        profiler(image_format, _clock_ns() - start, len(image_data))
+        return image_data
+
+    def _write_svg_data(self, add_quiet_zone, width, height):
+        """Write the SVG image for Symbology.image_data."""
+        path = ['M{0} 0h{1}v1h-{1}z'.format(position, weight) for position, weight in self._iter_bars(add_quiet_zone)]
+        return (
+            '<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" viewBox="0 0 {modules} 1" '
+            'preserveAspectRatio="none" shape-rendering="crispEdges"><rect width="{modules}" height="1" fill="#fff"/>'
+            '<path d="{path}"/></svg>'.format(width=width, height=height, modules=self.width(add_quiet_zone),
+                                              path=''.join(path))
+        ).encode('utf-8')
+
+    def smallest_image_data(self, height=1, module_width=1, add_quiet_zone=True, optimize=True):
+        """Get the barcode as either a PNG or a BMP image, whichever is smaller.
+
+        A single line of a barcode is usually smaller as a BMP, because the modules can't be compressed much and a BMP
+        has fewer headers. Taller images compress well, so they are usually smaller as a PNG.
+
+        >>> from pubcode import Code128
+        >>> Code128('Hello!', charset='B').smallest_image_data()[0]
+        'bmp'
+        >>> Code128('Hello!', charset='B').smallest_image_data(height=50)[0]
+        'png'
+
+        See Symbology.image_data for the parameters.
+
+        :rtype: tuple
+        :return: The chosen format, either 'png' or 'bmp', and the image data.
+        """
+        candidates = [
+            (image_format, self.image_data(image_format, height, module_width, add_quiet_zone, optimize))
+            for image_format in ('png', 'bmp')
+        ]
+        # PNG is more widely supported, so it is chosen when the sizes are equal.
+        return min(candidates, key=lambda candidate: len(candidate[1]))
+
+    def data_url(self, image_format='png', add_quiet_zone=True, optimize=False):
+        """Get a data URL representing the barcode.
+
+        >>> from pubcode import Code128
+        >>> barcode = Code128('Hello!', charset='B')
+        >>> barcode.data_url()  # doctest: +ELLIPSIS
+        'data:image/png;base64,...'
+        >>> barcode.data_url('auto', optimize=True)  # doctest: +ELLIPSIS
+        'data:image/bmp;base64,...'
+
+        :param image_format: Either 'png', 'bmp', 'svg' or 'auto'. With 'auto', the smaller one of PNG and BMP is used,
+                             as in Symbology.smallest_image_data, and the chosen format is given by the media type of
+                             the data URL.
+        :param add_quiet_zone: Whether to add the quiet zone to each side of the barcode.
+        :param optimize: Whether to try several ways to compress a PNG and use the smallest, which is slower.
+
+        :raises: Symbology.UnknownFormatError
+
+        :rtype: str
+        :returns: A data URL with the barcode as an image.
+        """
+        key = ('data_url', self._symbol_values, image_format, add_quiet_zone, optimize)
+        return self._cached(key, self._write_data_url, image_format, add_quiet_zone, optimize)
+
+    def _write_data_url(self, image_format, add_quiet_zone, optimize):
+        """Write the data URL for Symbology.data_url."""
+        if image_format == 'auto':
+            image_format, image_data = self.smallest_image_data(add_quiet_zone=add_quiet_zone, optimize=optimize)
+        else:
+            image_data = self.image_data(image_format, add_quiet_zone=add_quiet_zone, optimize=optimize)
+
+        import base64
+
+        profiler = self._get_profiler()
+        if profiler is not None:
+            start = _clock_ns()
+
+        # Encode the image data and convert the result into unicode.
+        base64_image = base64.b64encode(image_data).decode('ascii')
+
+        if profiler is not None:
+            profiler('base64', _clock_ns() - start, len(base64_image))
+
+        data_url = 'data:image/{format};base64,{base64_data}'.format(
+            format='svg+xml' if image_format == 'svg' else image_format,
+            base64_data=base64_image
+        )
+
+        return data_url
+
+    def zpl_graphic(self, x=0, y=0, height=50, module_width=2, add_quiet_zone=True, compress=True, label=True):
+        """Get a ZPL command printing the barcode as an image, for printers that don't support the symbology.
+
+        >>> from pubcode import Code128
+        >>> Code128('Hello!').zpl_graphic(height=10, add_quiet_zone=False)
+        '^XA^FO0,0^GFA,260,260,26,F30C03C0HC0CF0C03CH3H0F0HC0303FHCF0F3C30C3FCF03FH3C,:::::::::^FS^XZ'
+
+        :param x: Horizontal position of the barcode on the label in dots.
+        :param y: Vertical position of the barcode on the label in dots.
+        :param height: Height of the bars in dots.
+        :param module_width: Width of a module in dots.
+        :param add_quiet_zone: Whether to add the quiet zone to each side of the barcode.
+        :param compress: Whether to use the ZPL compression scheme for the image.
+        :param label: Whether to wrap the command in ^XA and ^XZ, so that it prints a label by itself.
+
+        :rtype: str
+        """
+        row = self.packed_modules(add_quiet_zone, module_width)
+        command = '^FO{0},{1}{2}^FS'.format(x, y, printer.zpl_graphic_field(row, height, compress))
+        return '^XA' + command + '^XZ' if label else command
+
+    def escpos(self, height=50, module_width=2, add_quiet_zone=True):
+        """Get an ESC/POS command printing the barcode as a raster image.
+
+        :param height: Height of the bars in dots.
+        :param module_width: Width of a module in dots.
+        :param add_quiet_zone: Whether to add the quiet zone to each side of the barcode.
+
+        :rtype: bytes
+        """
+        return printer.escpos_raster_image(self.packed_modules(add_quiet_zone, module_width), height)
+
+    def svg(self, module_width=1, height=50, add_quiet_zone=True, text=False, font_size=10):
+        """Get the barcode as an SVG image.
+
+        >>> from pubcode import Code128
+        >>> barcode = Code128('Hello!', charset='B')
+        >>> print(barcode.svg(height=10, add_quiet_zone=False))  # doctest: +ELLIPSIS
+        <svg xmlns="http://www.w3.org/2000/svg" width="101" height="10" viewBox="0 0 101 10" ...>
+        <rect width="101" height="10" fill="#fff"/>
+        <rect x="0" width="2" height="10"/>
+        <rect x="3" width="1" height="10"/>
+        ...
+        </svg>
+        <BLANKLINE>
+
+        See Symbology.write_svg for the parameters.
+
+        :rtype: str
+        """
+        import io
+
+        svg_file = io.StringIO()
+        self.write_svg(svg_file, module_width, height, add_quiet_zone, text, font_size)
+        return svg_file.getvalue()
+
+    def write_svg(self, svg_file, module_width=1, height=50, add_quiet_zone=True, text=False, font_size=10):
+        """Write the barcode as an SVG image into a file.
+
+        The image has a rectangle for each bar, so the size of the image doesn't depend on the module width or height.
+        The image is written one element at a time, without building the whole image in memory.
+
+        :param svg_file: A file object opened in text mode.
+        :param module_width: Width of a module in SVG user units, which are pixels by default.
+        :param height: Height of the bars.
+        :param add_quiet_zone: Whether to add the quiet zone to each side of the barcode.
+        :param text: Whether to add the data as text under the bars. Characters that can't be printed are left out.
+        :param font_size: Font size of the text.
+        """
+        width = _format_number(self.width(add_quiet_zone) * module_width)
+        total_height = _format_number(height + font_size * 1.5 if text else height)
+
+        svg_file.write(
+            '<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+            'viewBox="0 0 {width} {height}" shape-rendering="crispEdges">\n'.format(width=width, height=total_height)
+        )
+        svg_file.write('<rect width="{0}" height="{1}" fill="#fff"/>\n'.format(width, total_height))
+
+        bar_height = _format_number(height)
+        for position, weight in self._iter_bars(add_quiet_zone):
+            svg_file.write('<rect x="{0}" width="{1}" height="{2}"/>\n'.format(
+                _format_number(position * module_width), _format_number(weight * module_width), bar_height
+            ))
+
+        if text:
+            from xml.sax.saxutils import escape
+
+            printable = ''.join(char for char in self.data if ' ' <= char < '\x7f')
+            svg_file.write(
+                '<text x="{x}" y="{y}" font-family="monospace" font-size="{size}" text-anchor="middle">'
+                '{text}</text>\n'.format(
+                    x=_format_number(self.width(add_quiet_zone) * module_width / 2),
+                    y=_format_number(height + font_size * 1.25),
+                    size=_format_number(font_size),
+                    text=escape(printable),
+                )
+            )
+
+        svg_file.write('</svg>\n')
+
+    def data_url_async(self, image_format='png', add_quiet_zone=True, optimize=False):
+        """Get a data URL representing the barcode without blocking the asyncio event loop.
+
+        The data URL is rendered by the shared renderer of pubcode.aio, as in Code128.render_async.
+
+        See Symbology.data_url for the parameters.
+
+        :returns: An awaitable for the data URL.
+        """
+        from . import aio
+        return aio.default_renderer().render_barcode(self, 'data_url', {
+            'image_format': image_format,
+            'add_quiet_zone': add_quiet_zone,
+            'optimize': optimize,
+        })
+
+
+def _restore(cls, data, symbol_values):
+    """Unpickle a barcode."""
+    return cls._from_symbol_values(data, symbol_values)
+
+
+def _format_number(number):
+    """Format a number for SVG, without trailing zeros."""
+    return '{0:.4f}'.format(number).rstrip('0').rstrip('.')
+
+
+# Functions producing each output of Code128.encode_many from a barcode and keyword arguments.
+_outputs = {
+    'data_url': lambda barcode, options: barcode.data_url(**options),
+    'png': lambda barcode, options: barcode.image_data('png', **options),
+    'bmp': lambda barcode, options: barcode.image_data('bmp', **options),
+    'svg': lambda barcode, options: barcode.svg(**options),
+    'modules': lambda barcode, options: barcode.modules,
+    'packed_modules': lambda barcode, options: barcode.packed_modules(**options),
+    'symbol_values': lambda barcode, options: barcode.symbol_values,
+    'barcode': lambda barcode, options: barcode,
+}
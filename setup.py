@@ -34,7 +34,14 @@ setup(
 
     install_requires=[
         "future",  # For Python3 like builtins in Python2.
+        'futures; python_version < "3"',  # For concurrent.futures in Code128.encode_many on Python2.
     ],
 
     packages=find_packages(exclude=['tests']),
+
+    entry_points={
+        'console_scripts': [
+            'pubcode=pubcode.cli:main',
+        ],
+    },
 )
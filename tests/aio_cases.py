@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+"""Tests of pubcode.aio and pubcode.bench_aio, which are run by tests.test_aio on Python 3.5 and newer."""
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+from unittest import TestCase
+from concurrent import futures
+from pubcode import Code128, aio
+import asyncio
+import threading
+import time
+
+
+class _CountingExecutor(futures.ThreadPoolExecutor):
+    """A thread pool that counts the calls and the largest number of calls running at the same time."""
+
+    def __init__(self, *args, **kwargs):
+        super(_CountingExecutor, self).__init__(*args, **kwargs)
+        self.lock = threading.Lock()
+        self.calls = 0
+        self.running = 0
+        self.max_running = 0
+
+    def submit(self, function, *args, **kwargs):
+        def counted():
+            with self.lock:
+                self.calls += 1
+                self.running += 1
+                self.max_running = max(self.max_running, self.running)
+            try:
+                # Keep the calls running long enough to overlap.
+                time.sleep(0.01)
+                return function(*args, **kwargs)
+            finally:
+                with self.lock:
+                    self.running -= 1
+        return super(_CountingExecutor, self).submit(counted)
+
+
+class TestAsyncRenderer(TestCase):
+    def setUp(self):
+        self.executor = _CountingExecutor(8)
+        self.loop = asyncio.new_event_loop()
+
+    def tearDown(self):
+        self.loop.close()
+        self.executor.shutdown()
+
+    def gather(self, *awaitables):
+        """Run awaitables concurrently in the event loop and get their results."""
+        async def gather():
+            return await asyncio.gather(*awaitables)
+        return self.loop.run_until_complete(gather())
+
+    def test_render(self):
+        renderer = aio.AsyncRenderer(self.executor)
+        result = self.loop.run_until_complete(renderer.render(Code128, 'Hello!', 'B', 'png', {'height': 2}))
+        self.assertEqual(result, Code128('Hello!', 'B').image_data('png', height=2))
+
+        barcode = Code128('1234')
+        result = self.loop.run_until_complete(renderer.render_barcode(barcode, 'svg'))
+        self.assertEqual(result, barcode.svg())
+
+    def test_errors(self):
+        renderer = aio.AsyncRenderer(self.executor)
+        with self.assertRaises(Code128.IncompatibleCharsetError):
+            self.loop.run_until_complete(renderer.render(Code128, '\x80'))
+        with self.assertRaises(Code128.UnknownFormatError):
+            self.loop.run_until_complete(renderer.render(Code128, 'Hello!', output='gif'))
+        self.assertEqual(renderer.stats()['in_flight'], 0)
+
+    def test_coalesce(self):
+        """Test that identical requests that are in flight at the same time are rendered once."""
+        renderer = aio.AsyncRenderer(self.executor)
+        requests = [renderer.render(Code128, 'SKU-1') for _ in range(10)] + [renderer.render(Code128, 'SKU-2')]
+        results = self.gather(*requests)
+
+        self.assertEqual(results, [Code128('SKU-1').data_url()] * 10 + [Code128('SKU-2').data_url()])
+        self.assertEqual(self.executor.calls, 2)
+        self.assertEqual(renderer.stats(), {'in_flight': 0, 'coalesced': 9})
+
+        # Later requests are rendered again.
+        self.loop.run_until_complete(renderer.render(Code128, 'SKU-1'))
+        self.assertEqual(self.executor.calls, 3)
+
+    def test_cancel(self):
+        """Test that cancelling one of the coalesced requests doesn't cancel the others."""
+        renderer = aio.AsyncRenderer(self.executor)
+
+        async def cancel_first():
+            first = asyncio.ensure_future(renderer.render(Code128, 'SKU-1'))
+            second = asyncio.ensure_future(renderer.render(Code128, 'SKU-1'))
+            await asyncio.sleep(0)
+            first.cancel()
+            return await second
+
+        self.assertEqual(self.loop.run_until_complete(cancel_first()), Code128('SKU-1').data_url())
+
+    def test_max_concurrency(self):
+        renderer = aio.AsyncRenderer(self.executor, max_concurrency=2)
+        requests = [renderer.render(Code128, 'SKU-{0}'.format(index)) for index in range(8)]
+        self.gather(*requests)
+
+        self.assertEqual(self.executor.calls, 8)
+        self.assertEqual(self.executor.max_running, 2)
+
+    def test_code128_methods(self):
+        """Test Code128.render_async and Code128.data_url_async, which use the renderer given to configure."""
+        renderer = aio.configure(self.executor)
+        try:
+            self.assertIs(aio.default_renderer(), renderer)
+            barcode = Code128('Hello!')
+            results = self.gather(
+                Code128.render_async('Hello!', output='symbol_values'),
+                barcode.data_url_async('bmp', optimize=True),
+            )
+            self.assertEqual(results, [barcode.symbol_values, barcode.data_url('bmp', optimize=True)])
+            self.assertEqual(self.executor.calls, 2)
+        finally:
+            aio.configure()
+
+
+class TestBenchEventLoop(TestCase):
+    def test_bench_event_loop(self):
+        from pubcode.bench_aio import bench_event_loop
+
+        results = bench_event_loop(requests=4, concurrency=2, workers=1)
+        self.assertEqual([result['name'] for result in results],
+                         ['event_loop.inline', 'event_loop.threads', 'event_loop.processes'])
+        for result in results:
+            self.assertGreater(result['seconds'], 0)
+            self.assertGreaterEqual(result['max_lag_seconds'], result['p99_lag_seconds'])
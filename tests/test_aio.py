@@ -0,0 +1,7 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import, division, print_function, unicode_literals
+import sys
+
+# pubcode.aio needs Python 3.5 or newer, so its tests are in a module that can't even be imported on older versions.
+if sys.version_info >= (3, 5):
+    from .aio_cases import TestAsyncRenderer, TestBenchEventLoop
@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import, division, print_function, unicode_literals
+from builtins import *  # Use Python3-like builtins for Python2.
+
+from unittest import TestCase
+from pubcode import Code128
+from pubcode.batch import SpriteSheetWriter, PdfWriter
+import io
+import json
+import re
+import struct
+import zlib
+
+
+def _read_png(png):
+    """Get the width, height and the unfiltered lines of a PNG written by SpriteSheetWriter."""
+    position = 8
+    chunks = []
+    while position < len(png):
+        length, = struct.unpack(b'>I', png[position:position + 4])
+        chunks.append((png[position + 4:position + 8], png[position + 8:position + 8 + length]))
+        position += 12 + length
+
+    width, height = struct.unpack(b'>II', chunks[0][1][:8])
+    data = zlib.decompress(b''.join(chunk for chunk_type, chunk in chunks if chunk_type == b'IDAT'))
+    line_length = (width + 7) // 8 + 1
+    lines = [data[start + 1:start + line_length] for start in range(0, len(data), line_length)]
+    return width, height, [chunk_type for chunk_type, _ in chunks], lines
+
+
+class _UnseekableFile(io.BytesIO):
+    def seek(self, *args):
+        raise io.UnsupportedOperation('seek')
+
+
+class TestSpriteSheetWriter(TestCase):
+    def test_tiles(self):
+        barcodes = [Code128('LOT{0}'.format(index)) for index in range(5)]
+        image_file, index_file = io.BytesIO(), io.StringIO()
+        with SpriteSheetWriter(image_file, 100, index_file, columns=2, height=3) as writer:
+            for barcode in barcodes:
+                writer.add(barcode)
+
+        width, height, chunk_types, lines = _read_png(image_file.getvalue())
+        self.assertEqual((width, height), (200, 9))
+        self.assertEqual(chunk_types, [b'IHDR', b'IDAT', b'IEND'])
+        self.assertEqual(len(lines), 9)
+
+        index = json.loads(index_file.getvalue())
+        self.assertEqual([(entry['x'], entry['y']) for entry in index], [(0, 0), (100, 0), (0, 3), (100, 3), (0, 6)])
+        for entry, barcode in zip(index, barcodes):
+            self.assertEqual(entry['data'], barcode.data)
+            for y in range(entry['y'], entry['y'] + 3):
+                pixels = ''.join('{0:08b}'.format(byte) for byte in bytearray(lines[y]))
+                tile = pixels[entry['x']:entry['x'] + 100]
+                modules = ''.join(str(module) for module in [1] * 10 + barcode.modules + [1] * 10)
+                self.assertEqual(tile, modules + '1' * (100 - len(modules)))
+
+    def test_count(self):
+        """Test that the header doesn't need to be rewritten when the number of barcodes is given."""
+        image_file = _UnseekableFile()
+        with SpriteSheetWriter(image_file, 100, columns=3, count=4) as writer:
+            for index in range(4):
+                writer.add(Code128('LOT{0}'.format(index)))
+
+        self.assertEqual(_read_png(image_file.getvalue())[:2], (300, 2))
+
+    def test_large(self):
+        """Test that the image data is split into several chunks."""
+        image_file = io.BytesIO()
+        with SpriteSheetWriter(image_file, 200, columns=4, height=5, compress_level=0) as writer:
+            for barcode in Code128.serial_range('LOT', 0, 2000, 4):
+                writer.add(barcode)
+
+        width, height, chunk_types, lines = _read_png(image_file.getvalue())
+        self.assertEqual((width, height), (800, 2500))
+        self.assertGreater(chunk_types.count(b'IDAT'), 1)
+
+    def test_too_wide(self):
+        with SpriteSheetWriter(io.BytesIO(), 100) as writer:
+            with self.assertRaises(ValueError):
+                writer.add(Code128('Hello!'))
+
+
+class TestPdfWriter(TestCase):
+    def test_pdf(self):
+        barcodes = [Code128('LOT{0}'.format(index)) for index in range(30)]
+        pdf_file = io.BytesIO()
+        with PdfWriter(pdf_file, page_size=(300, 400), margin=20, columns=2, height=30, gap=10) as writer:
+            for barcode in barcodes:
+                writer.add(barcode)
+        pdf = pdf_file.getvalue()
+
+        self.assertTrue(pdf.startswith(b'%PDF-1.4\n'))
+        self.assertTrue(pdf.endswith(b'%%EOF\n'))
+
+        # Check that every entry of the cross-reference table points to its object.
+        xref_position = int(pdf.rsplit(b'startxref\n', 1)[1].split(b'\n')[0])
+        xref = pdf[xref_position:].split(b'trailer')[0].split(b'\n')
+        size = int(xref[1].split()[1])
+        for number, entry in enumerate(xref[3:3 + size - 1], 1):
+            offset = int(entry.split()[0])
+            self.assertTrue(pdf[offset:].startswith('{0} 0 obj\n'.format(number).encode('ascii')))
+
+        # There are 9 rows of barcodes on each page, so 18 barcodes.
+        self.assertIn(b'/Type /Pages /Kids [4 0 R 6 0 R] /Count 2', pdf)
+
+        # Check the rectangles of the barcodes on the first page, which are filled row by row from the top.
+        stream = re.search(br'stream\n(.*?)\nendstream', pdf, re.DOTALL).group(1)
+        content = zlib.decompress(stream).decode('ascii').split('\n')
+        rectangles = [[float(number) for number in line.split()[:4]] for line in content if line.endswith(' re')]
+        self.assertEqual(content[-2:], ['f', ''])
+
+        expected = []
+        for index, barcode in enumerate(barcodes[:18]):
+            x = 20 + index % 2 * 130 + 10
+            y = 400 - 20 - index // 2 * 40 - 30
+            for position, weight in enumerate(map(int, barcode.bars)):
+                if position % 2 == 0:
+                    expected.append([x, y, weight, 30])
+                x += weight
+        self.assertEqual(rectangles, expected)
+
+    def test_too_wide(self):
+        with PdfWriter(io.BytesIO(), page_size=(300, 400), margin=20, columns=2) as writer:
+            writer.add(Code128('LOT1'))
+            with self.assertRaises(ValueError):
+                writer.add(Code128('LOT-000000001'))
@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import, division, print_function, unicode_literals
+from builtins import *  # Use Python3-like builtins for Python2.
+
+from unittest import TestCase
+from pubcode import bench
+import io
+import json
+import os
+import tempfile
+
+
+class TestBench(TestCase):
+    def test_corpora(self):
+        corpora = bench.corpora(size=3)
+        self.assertEqual(sorted(corpora), ['long_numeric', 'mixed_ab', 'short_sku'])
+        self.assertEqual(corpora, bench.corpora(size=3))
+
+    def _run_main(self, only):
+        """Run the benchmarks whose names start with only, as fast as possible, and get the report."""
+        handle, path = tempfile.mkstemp(suffix='.json')
+        os.close(handle)
+        try:
+            bench.main(['--repeat', '1', '--number', '1', '--size', '2', '--only', only, '--output', path])
+            with io.open(path, encoding='utf-8') as report_file:
+                return json.load(report_file)
+        finally:
+            os.remove(path)
+
+    def test_main(self):
+        """Test that the benchmarks run and write a JSON report."""
+        report = self._run_main('data_url')
+        names = set(result['name'] for result in report['results'])
+        self.assertEqual(names, {'data_url.png', 'data_url.bmp', 'data_url.auto'})
+        self.assertEqual(len(report['results']), 9)
+        for result in report['results']:
+            self.assertGreater(result['seconds'], 0)
+            if bench.tracemalloc is not None:
+                self.assertGreater(result['peak_bytes'], 0)
+
+    def test_main_only(self):
+        """Test that the results of every group are filtered by name."""
+        for only in ('sheet', 'sheet.pil', 'event_loop.x'):
+            report = self._run_main(only)
+            self.assertTrue(all(result['name'].startswith(only) for result in report['results']))
+
+        try:
+            import PIL
+        except ImportError:
+            return
+        self.assertEqual([result['name'] for result in self._run_main('sheet.pil')['results']], ['sheet.pil'])
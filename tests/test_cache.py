@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import, division, print_function, unicode_literals
+from builtins import *  # Use Python3-like builtins for Python2.
+
+from unittest import TestCase
+from pubcode import Code128
+from pubcode.cache import RenderCache
+import sys
+import threading
+
+
+class TestRenderCache(TestCase):
+    def tearDown(self):
+        Code128.cache = None
+
+    def test_get_and_set(self):
+        cache = RenderCache()
+        self.assertIsNone(cache.get('a'))
+        cache.set('a', 'value')
+        self.assertEqual(cache.get('a'), 'value')
+
+        stats = cache.stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['entries']), (1, 1, 1))
+
+    def test_evict_least_recently_used(self):
+        cache = RenderCache(max_entries=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+
+        self.assertEqual(cache.get('a'), 1)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('c'), 3)
+        self.assertEqual(cache.stats()['evictions'], 1)
+
+    def test_max_bytes(self):
+        value_size = sys.getsizeof(b'x' * 100)
+        cache = RenderCache(max_entries=None, max_bytes=2 * value_size)
+        for key in range(3):
+            cache.set(key, b'x' * 100)
+
+        stats = cache.stats()
+        self.assertEqual((stats['entries'], stats['bytes'], stats['evictions']), (2, 2 * value_size, 1))
+
+        # Values larger than the whole cache are not cached.
+        cache.set('large', b'x' * 1000)
+        self.assertIsNone(cache.get('large'))
+
+    def test_code128(self):
+        Code128.cache = RenderCache()
+        data_url = Code128('Hello!', charset='B').data_url()
+        image_data = Code128('Hello!', charset='B').image_data('bmp', height=2)
+
+        Code128.cache.clear()
+        hits = Code128.cache.stats()['hits']
+        self.assertEqual(Code128('Hello!', charset='B').data_url(), data_url)
+        self.assertEqual(Code128('Hello!', charset=list('BBBBBB')).image_data('bmp', height=2), image_data)
+        self.assertEqual(Code128('Hello!', charset='B').image_data('bmp', height=2), image_data)
+        self.assertEqual(Code128.cache.stats()['hits'], hits + 2)
+
+    def test_threads(self):
+        cache = RenderCache(max_entries=10)
+
+        def worker(start):
+            for key in range(start, start + 100):
+                cache.set(key % 20, key)
+                cache.get((key + 1) % 20)
+
+        threads = [threading.Thread(target=worker, args=(start,)) for start in range(0, 800, 100)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        stats = cache.stats()
+        self.assertEqual(stats['entries'], 10)
+        self.assertEqual(stats['hits'] + stats['misses'], 800)
@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import, division, print_function, unicode_literals
+from builtins import *  # Use Python3-like builtins for Python2.
+
+from unittest import TestCase
+from pubcode import Code128, cli
+import io
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tarfile
+import tempfile
+import zipfile
+
+_repository_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class TestCli(TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.csv_path = os.path.join(self.directory, 'input.csv')
+        with io.open(self.csv_path, 'w', encoding='utf-8', newline='') as csv_file:
+            csv_file.write('name,sku\nfirst,LOT42-1\n../second,1234\nthird,ä\nfourth,\n')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_read_rows(self):
+        lines = io.StringIO('Hello!\r\n1234\n')
+        self.assertEqual(list(cli.read_rows(lines)), [(1, '1', 'Hello!'), (2, '2', '1234')])
+
+        with io.open(self.csv_path, encoding='utf-8', newline='') as csv_file:
+            self.assertEqual(list(cli.read_rows(csv_file, 'sku', 'name')), [
+                (2, 'first', 'LOT42-1'), (3, '../second', '1234'), (4, 'third', 'ä'), (5, 'fourth', ''),
+            ])
+        with io.open(self.csv_path, encoding='utf-8', newline='') as csv_file:
+            self.assertEqual(list(cli.read_rows(csv_file, '1'))[:2], [(1, '1', 'sku'), (2, '2', 'LOT42-1')])
+
+    def test_directory(self):
+        output = os.path.join(self.directory, 'barcodes')
+        status = cli.main([self.csv_path, '--column', 'sku', '--name-column', 'name', '-o', output, '-q',
+                           '--height', '10', '--module-width', '2'])
+
+        # The third and fourth rows can't be encoded.
+        self.assertEqual(status, 1)
+        self.assertEqual(sorted(os.listdir(output)), ['_._second.png', 'first.png'])
+        with open(os.path.join(output, 'first.png'), 'rb') as image_file:
+            self.assertEqual(image_file.read(), Code128('LOT42-1').image_data('png', height=10, module_width=2))
+
+    def test_archives(self):
+        for name in ('barcodes.tar.gz', 'barcodes.zip'):
+            output = os.path.join(self.directory, name)
+            cli.main([self.csv_path, '--column', 'sku', '-o', output, '-f', 'svg', '--height', '50', '-q', '-j', '2'])
+
+            if name.endswith('.zip'):
+                with zipfile.ZipFile(output) as archive:
+                    files = {info.filename: archive.read(info) for info in archive.infolist()}
+            else:
+                with tarfile.open(output) as archive:
+                    files = {info.name: archive.extractfile(info).read() for info in archive.getmembers()}
+
+            self.assertEqual(sorted(files), ['2.svg', '3.svg'])
+            self.assertEqual(files['3.svg'].decode('utf-8'), Code128('1234').svg(height=50))
+
+    def test_json_lines(self):
+        output = os.path.join(self.directory, 'barcodes.jsonl')
+        cli.main([self.csv_path, '--column', 'sku', '-o', output, '-f', 'auto', '-q'])
+
+        with io.open(output, encoding='utf-8') as jsonl_file:
+            lines = [json.loads(line) for line in jsonl_file]
+        self.assertEqual(lines, [
+            {'name': '2', 'data_url': Code128('LOT42-1').data_url('auto')},
+            {'name': '3', 'data_url': Code128('1234').data_url('auto')},
+        ])
+
+    def test_stdin(self):
+        process = subprocess.Popen(
+            [sys.executable, '-m', 'pubcode.cli', '--progress', '0'],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE, cwd=_repository_root
+        )
+        stdout, stderr = process.communicate(b'Hello!\n\x80\n\n')
+
+        self.assertEqual(process.returncode, 1)
+        self.assertEqual(json.loads(stdout.decode('utf-8')), {'name': '1', 'data_url': Code128('Hello!').data_url()})
+        stderr = stderr.decode('utf-8')
+        self.assertIn('row 2: IncompatibleCharsetError', stderr)
+        self.assertIn('row 3: InvalidDataError', stderr)
+        self.assertIn('3 rows, 2 errors', stderr)
@@ -6,6 +6,14 @@ from unittest import TestCase
 from pubcode import Code128
 import base64
 import io
+import itertools
+import os
+import pickle
+import struct
+import subprocess
+import sys
+import zlib
+from xml.etree import ElementTree
 
 # PIL is optional.
 try:
@@ -13,6 +21,9 @@ try:
 except ImportError:
     PIL = None
 
+# The directory containing the pubcode package, for running Python in subprocesses.
+_repository_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
 class TestCode128(TestCase):
     # Test data used by multiple tests.
     _hello_b_modules = [
@@ -114,6 +125,101 @@ class TestCode128(TestCase):
 
         self.assertSequenceEqual(code.symbols, correct_symbols)
 
+    def test_auto_charset_b(self):
+        code = Code128('Hello!')
+        self.assertSequenceEqual(code.symbol_values, Code128('Hello!', charset='B').symbol_values)
+
+    def test_auto_charset_c(self):
+        code = Code128('12345678')
+
+        correct_symbols = [
+            Code128.Special.START_C,
+            '12', '34', '56', '78',
+            '47', Code128.Special.STOP
+        ]
+
+        self.assertSequenceEqual(code.symbols, correct_symbols)
+
+    def test_auto_charset_odd_digits(self):
+        """Test that the odd digit of a digit run is encoded in the charset of the surrounding characters."""
+        code = Code128('AB12345')
+
+        correct_symbols = [
+            Code128.Special.START_B,
+            'A', 'B', '1', Code128.Special.CODE_C, '23', '45',
+            '07', Code128.Special.STOP
+        ]
+
+        self.assertSequenceEqual(code.symbols, correct_symbols)
+
+    def test_auto_charset_shift(self):
+        code = Code128('a\x00a')
+
+        correct_symbols = [
+            Code128.Special.START_B,
+            'a', Code128.Special.SHIFT_A, '\x00', 'a',
+            Code128.Special.FNC_3, Code128.Special.STOP
+        ]
+
+        self.assertSequenceEqual(code.symbols, correct_symbols)
+
+    def test_auto_charset_incompatible(self):
+        with self.assertRaises(Code128.IncompatibleCharsetError):
+            Code128('\xe4')
+
+    def test_empty_data(self):
+        for charset in (None, 'A', 'B', 'C'):
+            with self.assertRaises(Code128.InvalidDataError):
+                Code128('', charset)
+            with self.assertRaises(Code128.InvalidDataError):
+                Code128.estimate_width('', charset)
+
+    def test_auto_charset_is_shortest(self):
+        """Compare the automatic charsets against every possible charset sequence for short data."""
+        def iter_charsets(data):
+            if not data:
+                yield ''
+                return
+            for charset in 'AB':
+                if charset == 'B' or data[0] < '\x60':
+                    if charset == 'A' or data[0] >= ' ':
+                        for rest in iter_charsets(data[1:]):
+                            yield charset + rest
+            if data[:2].isdigit() and len(data) > 1:
+                for rest in iter_charsets(data[2:]):
+                    yield 'C' + rest
+
+        alphabet = '01a\x00A'
+        for length in range(1, 6):
+            for chars in itertools.product(alphabet, repeat=length):
+                data = ''.join(chars)
+                shortest = min(len(Code128._encode(data, charsets)) for charsets in iter_charsets(data))
+                self.assertEqual(len(Code128(data).symbol_values), shortest, repr(data))
+
+    def test_modules(self):
+        code = Code128('Hello!', charset='B')
+        self.assertListEqual(code.modules, self._hello_b_modules)
+
+    def test_packed_modules(self):
+        """Test that the packed modules have the bits of the modules and are padded with spaces."""
+        code = Code128('Hello!', charset='B')
+        packed = code.packed_modules()
+
+        bits = ''.join('{0:08b}'.format(byte) for byte in bytearray(packed))
+        modules = [int(bit) for bit in bits]
+        self.assertEqual(len(packed), (code.width() + 7) // 8)
+        self.assertListEqual(modules[:code.width()], self._hello_b_modules)
+        self.assertTrue(all(modules[code.width():]))
+
+    def test_packed_modules_with_quiet(self):
+        code = Code128('Hello!', charset='B')
+        packed = code.packed_modules(add_quiet_zone=True)
+
+        bits = ''.join('{0:08b}'.format(byte) for byte in bytearray(packed))
+        modules = [int(bit) for bit in bits][:code.width(add_quiet_zone=True)]
+        quiet_zone = [1] * code.quiet_zone
+        self.assertListEqual(modules, quiet_zone + self._hello_b_modules + quiet_zone)
+
     def test_image(self):
         """Test that the generated image is of the correct format and contains the correct data."""
         if PIL is None:
@@ -133,7 +239,7 @@ class TestCode128(TestCase):
         self.assertEqual(image.size[0], code.width())
 
         # Check that the image has the correct pixels in it.
-        pixels = [image.getpixel((x, 0)) for x in range(image.size[0])]
+        pixels = [1 if image.getpixel((x, 0)) else 0 for x in range(image.size[0])]
         self.assertListEqual(pixels, self._hello_b_modules)
 
     def test_image_with_quiet(self):
@@ -156,7 +262,7 @@ class TestCode128(TestCase):
 
         # Check that the image has the correct pixels in it.
         quiet_zone = [1] * code.quiet_zone
-        pixels = [image.getpixel((x, 0)) for x in range(image.size[0])]
+        pixels = [1 if image.getpixel((x, 0)) else 0 for x in range(image.size[0])]
         self.assertListEqual(pixels, quiet_zone + self._hello_b_modules + quiet_zone)
 
     def test_data_url(self):
@@ -182,3 +288,385 @@ class TestCode128(TestCase):
         # Check that the image is of the correct width and has the correct pixels in it.
         pixels = [1 if image.getpixel((x, 0)) else 0 for x in range(image.size[0])]
         self.assertListEqual(pixels, self._hello_b_modules)
+
+    def test_image_data_png(self):
+        """Test that the PNG is written without PIL and contains the modules on every line."""
+        code = Code128('Hello!', charset='B')
+        png = code.image_data('png', height=2, add_quiet_zone=False)
+
+        self.assertEqual(png[:8], b'\x89PNG\r\n\x1a\n')
+        width, height, bit_depth, color_type = struct.unpack(b'>IIBB', png[16:26])
+        self.assertEqual((width, height, bit_depth, color_type), (code.width(), 2, 1, 0))
+
+        idat_length = struct.unpack(b'>I', png[33:37])[0]
+        self.assertEqual(png[37:41], b'IDAT')
+        scanlines = bytearray(zlib.decompress(png[41:41 + idat_length]))
+        line_length = len(scanlines) // 2
+        lines = [scanlines[:line_length], scanlines[line_length:]]
+
+        # The first line has no filter or the Sub filter and the second line has the Up filter, so it is all 0.
+        self.assertIn(lines[0][0], (0, 1))
+        if lines[0][0] == 1:
+            for index in range(2, line_length):
+                lines[0][index] = (lines[0][index] + lines[0][index - 1]) & 0xff
+        self.assertEqual(lines[1], b'\x02' + bytes(line_length - 1))
+
+        # The padding bits after the last module are 0.
+        packed_modules = bytearray(code.packed_modules())
+        packed_modules[-1] &= 0xff << (-code.width() % 8)
+        self.assertEqual(lines[0][1:], packed_modules)
+
+    def test_image_data_matches_pil(self):
+        """Test that the images have the same pixels as the PIL images and aren't larger than what PIL saves."""
+        if PIL is None:
+            return
+
+        code = Code128('Hello!', charset='B')
+        for image_format, options in (('png', {'compress_level': 1}), ('bmp', {})):
+            pil_image = code.image(height=3, module_width=2)
+            memory_file = io.BytesIO()
+            pil_image.save(memory_file, format=image_format, **options)
+
+            image_data = code.image_data(image_format, height=3, module_width=2)
+            image = PIL.Image.open(io.BytesIO(image_data))
+
+            self.assertEqual(image.mode, '1')
+            self.assertEqual(image.size, pil_image.size)
+            self.assertEqual(image.tobytes(), pil_image.tobytes())
+            self.assertLessEqual(len(image_data), len(memory_file.getvalue()))
+
+    def test_image_data_not_larger_than_pil(self):
+        """Test that the PNGs of the benchmark corpora are never larger than what PIL saves with compress_level=1."""
+        if PIL is None:
+            return
+        from pubcode.bench import corpora
+
+        for items in corpora(size=20).values():
+            for data in items:
+                code = Code128(data)
+                for height in (1, 50):
+                    memory_file = io.BytesIO()
+                    code.image(height=height).save(memory_file, format='png', compress_level=1)
+                    self.assertLessEqual(len(code.image_data('png', height=height)), len(memory_file.getvalue()))
+
+    def test_data_url_optimized_size(self):
+        """Test that the optimized data URLs are never larger than the PNG and BMP data URLs.
+
+        With PIL, the data URLs are also compared to the ones that were created with PIL images, before pubcode wrote
+        the images itself.
+        """
+        from pubcode.bench import corpora
+
+        for items in corpora(size=20).values():
+            for data in items:
+                code = Code128(data)
+                smallest = min(len(code.data_url('png')), len(code.data_url('bmp')))
+                self.assertLessEqual(len(code.data_url('png', optimize=True)), len(code.data_url('png')))
+                self.assertLessEqual(len(code.data_url('auto')), smallest)
+                self.assertLessEqual(len(code.data_url('auto', optimize=True)), smallest)
+
+                if PIL is not None:
+                    for image_format, options in (('png', {'compress_level': 1}), ('bmp', {})):
+                        memory_file = io.BytesIO()
+                        code.image().save(memory_file, format=image_format, **options)
+                        pil_data_url = 'data:image/{0};base64,{1}'.format(
+                            image_format, base64.b64encode(memory_file.getvalue()).decode('ascii')
+                        )
+                        self.assertLessEqual(len(code.data_url(image_format)), len(pil_data_url))
+                        self.assertLessEqual(len(code.data_url('auto', optimize=True)), len(pil_data_url))
+
+                for height in (1, 50):
+                    image_format, image_data = code.smallest_image_data(height=height)
+                    self.assertEqual(image_data, code.image_data(image_format, height=height, optimize=True))
+                    self.assertLessEqual(len(image_data), len(code.image_data('png', height=height)))
+                    self.assertLessEqual(len(image_data), len(code.image_data('bmp', height=height)))
+
+    def test_image_data_optimized_png(self):
+        if PIL is None:
+            return
+
+        code = Code128('Hello!', charset='B')
+        for height in (1, 50):
+            image = PIL.Image.open(io.BytesIO(code.image_data('png', height=height, module_width=2, optimize=True)))
+            self.assertEqual(image.tobytes(), code.image(height=height, module_width=2).tobytes())
+
+    def test_data_url_svg(self):
+        code = Code128('Hello!', charset='B')
+        data_url = code.data_url('svg', add_quiet_zone=False)
+        self.assertTrue(data_url.startswith('data:image/svg+xml;base64,'))
+
+        svg = ElementTree.fromstring(base64.b64decode(data_url.split(',')[1]))
+        self.assertEqual(svg.get('viewBox'), '0 0 101 1')
+        self.assertEqual(svg.get('preserveAspectRatio'), 'none')
+
+        # Draw the path, which only has rectangles, and compare it to the modules.
+        modules = [1] * 101
+        path = svg.find('{http://www.w3.org/2000/svg}path').get('d')
+        for rectangle in path.split('z')[:-1]:
+            x, width = rectangle[1:].split(' 0h')[0], rectangle.split('h')[1].split('v')[0]
+            modules[int(x):int(x) + int(width)] = [0] * int(width)
+        self.assertListEqual(modules, self._hello_b_modules)
+
+    def test_data_url_unknown_format(self):
+        code = Code128('Hello!', charset='B')
+        with self.assertRaises(Code128.UnknownFormatError):
+            code.data_url(image_format='gif')
+
+    def test_encode_many(self):
+        data = ['Hello!', '1234', '\x80', 'a\x00a', ''] * 10
+        correct = [Code128(item).data_url() if item not in ('\x80', '') else None for item in data]
+
+        for workers, use_processes in ((None, False), (2, False), (2, True)):
+            results = list(Code128.encode_many(data, workers=workers, use_processes=use_processes, chunk_size=3))
+
+            self.assertEqual(len(results), len(data))
+            for result, correct_result in zip(results, correct):
+                if correct_result is None:
+                    self.assertIsInstance(result, Code128.InvalidDataError)
+                else:
+                    self.assertEqual(result, correct_result)
+
+    def test_encode_many_options(self):
+        results = list(Code128.encode_many(['Hello!'], charset='B', output='packed_modules', add_quiet_zone=True))
+        self.assertEqual(results, [Code128('Hello!', charset='B').packed_modules(add_quiet_zone=True)])
+
+    def test_encode_many_unknown_output(self):
+        with self.assertRaises(Code128.UnknownFormatError):
+            list(Code128.encode_many(['Hello!'], output='gif'))
+
+    def test_incompatible_charset(self):
+        with self.assertRaises(Code128.IncompatibleCharsetError):
+            Code128('a\x00', charset='BB')
+
+    def test_svg(self):
+        """Test that the SVG has a rectangle for each bar, at the positions of the bar modules."""
+        code = Code128('Hello!', charset='B')
+        svg = code.svg(module_width=2, height=30)
+        root = ElementTree.fromstring(svg)
+
+        self.assertEqual(root.get('width'), str(code.width(add_quiet_zone=True) * 2))
+        self.assertEqual(root.get('height'), '30')
+
+        quiet_zone = [1] * code.quiet_zone
+        modules = [1] * (code.width(add_quiet_zone=True) * 2)
+        rects = root.findall('{http://www.w3.org/2000/svg}rect')
+        for rect in rects[1:]:
+            x, width = int(rect.get('x')), int(rect.get('width'))
+            self.assertEqual(rect.get('height'), '30')
+            modules[x:x + width] = [0] * width
+        self.assertListEqual(modules[::2], quiet_zone + self._hello_b_modules + quiet_zone)
+        self.assertEqual(len(rects) - 1, (len(code.bars) + 1) // 2)
+
+    def test_svg_text(self):
+        code = Code128('<a&b>\x00')
+        root = ElementTree.fromstring(code.svg(height=30, text=True, font_size=10))
+
+        self.assertEqual(root.get('height'), '45')
+        self.assertEqual(root.find('{http://www.w3.org/2000/svg}text').text, '<a&b>')
+
+    def test_write_svg(self):
+        code = Code128('Hello!', charset='B')
+        svg_file = io.StringIO()
+        code.write_svg(svg_file, add_quiet_zone=False)
+        self.assertEqual(svg_file.getvalue(), code.svg(add_quiet_zone=False))
+
+    def test_decode_modules(self):
+        data, charset = Code128.decode(self._hello_b_modules)
+        self.assertEqual((data, charset), ('Hello!', 'BBBBBB'))
+
+    def test_decode_shift_and_charsets(self):
+        code = Code128('a\x00a\x00a12345', charset='BABABCCB')
+        data, charset = Code128.decode(code.bars)
+
+        self.assertEqual((data, charset), ('a\x00a\x00a12345', 'BABABCCB'))
+        self.assertSequenceEqual(Code128(data, charset).symbol_values, code.symbol_values)
+
+    def test_decode_scaled_and_reversed(self):
+        code = Code128('Hello!', charset='B')
+        modules = [1] * 5 + [module for module in self._hello_b_modules for _ in range(3)] + [1] * 5
+
+        self.assertEqual(Code128.decode(modules)[0], 'Hello!')
+        self.assertEqual(Code128.decode(modules[::-1])[0], 'Hello!')
+        self.assertEqual(Code128.decode([255 * module for module in modules], threshold=128)[0], 'Hello!')
+
+    def test_decode_image(self):
+        if PIL is None:
+            return
+
+        code = Code128('Hello World 123456')
+        image = code.image(height=10, module_width=3)
+        # Scale the image to a width that is not a multiple of the modules.
+        image = image.convert('L').resize((image.size[0] * 7 // 5, 10))
+        self.assertEqual(Code128.decode(image), ('Hello World 123456', 'BBBBBBBBBBBBCCC'))
+
+    def test_decode_errors(self):
+        modules = list(self._hello_b_modules)
+        # Replace the check symbol with 'p'.
+        modules[77:88] = Code128('p', charset='B').modules[11:22]
+        with self.assertRaises(Code128.DecodeError):
+            Code128.decode(modules)
+        with self.assertRaises(Code128.DecodeError):
+            Code128.decode(self._hello_b_modules[:-13])
+        with self.assertRaises(Code128.DecodeError):
+            Code128.decode([1] * 20)
+
+        # Weights that aren't digits, or symbols without any width.
+        for bars in ('abc' * 11, '2' * 30 + 'x', '0' * 31):
+            with self.assertRaises(Code128.DecodeError):
+                Code128.decode(bars)
+
+    def test_import_is_lazy(self):
+        """Test that importing pubcode doesn't import the modules that are only needed for rendering."""
+        script = (
+            "import sys, pubcode\n"
+            "pubcode.Code128('Hello!').bars\n"
+            "print(','.join(sorted(name for name in ('PIL', 'base64', 'xml.sax') if name in sys.modules)))\n"
+        )
+        output = subprocess.check_output([sys.executable, '-c', script], cwd=_repository_root)
+        self.assertEqual(output.decode('ascii').strip(), '')
+
+    def test_image_without_pil(self):
+        """Test that MissingDependencyError is raised when PIL can't be imported."""
+        script = (
+            "import sys\n"
+            "sys.modules['PIL'] = None\n"
+            "from pubcode import Code128\n"
+            "try:\n"
+            "    Code128('Hello!').image()\n"
+            "except Code128.MissingDependencyError:\n"
+            "    print('missing')\n"
+        )
+        output = subprocess.check_output([sys.executable, '-c', script], cwd=_repository_root)
+        self.assertEqual(output.decode('ascii').strip(), 'missing')
+
+    def test_immutable(self):
+        code = Code128('Hello!', charset='B')
+        self.assertIsInstance(code.symbol_values, bytes)
+        with self.assertRaises(AttributeError):
+            code.data = 'Hi!'
+        with self.assertRaises(AttributeError):
+            code.extra = 1
+
+    def test_memoized_representations(self):
+        code = Code128('Hello!', charset='B')
+        self.assertIs(code.bars, code.bars)
+        self.assertEqual(code.modules, self._hello_b_modules)
+        # Lists are copied, so changing one doesn't change the barcode.
+        code.modules[0] = 1
+        code.symbols[0] = 'x'
+        self.assertEqual(code.modules, self._hello_b_modules)
+        self.assertEqual(code.symbols[0], Code128.Special.START_B)
+        self.assertEqual(code.width(), len(self._hello_b_modules))
+
+    def test_hash_and_compare(self):
+        code = Code128('Hello!', charset='B')
+        self.assertEqual(code, Code128('Hello!'))
+        self.assertEqual(hash(code), hash(Code128('Hello!')))
+        self.assertNotEqual(code, Code128('Hello!', charset='BBBBBA'))
+        self.assertNotEqual(code, 'Hello!')
+        self.assertLess(Code128('1234'), code)
+        self.assertEqual(len({code, Code128('Hello!'), Code128('1234')}), 2)
+
+    def test_pickle(self):
+        code = Code128('Hello!', charset='B')
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            unpickled = pickle.loads(pickle.dumps(code, protocol))
+            self.assertEqual(unpickled, code)
+            self.assertEqual(unpickled.modules, self._hello_b_modules)
+
+    def test_serial_range(self):
+        """Test that the incrementally updated barcodes are the same as barcodes encoded from scratch."""
+        for prefix, charset in (('LOT42-', None), ('LOT42-', 'B'), ('1', 'C'), ('a\x00', None)):
+            barcodes = list(Code128.serial_range(prefix, 95, 1105, 4, charset))
+            self.assertEqual(len(barcodes), 1010)
+            for number, barcode in zip(range(95, 1105), barcodes):
+                correct = Code128('{0}{1:04d}'.format(prefix, number), charset)
+                self.assertEqual(barcode.data, correct.data)
+                self.assertSequenceEqual(barcode.symbol_values, correct.symbol_values)
+
+    def test_serial_range_packed(self):
+        packed = list(Code128.serial_range('LOT', 8, 11, 2, packed=True))
+        self.assertEqual(packed, [Code128('LOT{0:02d}'.format(number)).packed_modules() for number in range(8, 11)])
+
+    def test_serial_range_too_wide(self):
+        with self.assertRaises(ValueError):
+            list(Code128.serial_range('LOT', 0, 101, 2))
+        self.assertEqual(list(Code128.serial_range('LOT', 5, 5, 2)), [])
+
+    def test_render_into_buffer(self):
+        code = Code128('Hello!', charset='B')
+        stride = 130
+        canvas = bytearray(b'\x80' * stride * 4)
+        code.render_into(memoryview(canvas), x=2, y=1, height=2, stride=stride)
+
+        quiet_zone = [1] * code.quiet_zone
+        modules = quiet_zone + self._hello_b_modules + quiet_zone
+        self.assertEqual(canvas[:stride], b'\x80' * stride)
+        for line in (1, 2):
+            pixels = canvas[line * stride:(line + 1) * stride]
+            self.assertEqual(pixels[:2] + pixels[2 + len(modules):], b'\x80' * (stride - len(modules)))
+            self.assertListEqual([pixel // 255 for pixel in pixels[2:2 + len(modules)]], modules)
+        self.assertEqual(canvas[3 * stride:], b'\x80' * stride)
+
+        with self.assertRaises(ValueError):
+            code.render_into(canvas, x=10, y=3, stride=stride)
+        with self.assertRaises(ValueError):
+            code.render_into(canvas)
+
+        # The barcode would wrap around into the next line, or start before the line or the buffer.
+        with self.assertRaises(ValueError):
+            code.render_into(bytearray(1000), x=50, height=2, add_quiet_zone=False, stride=100)
+        for x, y in ((-1, 1), (1, -1)):
+            with self.assertRaises(ValueError):
+                code.render_into(canvas, x=x, y=y, add_quiet_zone=False, stride=stride)
+
+    def test_render_into_image(self):
+        if PIL is None:
+            return
+
+        code = Code128('Hello!', charset='B')
+        for mode in ('1', 'L', 'RGB'):
+            canvas = PIL.Image.new(mode, (300, 20), 'gray' if mode != '1' else 0)
+            code.render_into(canvas, x=5, y=3, height=10, module_width=2)
+
+            image = code.image(height=10, module_width=2).convert(mode)
+            box = (5, 3, 5 + image.size[0], 13)
+            self.assertEqual(canvas.crop(box).tobytes(), image.tobytes())
+            self.assertEqual(canvas.getpixel((4, 3)), canvas.getpixel((0, 0)))
+
+    def test_render_into_numpy(self):
+        try:
+            import numpy
+        except ImportError:
+            return
+
+        code = Code128('Hello!', charset='B')
+        canvas = numpy.zeros((3, 130), dtype=numpy.uint8)
+        code.render_into(canvas, x=1, y=1, height=1, add_quiet_zone=False)
+        self.assertListEqual([int(pixel) // 255 for pixel in canvas[1, 1:102]], self._hello_b_modules)
+        self.assertFalse(canvas[0].any() or canvas[2].any())
+
+    def test_estimate_width(self):
+        """Test that the estimated width is the same as the width of the encoded barcode."""
+        cases = [
+            ('Hello!', None), ('Hello!', 'B'), ('1234', 'C'), ('12345', 'C'), ('a\x00a', 'BAB'), ('a\x00\x00a', 'BAAB'),
+            ('\x00a', 'AB'), ('12a\x0034', 'CBAC'), ('LOT42-000123', None), ('a\x00a\x00123456', None),
+        ]
+        for data, charset in cases:
+            for add_quiet_zone in (False, True):
+                self.assertEqual(Code128.estimate_width(data, charset, add_quiet_zone),
+                                 Code128(data, charset).width(add_quiet_zone), repr((data, charset)))
+
+        for data, charset in (('\x80', None), ('a', 'A'), ('1a', 'C')):
+            with self.assertRaises(Code128.IncompatibleCharsetError):
+                Code128.estimate_width(data, charset)
+        with self.assertRaises(Code128.CharsetLengthError):
+            Code128.estimate_width('123', 'CC')
+
+    def test_fit(self):
+        width = Code128('LOT42-000123').width(add_quiet_zone=True)
+        self.assertEqual(Code128.fit('LOT42-000123', width * 3), 3)
+        self.assertEqual(Code128.fit('LOT42-000123', width * 3 - 1), 2)
+        self.assertEqual(Code128.fit('LOT42-000123', width * 3 - 1, add_quiet_zone=False), 3)
+        self.assertIsNone(Code128.fit('LOT42-000123', width - 1))
+        self.assertIsNone(Code128.fit('LOT42-000123', width * 2, min_module_width=3))
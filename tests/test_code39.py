@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import, division, print_function, unicode_literals
+from builtins import *  # Use Python3-like builtins for Python2.
+
+from unittest import TestCase
+from pubcode import Code39
+
+
+class TestCode39(TestCase):
+    def test_bars(self):
+        barcode = Code39('A1')
+        self.assertEqual(barcode.bars, ''.join([
+            '1311313111',  # Start *
+            '3111131131',  # A
+            '3113111131',  # 1
+            '131131311',  # Stop *
+        ]))
+        self.assertEqual(barcode.width(), 3 * 16 + 15)
+        self.assertEqual(barcode.modules[:4], [0, 1, 1, 1])
+
+    def test_check_digit(self):
+        self.assertEqual(Code39('CODE39').symbol_values[1:-1], bytes([12, 24, 13, 14, 3, 9]))
+        # The sum of the values is 75, which is 32 (W) modulo 43.
+        self.assertEqual(Code39('CODE39', check_digit=True).symbol_values[1:-1], bytes([12, 24, 13, 14, 3, 9, 32]))
+        self.assertNotEqual(Code39('CODE39'), Code39('CODE39', check_digit=True))
+
+    def test_invalid_data(self):
+        for data in ('code39', 'A*B', 'A_B'):
+            with self.assertRaises(Code39.InvalidDataError):
+                Code39(data)
+
+    def test_svg(self):
+        svg = Code39('A1').svg(height=10, add_quiet_zone=False)
+        # Every symbol has five bars.
+        self.assertEqual(svg.count('<rect x='), 20)
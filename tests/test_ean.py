@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import, division, print_function, unicode_literals
+from builtins import *  # Use Python3-like builtins for Python2.
+
+from unittest import TestCase
+from pubcode import EAN13, UPCA
+
+
+class TestEAN13(TestCase):
+    def test_modules(self):
+        barcode = EAN13('5901234123457')
+        # Bars are 1 here, like in the specification.
+        modules = ''.join('1' if module == 0 else '0' for module in barcode.modules)
+        self.assertEqual(modules, (
+            '101' '0001011' '0100111' '0110011' '0010011' '0111101' '0011101' '01010'
+            '1100110' '1101100' '1000010' '1011100' '1001110' '1000100' '101'
+        ))
+        self.assertEqual(barcode.width(), 95)
+        self.assertEqual(barcode.width(add_quiet_zone=True), 117)
+
+    def test_check_digit(self):
+        self.assertEqual(EAN13('590123412345').data, '5901234123457')
+        self.assertEqual(EAN13('590123412345'), EAN13('5901234123457'))
+        self.assertEqual(EAN13('000000000000').data, '0000000000000')
+        with self.assertRaises(EAN13.InvalidDataError):
+            EAN13('5901234123458')
+
+    def test_invalid_data(self):
+        for data in ('', '59012341234', '59012341234577', '59012341234a', '５９０１２３４１２３４５'):
+            with self.assertRaises(EAN13.InvalidDataError):
+                EAN13(data)
+
+    def test_image_data(self):
+        barcode = EAN13('5901234123457')
+        self.assertEqual(len(barcode.packed_modules(add_quiet_zone=True)), 15)
+        self.assertTrue(barcode.image_data('png', height=10).startswith(b'\x89PNG'))
+        self.assertTrue(barcode.data_url().startswith('data:image/png;base64,'))
+
+
+class TestUPCA(TestCase):
+    def test_upca(self):
+        barcode = UPCA('03600029145')
+        self.assertEqual(barcode.data, '036000291452')
+        # A UPC-A barcode is the EAN-13 barcode with a leading 0.
+        self.assertEqual(barcode.modules, EAN13('0036000291452').modules)
+        self.assertEqual(barcode.width(add_quiet_zone=True), 113)
+
+        with self.assertRaises(UPCA.InvalidDataError):
+            UPCA('036000291453')
+        with self.assertRaises(UPCA.InvalidDataError):
+            UPCA('0036000291452')
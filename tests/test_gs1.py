@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import, division, print_function, unicode_literals
+from builtins import *  # Use Python3-like builtins for Python2.
+
+from unittest import TestCase
+from pubcode import Code128, GS1_128
+from pubcode.gs1 import FNC1
+
+
+class TestGS1_128(TestCase):
+    def test_sscc(self):
+        barcode = GS1_128('(00)106141411234567897')
+        self.assertEqual(barcode.data, FNC1 + '00106141411234567897')
+        self.assertEqual(barcode.symbols, [
+            '[Start Code C]', '[FNC 1]', '00', '10', '61', '41', '41', '12', '34', '56', '78', '97', '34', '[Stop]'
+        ])
+        self.assertEqual(barcode.elements, [('00', '106141411234567897')])
+
+    def test_forms(self):
+        """Test that the elements can be given as tuples, in the human readable form or as an element string."""
+        pairs = [('01', '09506000134352'), ('17', '251231'), ('10', 'ABC123')]
+        barcode = GS1_128(pairs)
+        self.assertEqual(GS1_128('(01)09506000134352(17)251231(10)ABC123'), barcode)
+        self.assertEqual(GS1_128(barcode.data), barcode)
+        self.assertEqual(GS1_128(barcode.data[1:]), barcode)
+        self.assertEqual(barcode.elements, pairs)
+        self.assertEqual(barcode.human_readable, '(01)09506000134352(17)251231(10)ABC123')
+
+    def test_separators(self):
+        """Test that only the values without a predefined length are followed by FNC1, and they are put last."""
+        barcode = GS1_128([('10', '1234'), ('21', '5678'), ('01', '09506000134352'), ('3103', '001250')])
+        self.assertEqual(barcode.data, FNC1 + '0109506000134352' '3103001250' '101234' + FNC1 + '215678')
+        self.assertEqual(barcode.elements, [
+            ('01', '09506000134352'), ('3103', '001250'), ('10', '1234'), ('21', '5678'),
+        ])
+
+        # The numeric values are encoded with charset C, without switching for the separator.
+        self.assertEqual(barcode.symbols[:-2], [
+            '[Start Code C]', '[FNC 1]', '01', '09', '50', '60', '00', '13', '43', '52', '31', '03', '00', '12', '50',
+            '10', '12', '34', '[FNC 1]', '21', '56', '78',
+        ])
+
+        # Odd length numeric values are also planned across the separators.
+        barcode = GS1_128('(10)123(21)45')
+        self.assertEqual(barcode.symbols[:-2], [
+            '[Start Code B]', '[FNC 1]', '1', '[Code C]', '01', '23', '[FNC 1]', '21', '45',
+        ])
+        self.assertEqual(GS1_128.estimate_width(barcode.data), barcode.width())
+
+    def test_decode(self):
+        barcode = GS1_128('(01)09506000134352(10)AB-12(21)X')
+        data, charsets = GS1_128.decode(barcode.modules)
+        self.assertEqual(data, barcode.data)
+        self.assertEqual(GS1_128(data), barcode)
+        with self.assertRaises(Code128.DecodeError):
+            Code128.decode(barcode.modules)
+
+    def test_zpl(self):
+        self.assertEqual(GS1_128('(00)106141411234567897').zpl(label=False),
+                         '^FO0,0^BY2^BCN,50,N,N,N,N^FH_^FD>;>800106141411234567897^FS')
+
+    def test_check_digit(self):
+        """Test that the check digit of the ITIP is checked after the GTIN, before the piece number and count."""
+        barcode = GS1_128([('8006', '09506000134352' '0102')])
+        self.assertEqual(barcode.elements, [('8006', '095060001343520102')])
+        with self.assertRaises(GS1_128.ApplicationIdentifierError):
+            GS1_128([('8006', '09506000134353' '0102')])
+
+    def test_lengths(self):
+        self.assertEqual(GS1_128([('8020', 'A' * 25)]).elements, [('8020', 'A' * 25)])
+        with self.assertRaises(GS1_128.ApplicationIdentifierError):
+            GS1_128([('8020', 'A' * 26)])
+
+    def test_invalid(self):
+        for elements in (
+            '(00)106141411234567898',  # Wrong check digit.
+            '(01)1234',  # Too short.
+            '(17)25123A',  # Not numeric.
+            '(10)ABC~',  # Not in the GS1 character set.
+            '(10)' + 'A' * 21,  # Too long.
+            '(05)1234',  # Unknown AI.
+            '01)09506000134352',
+            '0509506000134352',
+            [],
+        ):
+            with self.assertRaises(GS1_128.ApplicationIdentifierError):
+                GS1_128(elements)
+        with self.assertRaises(Code128.CharsetError):
+            GS1_128('(10)1234', 'C')
+
+    def test_code128(self):
+        """Test that the group separator is still a normal character for Code128."""
+        barcode = Code128('A' + FNC1)
+        self.assertEqual(barcode.symbols[:-2], ['[Start Code A]', 'A', FNC1])
+        self.assertEqual(Code128.decode(barcode.modules), ('A' + FNC1, 'AA'))
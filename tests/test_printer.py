@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import, division, print_function, unicode_literals
+from builtins import *  # Use Python3-like builtins for Python2.
+
+from unittest import TestCase
+from pubcode import Code128, printer
+import binascii
+import struct
+
+
+def _decompress_zpl(data, bytes_per_row):
+    """Expand ZPL compressed hexadecimal data into rows of hexadecimal digits."""
+    rows = []
+    row = ''
+    count = 0
+    for char in data:
+        if char in printer._ZPL_ONES:
+            count += printer._ZPL_ONES.index(char) + 1
+        elif char in printer._ZPL_TWENTIES:
+            count += (printer._ZPL_TWENTIES.index(char) + 1) * 20
+        elif char == ':':
+            rows.append(rows[-1])
+        elif char in ',!':
+            rows.append(row.ljust(2 * bytes_per_row, '0' if char == ',' else 'F'))
+            row = ''
+        else:
+            row += char * (count or 1)
+            count = 0
+            if len(row) == 2 * bytes_per_row:
+                rows.append(row)
+                row = ''
+    return rows
+
+
+class TestPrinter(TestCase):
+    def test_zpl(self):
+        self.assertEqual(
+            Code128('Hello!', charset='B').zpl(x=10, y=20, height=100, module_width=3, text=True),
+            '^XA^FO10,20^BY3^BCN,100,Y,N,N,N^FH_^FD>:Hello!^FS^XZ'
+        )
+
+    def test_zpl_invocation_codes(self):
+        """Test that shifts, charset switches and characters that ZPL interprets are written correctly."""
+        code = Code128('a\x00a>^_~12345678', charset='BABBBBBCCCC')
+        self.assertEqual(code.zpl(label=False), '^FO0,0^BY2^BCN,50,N,N,N,N^FH_^FD>:a>4_00a><_5E_5F_7E>512345678^FS')
+
+        code = Code128('1234\x01', charset='CCA')
+        self.assertEqual(code.zpl(label=False), '^FO0,0^BY2^BCN,50,N,N,N,N^FH_^FD>;1234>7_01^FS')
+
+    def test_zpl_graphic(self):
+        code = Code128('Hello!', charset='B')
+        for compress in (True, False):
+            command = code.zpl_graphic(height=5, module_width=3, compress=compress, label=False)
+            self.assertTrue(command.startswith('^FO0,0^GFA,') and command.endswith('^FS'))
+
+            total, total_again, bytes_per_row, data = command[len('^FO0,0^GFA,'):-len('^FS')].split(',', 3)
+            width = code.width(add_quiet_zone=True) * 3
+            self.assertEqual(int(bytes_per_row), (width + 7) // 8)
+            self.assertEqual(int(total), int(bytes_per_row) * 5)
+            self.assertEqual(total, total_again)
+
+            rows = _decompress_zpl(data, int(bytes_per_row)) if compress else [data[:2 * int(bytes_per_row)]] * 5
+            self.assertEqual(len(rows), 5)
+            packed = bytearray(binascii.unhexlify(rows[0]))
+            self.assertEqual(packed, bytearray(byte ^ 0xff for byte in bytearray(code.packed_modules(True, 3))))
+            self.assertEqual(len(set(rows)), 1)
+
+    def test_zpl_compress_row(self):
+        self.assertEqual(printer._zpl_compress_row('F' * 50 + '0' * 3 + 'A'), 'hPFI0A')
+        self.assertEqual(printer._zpl_compress_row('1' * 420 + 'A'), 'zY11A')
+        self.assertEqual(printer._zpl_compress_row('A' + '0' * 9), 'A,')
+        self.assertEqual(printer._zpl_compress_row('A' + 'F' * 9), 'A!')
+
+    def test_escpos(self):
+        code = Code128('Hello!', charset='B')
+        command = code.escpos(height=4, module_width=2)
+
+        width = code.width(add_quiet_zone=True) * 2
+        bytes_per_row = (width + 7) // 8
+        self.assertEqual(command[:4], b'\x1dv0\x00')
+        self.assertEqual(struct.unpack(b'<HH', command[4:8]), (bytes_per_row, 4))
+        self.assertEqual(len(command), 8 + bytes_per_row * 4)
+
+        row = bytearray(command[8:8 + bytes_per_row])
+        bits = ''.join('{0:08b}'.format(byte) for byte in row)
+        quiet_zone = [0] * (code.quiet_zone * 2)
+        bars = [1 - module for module in self._hello_b_modules() for _ in range(2)]
+        self.assertEqual([int(bit) for bit in bits], quiet_zone + bars + quiet_zone + [0] * (-width % 8))
+
+    @staticmethod
+    def _hello_b_modules():
+        return Code128('Hello!', charset='B').modules
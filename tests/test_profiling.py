@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import, division, print_function, unicode_literals
+from builtins import *  # Use Python3-like builtins for Python2.
+
+from unittest import TestCase
+from pubcode import Code128
+from pubcode.profiling import StageCollector
+
+# PIL is optional.
+try:
+    import PIL.Image
+except ImportError:
+    PIL = None
+
+
+class TestStageCollector(TestCase):
+    def test_stats(self):
+        collector = StageCollector(buckets=(10, 100))
+        for duration in (5, 10, 50, 500):
+            collector('encode', duration, 3)
+        collector('png', 20, 100)
+
+        stats = collector.stats()
+        self.assertEqual(stats['encode'], {
+            'count': 4,
+            'total_ns': 565,
+            'min_ns': 5,
+            'max_ns': 500,
+            'size': 12,
+            'buckets': [[10, 2], [100, 1], [None, 1]],
+        })
+        self.assertEqual(stats['png']['buckets'], [[10, 0], [100, 1], [None, 0]])
+
+        collector.clear()
+        self.assertEqual(collector.stats(), {})
+
+
+class TestProfiler(TestCase):
+    def setUp(self):
+        self.calls = []
+        Code128.profiler = lambda stage, duration_ns, size: self.calls.append((stage, duration_ns, size))
+
+    def tearDown(self):
+        Code128.profiler = None
+
+    def test_encode_stages(self):
+        code = Code128('Hello!', charset='B')
+        self.assertEqual([(stage, size) for stage, _, size in self.calls],
+                         [('validate_charset', 6), ('expand_charset', 6), ('encode', 9)])
+        self.assertTrue(all(duration >= 0 for _, duration, _ in self.calls))
+
+        del self.calls[:]
+        code.packed_modules(add_quiet_zone=True, module_width=2)
+        self.assertEqual([(stage, size) for stage, _, size in self.calls], [('packed_modules', 242)])
+
+    def test_render_stages(self):
+        code = Code128('Hello!', charset='B')
+        del self.calls[:]
+
+        data_url = code.data_url('bmp')
+        image_data = code.image_data('bmp')
+        self.assertEqual([(stage, size) for stage, _, size in self.calls], [
+            ('packed_modules', 121), ('bmp', len(image_data)),
+            ('base64', len(data_url) - len('data:image/bmp;base64,')),
+            ('packed_modules', 121), ('bmp', len(image_data)),
+        ])
+
+        if PIL is None:
+            return
+        del self.calls[:]
+        code.image(height=10, module_width=2)
+        self.assertEqual([(stage, size) for stage, _, size in self.calls], [('packed_modules', 121), ('image', 2420)])
+
+    def test_disabled(self):
+        Code128.profiler = None
+        Code128('Hello!').data_url()
+        self.assertEqual(self.calls, [])
@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import, division, print_function, unicode_literals
+from builtins import *  # Use Python3-like builtins for Python2.
+
+from unittest import TestCase
+from pubcode import Code128
+from pubcode.serve import BarcodeServer, etag
+import sys
+import threading
+if sys.version_info[0] < 3:
+    from httplib import HTTPConnection
+else:
+    from http.client import HTTPConnection
+
+
+class TestServe(TestCase):
+    def setUp(self):
+        self.server = BarcodeServer(('127.0.0.1', 0), max_age=60, log_requests=False)
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+
+    def request(self, path, headers=None, method='GET'):
+        connection = HTTPConnection(*self.server.server_address[:2])
+        try:
+            connection.request(method, path, headers=headers or {})
+            response = connection.getresponse()
+            # The headers are looked up case-insensitively, as Python 2 converts the names to lower case.
+            return response.status, response.msg, response.read()
+        finally:
+            connection.close()
+
+    def test_png(self):
+        status, headers, body = self.request('/code128/Hello%21.png?charset=B&height=10&module_width=2')
+        barcode = Code128('Hello!', charset='B')
+
+        self.assertEqual(status, 200)
+        self.assertEqual(body, barcode.image_data('png', height=10, module_width=2))
+        self.assertEqual(headers['Content-Type'], 'image/png')
+        self.assertEqual(headers['Cache-Control'], 'public, max-age=60')
+        self.assertEqual(headers['ETag'], etag(barcode, 'png', 10, 2, True))
+
+    def test_formats(self):
+        barcode = Code128('1234')
+        status, headers, body = self.request('/code128/1234.svg?quiet_zone=0')
+        self.assertEqual((status, headers['Content-Type']), (200, 'image/svg+xml'))
+        self.assertEqual(body.decode('utf-8'), barcode.svg(height=50, add_quiet_zone=False))
+
+        status, headers, body = self.request('/code128/1234.bmp')
+        self.assertEqual((status, headers['Content-Type']), (200, 'image/bmp'))
+        self.assertEqual(body, barcode.image_data('bmp'))
+
+        status, headers, body = self.request('/code128/1234.bmp', method='HEAD')
+        self.assertEqual((status, headers['Content-Length'], body), (200, str(len(barcode.image_data('bmp'))), b''))
+
+    def test_etag(self):
+        """Test that the ETag depends on the image and that a matching ETag is answered without rendering."""
+        _, headers, _ = self.request('/code128/1234.png')
+        tag = headers['ETag']
+        self.assertEqual(self.request('/code128/1234.png')[1]['ETag'], tag)
+        self.assertEqual(self.request('/code128/1234.png?charset=C')[1]['ETag'], tag)
+        self.assertNotEqual(self.request('/code128/1234.png?charset=B')[1]['ETag'], tag)
+        self.assertNotEqual(self.request('/code128/1234.png?height=2')[1]['ETag'], tag)
+        self.assertNotEqual(self.request('/code128/1234.bmp')[1]['ETag'], tag)
+
+        renders = self.server.renders.stats()['png']['count']
+        for if_none_match in (tag, 'W/' + tag, '"other", ' + tag, '*'):
+            status, headers, body = self.request('/code128/1234.png', {'If-None-Match': if_none_match})
+            self.assertEqual((status, headers['ETag'], body), (304, tag, b''))
+        self.assertEqual(self.server.renders.stats()['png']['count'], renders)
+
+        status, _, _ = self.request('/code128/1234.png', {'If-None-Match': '"other"'})
+        self.assertEqual(status, 200)
+
+    def test_errors(self):
+        for path in ('/code128/%C3%A4.png', '/code128/1234.png?height=0', '/code128/1234.png?module_width=x',
+                     '/code128/1234.png?charset=D', '/code128/12.png?charset=CC'):
+            self.assertEqual(self.request(path)[0], 400, path)
+        for path in ('/', '/code128/1234.gif', '/code39/1234.png'):
+            self.assertEqual(self.request(path)[0], 404, path)
+
+    def test_metrics(self):
+        self.request('/code128/1234.png')
+        self.request('/code128/1234.png')
+        self.request('/code128/1234.svg')
+        self.request('/')
+        status, headers, body = self.request('/metrics')
+
+        self.assertEqual(status, 200)
+        lines = body.decode('utf-8').split('\n')
+        self.assertIn('pubcode_responses_total{status="200"} 3', lines)
+        self.assertIn('pubcode_responses_total{status="404"} 1', lines)
+        self.assertIn('pubcode_render_seconds_count{format="png"} 2', lines)
+        self.assertIn('pubcode_render_seconds_bucket{format="png",le="+Inf"} 2', lines)
+        self.assertIn('pubcode_render_seconds_count{format="svg"} 1', lines)
+        self.assertIn('pubcode_render_bytes_total{{format="png"}} {0}'.format(
+            2 * len(Code128('1234').image_data('png'))
+        ), lines)
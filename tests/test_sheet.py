@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import, division, print_function, unicode_literals
+from builtins import *  # Use Python3-like builtins for Python2.
+
+from unittest import TestCase
+from pubcode import Code128
+from pubcode.sheet import render_sheet
+
+# NumPy is optional.
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class _NarrowCode128(Code128):
+    """A Code128 barcode with a smaller quiet zone."""
+    __slots__ = ()
+    quiet_zone = 4
+
+
+class TestRenderSheet(TestCase):
+    def test_render_sheet(self):
+        if numpy is None:
+            with self.assertRaises(Code128.MissingDependencyError):
+                render_sheet([Code128('Hello!')], [(0, 0)], (1, 121))
+            return
+
+        barcodes = [Code128('Hello!', charset='B'), Code128('1234')]
+        sheet = render_sheet(barcodes, [(5, 0), (0, 4)], (7, 130), height=3, module_width=1)
+
+        self.assertEqual(sheet.dtype, numpy.uint8)
+        quiet_zone = [1] * Code128.quiet_zone
+        for row in range(3):
+            self.assertListEqual(list(sheet[row, :5] // 255), [1] * 5)
+            self.assertListEqual(list(sheet[row, 5:126] // 255), quiet_zone + barcodes[0].modules + quiet_zone)
+        self.assertListEqual(list(sheet[3] // 255), [1] * 130)
+        for row in range(4, 7):
+            width = barcodes[1].width(add_quiet_zone=True)
+            self.assertListEqual(list(sheet[row, :width] // 255), quiet_zone + barcodes[1].modules + quiet_zone)
+
+    def test_render_sheet_out(self):
+        if numpy is None:
+            return
+
+        barcode = Code128('Hello!', charset='B')
+        out = numpy.zeros((2, 101 * 2), dtype=bool)
+        result = render_sheet([barcode.symbol_values], [(0, 1)], height=1, module_width=2, add_quiet_zone=False,
+                              out=out)
+
+        self.assertIs(result, out)
+        self.assertFalse(out[0].any())
+        self.assertListEqual([int(module) for module in out[1, ::2]], barcode.modules)
+        self.assertListEqual([int(module) for module in out[1, 1::2]], barcode.modules)
+
+    def test_render_sheet_matches_pil(self):
+        if numpy is None:
+            return
+        try:
+            from PIL import Image
+        except ImportError:
+            return
+
+        barcode = Code128('Hello!')
+        sheet = render_sheet([barcode], [(0, 0)], (5, barcode.width(add_quiet_zone=True) * 3), height=5, module_width=3)
+        image = barcode.image(height=5, module_width=3).convert('L')
+        self.assertEqual(sheet.tobytes(), image.tobytes())
+
+    def test_render_sheet_quiet_zone(self):
+        """Test that each barcode is rendered with the quiet zone of its own class."""
+        if numpy is None:
+            return
+
+        barcodes = [_NarrowCode128('Hello!'), Code128('Hello!')]
+        sheet = render_sheet(barcodes, [(0, 0), (0, 1)], (2, 130), height=1, dtype='bool')
+        for row, barcode in enumerate(barcodes):
+            quiet_zone = [True] * barcode.quiet_zone
+            width = barcode.width(add_quiet_zone=True)
+            self.assertEqual(sheet[row, :width].tolist(), quiet_zone + [bool(module) for module in barcode.modules] +
+                             quiet_zone)
+            self.assertEqual(width, len(barcode.modules) + 2 * barcode.quiet_zone)
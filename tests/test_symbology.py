@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import, division, print_function, unicode_literals
+from builtins import *  # Use Python3-like builtins for Python2.
+
+from unittest import TestCase
+from pubcode import Code128, Code39, EAN13, UPCA, Symbology
+from pubcode.cache import RenderCache
+from pubcode.profiling import StageCollector
+import pickle
+
+# NumPy is optional.
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class TestSymbology(TestCase):
+    _barcodes = [Code128('1234'), Code39('1234'), EAN13('123456789012'), UPCA('12345678901')]
+
+    def test_errors(self):
+        """Test that the errors of every symbology can be caught with Symbology.Error."""
+        for cls, data in ((Code128, '\x80'), (Code39, 'a'), (EAN13, 'a'), (UPCA, 'a')):
+            with self.assertRaises(Symbology.InvalidDataError):
+                cls(data)
+        self.assertIs(Code128.Error, Symbology.Error)
+        with self.assertRaises(Code128.UnknownFormatError):
+            EAN13('123456789012').image_data('gif')
+
+    def test_comparison(self):
+        # The same data in different symbologies isn't equal.
+        self.assertNotEqual(Code128('1234'), Code39('1234'))
+        self.assertEqual(Code39('1234'), Code39('1234'))
+        self.assertEqual(len(set(self._barcodes + [Code39('1234')])), 4)
+        self.assertLess(Code39('1234'), Code39('1235'))
+        with self.assertRaises(TypeError):
+            Code39('1234') < Code128('1234')
+
+    def test_pickle(self):
+        for barcode in self._barcodes:
+            copy = pickle.loads(pickle.dumps(barcode))
+            self.assertIs(type(copy), type(barcode))
+            self.assertEqual(copy, barcode)
+            self.assertEqual(copy.modules, barcode.modules)
+
+    def test_packed_modules(self):
+        """Test that the packed modules of every symbology match the modules."""
+        for barcode in self._barcodes:
+            modules = [1] * barcode.quiet_zone + barcode.modules + [1] * barcode.quiet_zone
+            modules += [1] * (-len(modules) % 8)
+            packed = bytes(bytearray(
+                int(''.join(map(str, modules[start:start + 8])), 2) for start in range(0, len(modules), 8)
+            ))
+            self.assertEqual(barcode.packed_modules(add_quiet_zone=True), packed)
+            self.assertEqual(len(barcode.modules), barcode.width())
+
+    def test_cache(self):
+        """Test that a cache on Symbology is shared by all symbologies, with keys that include the class."""
+        Symbology.cache = RenderCache()
+        try:
+            self.assertEqual(Code39('1234').data_url(), Code39('1234').data_url())
+            self.assertEqual(Code39.cache.stats()['hits'], 2)
+            self.assertNotEqual(EAN13('123456789012').data_url(), Code39('1234').data_url())
+        finally:
+            Symbology.cache = None
+
+    def test_profiler(self):
+        EAN13.profiler = StageCollector()
+        try:
+            EAN13('123456789012').data_url()
+            self.assertEqual(sorted(EAN13.profiler.stats()), ['base64', 'encode', 'packed_modules', 'png'])
+            self.assertIsNone(Code128.profiler)
+        finally:
+            EAN13.profiler = None
+
+    def test_render_sheet(self):
+        if numpy is None:
+            return
+        from pubcode.sheet import render_sheet
+
+        sheet = render_sheet(self._barcodes, [(0, index) for index in range(4)], (4, 200), dtype='bool')
+        for index, barcode in enumerate(self._barcodes):
+            width = barcode.width(add_quiet_zone=True)
+            modules = [1] * barcode.quiet_zone + barcode.modules + [1] * barcode.quiet_zone
+            self.assertEqual(sheet[index, :width].tolist(), [bool(module) for module in modules])